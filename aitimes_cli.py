@@ -0,0 +1,358 @@
+import argparse
+import json
+import logging
+import os
+import random
+import signal
+import sys
+import threading
+import time
+
+from aitimes_crawler import AITimesCrawler
+from batch_summarizer import BatchSummarizer
+from exports import EXPORT_FORMATS, read_csv_rows
+from llm_backends import (BACKEND_KINDS, DEFAULT_HEDGE_DELAY, DEFAULT_HEDGE_QUANTILE, DEFAULT_LOCAL_BASE_URL,
+                          DEFAULT_LOCAL_MODEL, create_backend)
+from rate_limiter import DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_TOKENS_PER_MINUTE
+
+logger = logging.getLogger("aitimes_cli")
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 한 줄짜리 JSON으로 출력"""
+
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        # logger.info(..., extra={'fields': {...}})로 넘긴 값을 그대로 포함
+        payload.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def setup_logging(level, log_format):
+    """텍스트 또는 JSON 형식으로 루트 로거 설정"""
+    handler = logging.StreamHandler()
+    if log_format == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logging.basicConfig(level=getattr(logging, level.upper()), handlers=[handler])
+
+
+def run_once(crawler, args):
+    """뉴스 목록 크롤링 → 본문 크롤링 → AI 요약 → 저장소 기록(→ CSV/PDF)을 한 번 실행"""
+    started = time.time()
+
+    if args.feed:
+        news_list = crawler.crawl_news_feed(
+            sections=args.sections or (None,),
+            max_depth=args.max_depth,
+            max_pages=args.max_pages,
+            max_articles=args.max_articles,
+            delay=args.crawl_delay
+        )
+    else:
+        news_list = crawler.crawl_news_list()
+    if not news_list:
+        logger.error("뉴스 목록을 가져오지 못했습니다.")
+        return False
+
+    enhanced_news = crawler.process_articles(
+        news_list,
+        args.api_key,
+        fetch_workers=args.fetch_workers,
+        summary_workers=args.summary_workers,
+        incremental=args.incremental,
+        check_changes=args.check_changes
+    )
+
+    run_id = crawler.save_run(enhanced_news)
+    if run_id is None:
+        return False
+
+    csv_file = crawler.export_run_csv(run_id) if args.csv else None
+    pdf_path = crawler.create_run_pdf_report(run_id) if args.pdf else None
+    successful_summaries = len([n for n in enhanced_news if crawler.is_summary_ok(n['summary'], n.get('summary_data'))])
+
+    logger.info("크롤링 완료", extra={'fields': {
+        'run_id': run_id,
+        'articles': len(enhanced_news),
+        'summaries': successful_summaries,
+        'csv_file': csv_file,
+        'pdf_file': pdf_path,
+        'cache': crawler.summary_cache.stats(),
+        'llm': crawler.llm.stats(),
+        'elapsed_seconds': round(time.time() - started, 3)
+    }})
+    return True
+
+
+def write_metrics(crawler, args):
+    """--metrics-file이 지정되면 누적 지표를 Prometheus 텍스트 형식으로 저장"""
+    if not args.metrics_file:
+        return
+    try:
+        crawler.metrics.write(args.metrics_file)
+    except Exception as e:
+        logger.warning(f"지표 파일 저장 실패: {str(e)}")
+
+
+def run_daemon(crawler, args):
+    """interval ± jitter 초 간격으로 run_once를 반복 (SIGTERM/SIGINT 시 종료)"""
+    stop_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        logger.info("종료 신호 수신", extra={'fields': {'signal': signum}})
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    while not stop_event.is_set():
+        try:
+            run_once(crawler, args)
+        except Exception:
+            logger.exception("크롤링 실행 중 처리되지 않은 오류")
+        write_metrics(crawler, args)
+
+        delay = max(0.0, args.interval + random.uniform(-args.jitter, args.jitter))
+        logger.info("다음 실행 대기", extra={'fields': {'delay_seconds': round(delay, 1)}})
+        stop_event.wait(delay)
+
+
+def load_csv_articles(csv_paths):
+    """과거 CSV 파일에서 본문이 있는 기사 목록을 읽음"""
+    articles = []
+    for path in csv_paths:
+        for row in read_csv_rows(path):
+            content = row.get('content')
+            if content and content != "본문을 가져올 수 없습니다.":
+                articles.append({'url': row['url'], 'title': row['title'], 'content': content})
+    return articles
+
+
+def run_batch_submit(crawler, args):
+    """과거 기사를 Batch API로 다시 요약하도록 제출 (기본: 기사 인덱스 전체)"""
+    articles = load_csv_articles(args.csv) if args.csv else list(crawler.article_index.iter_articles())
+    if not articles:
+        logger.error("요약할 기사가 없습니다.")
+        return False
+
+    batch_ids = BatchSummarizer(crawler, args.api_key).submit(articles)
+    logger.info("요약 배치 제출 완료", extra={'fields': {'batch_ids': batch_ids, 'articles': len(articles)}})
+    return True
+
+
+def run_batch_poll(crawler, args):
+    """제출한 배치를 폴링해 완료된 결과를 기사 인덱스와 요약 캐시에 반영"""
+    summarizer = BatchSummarizer(crawler, args.api_key)
+    batch_ids = args.batch_id or summarizer.pending_batches()
+    if args.wait:
+        results = summarizer.wait(batch_ids, interval=args.interval)
+    else:
+        results = {batch_id: summarizer.poll(batch_id) for batch_id in batch_ids}
+
+    for batch_id, (status, merged) in results.items():
+        logger.info("요약 배치 상태", extra={'fields': {'batch_id': batch_id, 'status': status, 'merged': merged}})
+    return True
+
+
+def run_import_csv(crawler, args):
+    """기존 aitimes_*.csv 스냅샷을 기사 저장소로 가져옴"""
+    for path in args.paths:
+        run_id = crawler.article_store.import_csv(path, is_summary_ok=crawler.is_summary_ok)
+        logger.info("CSV 가져오기 완료", extra={'fields': {'csv_file': path, 'run_id': run_id}})
+    crawler.update_search_index()
+    return True
+
+
+def run_search(crawler, args):
+    """검색 인덱스에서 기사를 찾아 한 줄에 하나씩 JSON으로 출력"""
+    results = crawler.search_articles(args.query, limit=args.limit, start=args.start, end=args.end,
+                                      semantic=args.semantic)
+    for result in results:
+        print(json.dumps(result, ensure_ascii=False))
+    return True
+
+
+def run_changes(crawler, args):
+    """게시 후 본문이 수정된 기사 버전을 최신순으로 한 줄에 하나씩 JSON으로 출력 (--url이면 그 기사 이력 전체)"""
+    changes = crawler.article_index.history(args.url) if args.url else crawler.article_index.recent_changes(args.limit)
+    for change in changes:
+        print(json.dumps(change, ensure_ascii=False))
+    return True
+
+
+def run_digest(crawler, args):
+    """기간 내 실행들을 묶은 다이제스트 PDF 생성"""
+    def progress(completed, total):
+        logger.debug("다이제스트 렌더링 진행", extra={'fields': {'completed': completed, 'total': total}})
+
+    started = time.time()
+    pdf_path = crawler.create_digest_pdf_report(args.start, args.end, workers=args.workers, progress_callback=progress)
+    if pdf_path is None:
+        return False
+    logger.info("다이제스트 PDF 생성 완료", extra={'fields': {
+        'pdf_file': pdf_path,
+        'elapsed_seconds': round(time.time() - started, 3)
+    }})
+    return True
+
+
+def run_export(crawler, args):
+    """기간 내 기사 행을 CSV/JSONL 파일로 내보냄 (저장소에서 묶음 단위로 읽어 바로 씀)"""
+    started = time.time()
+    path, count = crawler.export_articles(args.start, args.end, fmt=args.format, path=args.output)
+    if path is None:
+        return False
+    logger.info("기사 내보내기 완료", extra={'fields': {
+        'export_file': path,
+        'articles': count,
+        'elapsed_seconds': round(time.time() - started, 3)
+    }})
+    return True
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="AI타임스 뉴스 크롤러 (Streamlit 없이 실행)")
+    parser.add_argument('--api-key', default=os.environ.get('OPENAI_API_KEY'),
+                        help="OpenAI API 키 (기본값: OPENAI_API_KEY 환경변수)")
+    parser.add_argument('--openai-base-url', default=os.environ.get('OPENAI_BASE_URL'),
+                        help="OpenAI 호환 엔드포인트 주소 (기본값: OPENAI_BASE_URL 환경변수 또는 OpenAI)")
+    parser.add_argument('--fetch-workers', type=int, default=4, help="본문 크롤링 동시 처리 수")
+    parser.add_argument('--summary-workers', type=int, default=2, help="AI 요약 동시 처리 수")
+    parser.add_argument('--rpm', type=int, default=DEFAULT_REQUESTS_PER_MINUTE,
+                        help="OpenAI 분당 요청 한도 초기값 (응답 헤더를 받으면 계정 한도로 맞춤)")
+    parser.add_argument('--tpm', type=int, default=DEFAULT_TOKENS_PER_MINUTE,
+                        help="OpenAI 분당 토큰 한도 초기값 (응답 헤더를 받으면 계정 한도로 맞춤)")
+    parser.add_argument('--llm-concurrency', type=int, default=8,
+                        help="OpenAI 동시 요청 수 상한 (429/잔량에 따라 이 안에서 자동 조절)")
+    parser.add_argument('--llm-backend', choices=BACKEND_KINDS, default=os.environ.get('LLM_BACKEND', 'openai'),
+                        help="요약 백엔드: openai, local(OpenAI 호환 로컬 서버), fake(네트워크 없는 고정 응답) "
+                             "(기본값: LLM_BACKEND 환경변수 또는 openai)")
+    parser.add_argument('--local-base-url', default=os.environ.get('LOCAL_LLM_BASE_URL', DEFAULT_LOCAL_BASE_URL),
+                        help="local 백엔드 주소 (llama.cpp server, vLLM 등, 기본값: LOCAL_LLM_BASE_URL 환경변수)")
+    parser.add_argument('--local-model', default=os.environ.get('LOCAL_LLM_MODEL', DEFAULT_LOCAL_MODEL),
+                        help="local 백엔드에 보낼 모델 이름 (기본값: LOCAL_LLM_MODEL 환경변수)")
+    parser.add_argument('--local-concurrency', type=int, default=int(os.environ.get('LOCAL_LLM_CONCURRENCY', 2)),
+                        help="local 백엔드 동시 요청 수 (서버의 병렬 슬롯 수에 맞춤)")
+    parser.add_argument('--hedge-backend', choices=BACKEND_KINDS, default=os.environ.get('LLM_HEDGE_BACKEND'),
+                        help="지정하면 주 백엔드 응답이 최근 지연의 --hedge-quantile 분위수를 넘길 때 이 백엔드에도 요청")
+    parser.add_argument('--hedge-quantile', type=float,
+                        default=float(os.environ.get('LLM_HEDGE_QUANTILE', DEFAULT_HEDGE_QUANTILE)))
+    parser.add_argument('--hedge-delay', type=float, default=DEFAULT_HEDGE_DELAY,
+                        help="지연 표본이 모이기 전 보조 백엔드에 요청하기까지 기다릴 시간(초)")
+    parser.add_argument('--no-incremental', dest='incremental', action='store_false',
+                        help="이미 요약한 기사도 다시 크롤링/요약")
+    parser.add_argument('--no-change-check', dest='check_changes', action='store_false',
+                        help="증분 크롤링에서 이미 요약한 기사의 본문을 다시 가져와 수정 여부를 확인하지 않음")
+    parser.add_argument('--feed', action='store_true',
+                        help="메인 상위 10개 대신 목록 페이지를 페이지네이션으로 따라가 기사 목록 수집")
+    parser.add_argument('--sections', nargs='+', help="--feed로 크롤링할 sc_section_code 목록 (기본값: 전체 기사)")
+    parser.add_argument('--max-depth', type=int, default=1, help="--feed에서 다른 섹션 목록으로 넘어갈 최대 횟수")
+    parser.add_argument('--max-pages', type=int, default=10, help="--feed에서 목록별 최대 페이지 번호")
+    parser.add_argument('--max-articles', type=int, default=500, help="--feed로 모을 최대 기사 수")
+    parser.add_argument('--crawl-delay', type=float, default=0.5, help="--feed에서 같은 호스트에 대한 요청 간격(초)")
+    parser.add_argument('--csv', action='store_true', help="실행 후 CSV 파일로도 내보냄")
+    parser.add_argument('--pdf', action='store_true', help="실행 후 PDF 리포트도 생성")
+    parser.add_argument('--metrics-file', help="실행 후 단계별 지표를 Prometheus 텍스트 형식으로 저장할 경로 "
+                                               "(예: node_exporter textfile 디렉토리의 aitimes.prom)")
+    parser.add_argument('--metrics-port', type=int, help="지정하면 이 포트의 /metrics 경로로 지표 제공")
+    parser.add_argument('--log-level', default='INFO')
+    parser.add_argument('--log-format', choices=['text', 'json'], default='text')
+
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('once', help="한 번 실행하고 종료")
+    daemon = subparsers.add_parser('daemon', help="주기적으로 반복 실행")
+    daemon.add_argument('--interval', type=float, default=600, help="실행 간격(초)")
+    daemon.add_argument('--jitter', type=float, default=30, help="실행 간격에 더할 무작위 편차(초)")
+
+    import_csv = subparsers.add_parser('import-csv', help="기존 CSV 스냅샷을 기사 저장소로 가져오기")
+    import_csv.add_argument('paths', nargs='+', help="가져올 aitimes_*.csv 파일")
+
+    search = subparsers.add_parser('search', help="크롤링한 기사 제목/요약/본문 검색")
+    search.add_argument('query', help="검색어 (두 글자 이상 단어, 모든 단어를 포함하는 기사)")
+    search.add_argument('--limit', type=int, default=20)
+    search.add_argument('--start', help="크롤링 시작 날짜 (YYYY-MM-DD)")
+    search.add_argument('--end', help="크롤링 끝 날짜 (YYYY-MM-DD)")
+    search.add_argument('--semantic', action='store_true', help="임베딩 의미 검색 (sentence-transformers 필요)")
+
+    changes = subparsers.add_parser('changes', help="게시 후 본문이 수정된 기사와 문단 단위 차이 출력")
+    changes.add_argument('--limit', type=int, default=20)
+    changes.add_argument('--url', help="이 기사의 수정 이력 전체 출력")
+
+    digest = subparsers.add_parser('digest', help="기간 내 실행들을 하나의 PDF 다이제스트로 생성")
+    digest.add_argument('--start', help="시작 날짜 (YYYY-MM-DD, 기본값: 처음부터)")
+    digest.add_argument('--end', help="끝 날짜 (YYYY-MM-DD, 기본값: 마지막까지)")
+    digest.add_argument('--workers', type=int, default=None, help="렌더링 프로세스 수 (기본값: CPU 코어 수)")
+
+    export = subparsers.add_parser('export', help="기간 내 기사 행을 CSV/JSONL 파일로 내보내기")
+    export.add_argument('--start', help="시작 날짜 (YYYY-MM-DD, 기본값: 처음부터)")
+    export.add_argument('--end', help="끝 날짜 (YYYY-MM-DD, 기본값: 마지막까지)")
+    export.add_argument('--format', choices=list(EXPORT_FORMATS), default='csv')
+    export.add_argument('--output', help="저장할 경로 (기본값: crawled_data/aitimes_export_<기간>.<형식>)")
+
+    batch_submit = subparsers.add_parser('batch-submit', help="과거 기사를 Batch API로 재요약 제출")
+    batch_submit.add_argument('--csv', nargs='+', help="재요약할 CSV 파일 (기본값: 기사 인덱스 전체)")
+    batch_poll = subparsers.add_parser('batch-poll', help="제출한 배치 결과를 확인하고 반영")
+    batch_poll.add_argument('batch_id', nargs='*', help="확인할 배치 ID (기본값: 반영 전인 모든 배치)")
+    batch_poll.add_argument('--wait', action='store_true', help="모든 배치가 끝날 때까지 대기")
+    batch_poll.add_argument('--interval', type=float, default=60, help="--wait 폴링 간격(초)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    setup_logging(args.log_level, args.log_format)
+
+    try:
+        llm = create_backend(args.llm_backend, hedge=args.hedge_backend, hedge_quantile=args.hedge_quantile,
+                             hedge_delay=args.hedge_delay, openai_base_url=args.openai_base_url,
+                             requests_per_minute=args.rpm, tokens_per_minute=args.tpm,
+                             llm_concurrency=args.llm_concurrency, local_base_url=args.local_base_url,
+                             local_model=args.local_model, local_concurrency=args.local_concurrency)
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+
+    # Batch API는 항상 OpenAI로 보내고, 나머지 요약은 백엔드가 키를 필요로 할 때만 요구
+    needs_key = args.command in ('batch-submit', 'batch-poll') or (
+        args.command not in ('import-csv', 'digest', 'search', 'export', 'changes') and llm.requires_api_key)
+    if needs_key and not args.api_key:
+        logger.error("OpenAI API 키가 없습니다. --api-key 또는 OPENAI_API_KEY 환경변수를 지정해주세요.")
+        return 2
+
+    crawler = AITimesCrawler(openai_base_url=args.openai_base_url, llm=llm)
+    if args.metrics_port:
+        crawler.metrics.serve(args.metrics_port)
+        logger.info("지표 제공 시작", extra={'fields': {'port': args.metrics_port, 'path': '/metrics'}})
+    if args.command == 'daemon':
+        run_daemon(crawler, args)
+        return 0
+    if args.command == 'import-csv':
+        return 0 if run_import_csv(crawler, args) else 1
+    if args.command == 'digest':
+        return 0 if run_digest(crawler, args) else 1
+    if args.command == 'search':
+        return 0 if run_search(crawler, args) else 1
+    if args.command == 'export':
+        return 0 if run_export(crawler, args) else 1
+    if args.command == 'changes':
+        return 0 if run_changes(crawler, args) else 1
+    if args.command == 'batch-submit':
+        return 0 if run_batch_submit(crawler, args) else 1
+    if args.command == 'batch-poll':
+        return 0 if run_batch_poll(crawler, args) else 1
+    ok = run_once(crawler, args)
+    write_metrics(crawler, args)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
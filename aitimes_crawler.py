@@ -1,38 +1,212 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
-import pandas as pd
-import openai
-import streamlit as st
-import time
-import re
+import json
+import logging
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-import markdown
-from io import BytesIO
+from summary_cache import SummaryCache
+from article_index import ArticleIndex
+from article_store import ArticleStore
+from extractors import get_extractor
+from pdf_report import PdfReportBuilder
+from frontier import FrontierCrawler, DEFAULT_SECTIONS, normalize_url
+from dedupe import NearDuplicateIndex
+from content_prep import clean_content, count_tokens, truncate_to_tokens, split_chunks
+from content_fingerprint import fingerprint
+from rate_limiter import DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_TOKENS_PER_MINUTE
+from llm_backends import DEFAULT_OPENAI_MODEL, HedgedBackend, create_backend
+from metrics import Metrics, timed_stage
+from search_index import SearchIndex
+from exports import CSV_COLUMNS, EXPORT_FORMATS, HISTORY_CSV_COLUMNS, write_csv, write_jsonl
+from summary_schema import (
+    SUMMARY_FAILED, SUMMARY_RESPONSE_FORMAT, SUMMARY_SCHEMA, SUMMARY_UNAVAILABLE, is_summary_ok, parse_summary,
+    summary_to_markdown
+)
+
+logger = logging.getLogger(__name__)
+
+# Batch API 요청과 토큰 수 계산에 쓰는 모델 (실시간 요약은 LLM 백엔드의 모델)
+SUMMARY_MODEL = DEFAULT_OPENAI_MODEL
+
+SUMMARY_PROMPT_TEMPLATE = """
+다음 뉴스 기사를 한국어로 요약해 JSON 스키마의 각 필드를 채워주세요.
+필드 값에는 마크다운 제목이나 글머리표 기호를 넣지 말고 내용만 적어주세요.
+
+기사 제목: {title}
+기사 내용: {content}
+"""
+
+# 본문이 이 토큰 수를 넘으면 조각별로 나눠 요약(map)한 뒤 합쳐서 최종 요약(reduce)
+MAX_DIRECT_TOKENS = 3000
+SUMMARY_CHUNK_TOKENS = 1500
+MAX_SUMMARY_CHUNKS = 8
+# 한 번에 보낼 본문 상한 (Batch API처럼 map-reduce를 하지 않는 경로는 여기서 자름)
+MAX_INPUT_TOKENS = MAX_DIRECT_TOKENS * 4
+
+MAP_PROMPT_TEMPLATE = """
+다음은 뉴스 기사 "{title}"의 일부({index}/{total})입니다.
+이 부분의 핵심 사실, 수치, 인용, 주장만 한국어 글머리표로 간결하게 정리해주세요.
+
+{content}
+"""
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
 
 class AITimesCrawler:
-    def __init__(self):
-        self.base_url = "https://www.aitimes.com"
-        self.main_url = "https://www.aitimes.com/"
+    def __init__(self, pool_maxsize=10, timeout=(5, 20), max_retries=3, backoff_factor=0.5, extractor='auto',
+                 base_url="https://www.aitimes.com", openai_base_url=None, conditional_cache_size=2000,
+                 requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE,
+                 llm_concurrency=8, llm=None):
+        self.base_url = base_url.rstrip('/')
+        self.main_url = self.base_url + "/"
+        # None이면 OpenAI 기본 엔드포인트 (벤치마크에서는 로컬 가짜 서버 주소 사용)
+        self.openai_base_url = openai_base_url
+        self.timeout = timeout
+        self.session = self._create_session(pool_maxsize, max_retries, backoff_factor)
+        
+        # 조건부 요청용 캐시: url -> {'etag', 'last_modified', 'text'} (피드 크롤링으로 URL이 많아져도 최근 것만 유지)
+        self._conditional_cache = OrderedDict()
+        self.conditional_cache_size = conditional_cache_size
+        self._cache_lock = threading.Lock()
+        
+        # AI 요약 캐시
+        self.summary_cache = SummaryCache()
+        
+        # 요약 요청을 보낼 LLM 백엔드 (기본: OpenAI, 백엔드마다 RPM/TPM 한도와 동시 요청 수를 조절하는 제한기 포함)
+        self.llm = llm or create_backend('openai', openai_base_url=openai_base_url,
+                                         requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute,
+                                         llm_concurrency=llm_concurrency)
+        
+        # 증분 크롤링용 기사 인덱스 (idxno 기준)
+        self.article_index = ArticleIndex()
+        
+        # 실행별 결과 저장소 (SQLite WAL, 본문/요약 압축 저장)
+        self.article_store = ArticleStore()
+        
+        # 제목/요약/본문 검색 인덱스 (실행을 저장할 때마다 새 기사만 추가)
+        self.search_index = SearchIndex()
+        
+        # 본문 추출 엔진 ('auto': selectolax → lxml → BeautifulSoup 순으로 설치된 것 사용)
+        self.extractor = get_extractor(extractor)
         
+        # PDF 리포트 캐시 (리포트 내용 해시, 기사별 렌더링 조각)
+        self.report_builder = PdfReportBuilder()
+        
+        # 단계별 시간/요청 지연/토큰/실패 지표 (대시보드와 Prometheus 텍스트 형식으로 내보냄)
+        self.metrics = Metrics()
+        self.metrics.add_collector(self._collect_metrics)
+    
+    def _collect_metrics(self):
+        """내보낼 때마다 읽는 요약 캐시/속도 제한기/hedge 누적 값 (제한기 값은 backend 라벨로 구분)"""
+        cache = self.summary_cache.stats()
+        lookups = cache['hits'] + cache['misses']
+        rows = [
+            ('summary_cache_hits_total', 'counter', "요약 캐시 히트 수", {}, cache['hits']),
+            ('summary_cache_misses_total', 'counter', "요약 캐시 미스 수", {}, cache['misses']),
+            ('summary_cache_hit_ratio', 'gauge', "요약 캐시 히트 비율", {}, cache['hits'] / lookups if lookups else 0.0),
+            ('summary_cache_entries', 'gauge', "캐시된 요약 수", {}, cache['entries']),
+        ]
+        for backend in self.llm.backends():
+            if backend.rate_limiter is None:
+                continue
+            limiter = backend.rate_limiter.stats()
+            rows.extend([
+                ('llm_retries_total', 'counter', "LLM 재시도 횟수 (reason=rate_limited|server_error)",
+                 {'backend': backend.name, 'reason': 'rate_limited'}, limiter['rate_limited']),
+                ('llm_retries_total', 'counter', "LLM 재시도 횟수 (reason=rate_limited|server_error)",
+                 {'backend': backend.name, 'reason': 'server_error'}, limiter['server_errors']),
+                ('llm_rate_limit_wait_seconds_total', 'counter', "속도 제한으로 기다린 시간 합계(초)",
+                 {'backend': backend.name}, limiter['wait_s']),
+                ('llm_concurrency', 'gauge', "현재 LLM 동시 요청 수 한도", {'backend': backend.name}, limiter['concurrency']),
+            ])
+        if isinstance(self.llm, HedgedBackend):
+            hedge = self.llm.stats()
+            rows.append(('llm_hedged_total', 'counter', "주 백엔드가 기한 안에 답하지 않아 보조 백엔드에도 보낸 요청 수",
+                         {}, hedge['hedged']))
+            rows.append(('llm_fallbacks_total', 'counter', "주 백엔드가 실패해 보조 백엔드로 보낸 요청 수",
+                         {}, hedge['fallbacks']))
+            for name, wins in hedge['wins'].items():
+                rows.append(('llm_hedge_wins_total', 'counter', "응답을 쓴 백엔드별 요청 수", {'backend': name}, wins))
+        return rows
+    
+    def _create_session(self, pool_maxsize, max_retries, backoff_factor):
+        """keep-alive 커넥션 풀과 재시도 정책이 적용된 세션 생성"""
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        
+        # aitimes.com은 동시 요청이 몰리므로 호스트 전용 풀을 크게 잡고, 그 외 호스트는 기본 크기 사용
+        session.mount(self.base_url, HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry))
+        session.mount('https://', HTTPAdapter(max_retries=retry))
+        session.mount('http://', HTTPAdapter(max_retries=retry))
+        return session
+    
+    def _fetch(self, url):
+        """세션으로 페이지를 가져옴 (ETag/Last-Modified 조건부 요청으로 변경 없는 페이지는 304 재사용)"""
+        with self._cache_lock:
+            cached = self._conditional_cache.get(url)
+            if cached:
+                self._conditional_cache.move_to_end(url)
+        
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        started = time.perf_counter()
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except Exception:
+            self.metrics.observe('fetch_seconds', time.perf_counter() - started, status='error')
+            raise
+        self.metrics.observe('fetch_seconds', time.perf_counter() - started, status=str(response.status_code))
+        if response.status_code == 304 and cached:
+            return cached['text']
+        response.raise_for_status()
+        self.metrics.observe('fetch_bytes', len(response.content))
+        
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            with self._cache_lock:
+                self._conditional_cache[url] = {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'text': response.text
+                }
+                self._conditional_cache.move_to_end(url)
+                while len(self._conditional_cache) > self.conditional_cache_size:
+                    self._conditional_cache.popitem(last=False)
+        return response.text
+    
+    @timed_stage('crawl_news_list')
     def crawl_news_list(self):
         """메인 페이지에서 상위 10개 뉴스의 제목과 URL을 크롤링"""
         try:
             crawl_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(self.main_url, headers=headers)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            html = self._fetch(self.main_url)
+            with self.metrics.timer('parse_seconds', page='front'):
+                soup = BeautifulSoup(html, 'html.parser')
             
             # 뉴스 링크들을 찾기
             news_links = soup.find_all('a', class_='auto-valign')
@@ -58,10 +232,10 @@ class AITimesCrawler:
                     # URL 추출
                     href = link.get('href')
                     if href:
-                        if href.startswith('/'):
-                            full_url = self.base_url + href
-                        else:
-                            full_url = href
+                        # 추적 파라미터 등을 떼어 같은 기사는 같은 URL이 되도록 정규화 (다른 호스트면 그대로)
+                        full_url = normalize_url(href, self.main_url)
+                        if full_url is None:
+                            full_url = self.base_url + href if href.startswith('/') else href
                     else:
                         continue
                     
@@ -73,334 +247,588 @@ class AITimesCrawler:
                     })
                     
                 except Exception as e:
-                    st.warning(f"뉴스 {i}번 처리 중 오류: {str(e)}")
+                    logger.warning(f"뉴스 {i}번 처리 중 오류: {str(e)}")
                     continue
             
             return news_data
             
         except Exception as e:
-            st.error(f"뉴스 목록 크롤링 중 오류 발생: {str(e)}")
+            logger.error(f"뉴스 목록 크롤링 중 오류 발생: {str(e)}")
+            self.metrics.inc('failures_total', stage='crawl_news_list')
+            return []
+    
+    @timed_stage('crawl_news_feed')
+    def crawl_news_feed(self, sections=DEFAULT_SECTIONS, max_depth=1, max_pages=10, max_articles=500,
+                        delay=0.5, workers=4):
+        """섹션/목록 페이지를 페이지네이션을 따라 크롤링해 상위 10개 제한 없이 기사 목록을 모음
+
+        sections는 sc_section_code 목록(None이면 전체 기사), delay는 같은 호스트에 대한 요청 간격(초)입니다.
+        """
+        try:
+            return FrontierCrawler(
+                self, sections=sections, max_depth=max_depth, max_pages=max_pages,
+                max_articles=max_articles, delay=delay, workers=workers
+            ).crawl()
+            
+        except Exception as e:
+            logger.error(f"뉴스 피드 크롤링 중 오류 발생: {str(e)}")
+            self.metrics.inc('failures_total', stage='crawl_news_feed')
             return []
     
     def crawl_article_content(self, url):
         """개별 뉴스 기사의 본문을 크롤링"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 기사 본문 추출 (여러 가능한 선택자 시도)
-            content_selectors = [
-                'div.news-content',
-                'div.article-content',
-                'div.view-content',
-                'div#article-content',
-                'div.content'
-            ]
-            
-            content = ""
-            for selector in content_selectors:
-                content_div = soup.select_one(selector)
-                if content_div:
-                    # p 태그들의 텍스트 추출
-                    paragraphs = content_div.find_all('p')
-                    content = '\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                    break
-            
-            # 위 방법으로 찾지 못한 경우, 모든 p 태그 시도
+            html = self._fetch(url)
+            with self.metrics.timer('parse_seconds', page='article'):
+                content = self.extractor.extract(html, url)
             if not content:
-                paragraphs = soup.find_all('p')
-                content = '\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-            
-            return content.strip()
+                self.metrics.inc('failures_total', stage='extract_article')
+            return content
             
         except Exception as e:
-            st.warning(f"기사 본문 크롤링 중 오류: {str(e)}")
+            logger.warning(f"기사 본문 크롤링 중 오류: {str(e)}")
+            self.metrics.inc('failures_total', stage='crawl_article_content')
             return ""
     
-    def summarize_with_gpt(self, title, content, api_key):
-        """OpenAI GPT를 사용하여 기사를 요약"""
-        try:
-            from openai import OpenAI
-            client = OpenAI(api_key=api_key)
-            
-            prompt = f"""
-다음 뉴스 기사를 아래 형식에 맞춰 한국어로 요약해주세요:
-
-기사 제목: {title}
-기사 내용: {content}
-
----
-## 🚀 {title}
+    @staticmethod
+    def summary_cache_key(title, content, model=SUMMARY_MODEL):
+        """요약 캐시 키 (모델, 프롬프트 템플릿과 응답 스키마, 제목, 정리된 본문 기준)"""
+        template = SUMMARY_PROMPT_TEMPLATE + json.dumps(SUMMARY_SCHEMA, ensure_ascii=False, sort_keys=True)
+        return SummaryCache.make_key(model, template, title, clean_content(content))
+    
+    @staticmethod
+    def summary_request(title, content):
+        """요약용 chat completions 요청 본문 (동기 호출과 Batch API가 공유, 본문은 정리 후 MAX_INPUT_TOKENS까지)
 
-### 💡 핵심 비유 (Analogy)
-- 내용을 한눈에 파악할 수 있는 강력하고 기억하기 쉬운 비유 또는 캐치프레이즈
+        응답은 SUMMARY_SCHEMA를 따르는 JSON으로 받습니다. (structured outputs)
+        """
+        content = truncate_to_tokens(clean_content(content), MAX_INPUT_TOKENS, SUMMARY_MODEL)
+        prompt = SUMMARY_PROMPT_TEMPLATE.format(title=title, content=content)
+        return {
+            'model': SUMMARY_MODEL,
+            'messages': [
+                {"role": "user", "content": prompt}
+            ],
+            'max_tokens': 2000,
+            'temperature': 0.7,
+            'response_format': SUMMARY_RESPONSE_FORMAT
+        }
+    
+    def _chat_completion(self, api_key, request, mode='summary'):
+        """LLM 백엔드로 chat completions 호출하고 (응답, 답한 백엔드의 모델) 반환 (한도/재시도/hedge는 백엔드가 맡음)
 
-### ✨ 핵심 요약 (Key Points)
-- 가장 중요한 내용 3가지 요약
-    - Point 1
-    - Point 2
-    - Point 3
+        지연과 토큰 사용량을 mode 라벨로 기록합니다. 응답은 답한 모델 키로 캐시해야 hedge에서 보조 백엔드가 답한
+        요약이 주 모델의 요약으로 쓰이지 않습니다.
+        """
+        with self.metrics.timer('llm_seconds', mode=mode):
+            response, model = self.llm.complete_with_model(request, api_key)
+        self._observe_usage(response.usage, mode)
+        return response, model
+    
+    def _observe_usage(self, usage, mode):
+        if usage is None:
+            return
+        self.metrics.observe('llm_tokens', usage.prompt_tokens, type='prompt', mode=mode)
+        self.metrics.observe('llm_tokens', usage.completion_tokens, type='completion', mode=mode)
+    
+    def _summarize_chunk(self, api_key, title, chunk, index, total):
+        """긴 기사의 한 조각을 글머리표 메모로 요약 (map 단계, 조각별로 캐시)"""
+        cache_key = SummaryCache.make_key(self.llm.model, MAP_PROMPT_TEMPLATE, title, chunk)
+        cached = self.summary_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        response, model = self._chat_completion(api_key, {
+            'model': SUMMARY_MODEL,
+            'messages': [{"role": "user", "content": MAP_PROMPT_TEMPLATE.format(
+                title=title, index=index, total=total, content=chunk)}],
+            'max_tokens': 400,
+            'temperature': 0.3
+        }, mode='map')
+        notes = response.choices[0].message.content
+        self.summary_cache.set(SummaryCache.make_key(model, MAP_PROMPT_TEMPLATE, title, chunk), notes)
+        return notes
+    
+    def _summary_source(self, api_key, title, content, stats=None):
+        """최종 요약 프롬프트에 넣을 본문
 
-### 📚 상세 내용 (Details)
-- 핵심 요약에서 제시된 내용에 대한 구체적인 설명, 배경 또는 주요 특징 기술
+        본문을 정리해 토큰 수를 세고, MAX_DIRECT_TOKENS 이하면 그대로, 넘으면 조각으로 나눠 동시에 요약(map)한
+        메모를 이어 붙여 반환합니다. (조각이 MAX_SUMMARY_CHUNKS개를 넘으면 뒷부분은 버림)
+        """
+        content = clean_content(content)
+        tokens = count_tokens(content, SUMMARY_MODEL)
+        if stats is not None:
+            stats['input_tokens'] = tokens
+        if tokens <= MAX_DIRECT_TOKENS:
+            return content
+        
+        chunks = split_chunks(content, SUMMARY_CHUNK_TOKENS, SUMMARY_MODEL)[:MAX_SUMMARY_CHUNKS]
+        if stats is not None:
+            stats['chunks'] = len(chunks)
+        with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+            notes = list(pool.map(
+                lambda item: self._summarize_chunk(api_key, title, item[1], item[0], len(chunks)),
+                enumerate(chunks, 1)
+            ))
+        return '\n\n'.join(notes)
+    
+    @staticmethod
+    def summary_result(title, text):
+        """JSON 요약 응답을 (마크다운 요약, 구조화 요약 딕셔너리)로 변환 (형식이 맞지 않으면 ValueError)"""
+        summary_data = parse_summary(text)
+        return summary_to_markdown(title, summary_data), summary_data
+    
+    def _cached_summary(self, cache_key):
+        """캐시된 JSON 요약을 읽음 (형식이 맞지 않는 항목은 없는 것으로 봄)"""
+        cached = self.summary_cache.get(cache_key)
+        if cached is None:
+            return None
+        try:
+            parse_summary(cached)
+        except ValueError:
+            return None
+        return cached
+    
+    def summarize_with_gpt(self, title, content, api_key):
+        """LLM 백엔드(기본: OpenAI GPT)로 기사를 요약 (긴 기사는 조각별 요약 후 합침)
 
-### 🤔 비판적 관점 (Critical Points)
-- 해당 내용에 대해 주의 깊게 생각하거나 경계해야 할 지점, 또는 더 깊이 생각해 볼 만한 질문 제시
-    - Point 1
-    - Point 2
+        (마크다운 요약, 구조화 요약 딕셔너리)를 반환합니다. 실패하면 ("요약 실패: ...", None)입니다.
+        api_key는 OpenAI 백엔드에만 쓰입니다.
+        """
+        try:
+            cache_key = self.summary_cache_key(title, content, self.llm.model)
+            cached_summary = self._cached_summary(cache_key)
+            if cached_summary is not None:
+                return self.summary_result(title, cached_summary)
+            
+            source = self._summary_source(api_key, title, content)
+            response, model = self._chat_completion(api_key, self.summary_request(title, source))
+            
+            text = response.choices[0].message.content
+            result = self.summary_result(title, text)
+            self.summary_cache.set(self.summary_cache_key(title, content, model), text)
+            return result
+            
+        except Exception as e:
+            logger.error(f"AI 요약 중 오류 발생: {str(e)}")
+            self.metrics.inc('failures_total', stage='summarize')
+            return f"{SUMMARY_FAILED}: {str(e)}", None
+    
+    def summarize_with_gpt_stream(self, title, content, api_key, stats=None):
+        """LLM 백엔드의 요약(JSON)을 토큰이 도착하는 대로 텍스트 조각으로 생성
 
-### 📊 숫자 (Numbers)
-*(선택 사항: 관련 데이터가 중요할 경우)*
-- 핵심 통계 1:
-- 핵심 통계 2:
+        조각을 이어 붙인 텍스트는 summary_result로, 받는 중인 앞부분은 parse_partial_summary로 읽습니다.
 
-### 👟 쉬운 첫걸음 (Easy Next Step)
-- 핵심 교훈을 바탕으로, 가장 마찰이 적고 즉시 실행 가능한 구체적인 행동 1가지 제안
+        stats 딕셔너리에 ttft_s(첫 토큰까지 시간), completion_tokens, tokens_per_s, elapsed_s,
+        input_tokens(정리된 본문 토큰 수), chunks(조각별 요약을 거친 경우 조각 수)를 기록합니다.
+        오류가 나면 stats['error']에 메시지를 남기고 생성을 멈춥니다.
+        """
+        stats = {} if stats is None else stats
+        started = time.perf_counter()
+        try:
+            cache_key = self.summary_cache_key(title, content, self.llm.model)
+            cached_summary = self._cached_summary(cache_key)
+            if cached_summary is not None:
+                stats.update({'cached': True, 'ttft_s': time.perf_counter() - started})
+                yield cached_summary
+                return
+            
+            source = self._summary_source(api_key, title, content, stats)
+            request_started = time.perf_counter()
+            response, model = self.llm.stream_with_model(self.summary_request(title, source), api_key)
+            
+            parts = []
+            first_token_at = None
+            usage = None
+            usage_tokens = None
+            for chunk in response:
+                if chunk.usage:
+                    usage = chunk.usage
+                    usage_tokens = chunk.usage.completion_tokens
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    stats['ttft_s'] = first_token_at - started
+                    self.metrics.observe('llm_ttft_seconds', first_token_at - request_started)
+                parts.append(chunk.choices[0].delta.content)
+                yield parts[-1]
+            
+            finished = time.perf_counter()
+            self.metrics.observe('llm_seconds', finished - request_started, mode='stream')
+            self._observe_usage(usage, 'stream')
+            tokens = usage_tokens or len(parts)
+            stats['completion_tokens'] = tokens
+            stats['elapsed_s'] = finished - started
+            if first_token_at is not None and finished > first_token_at:
+                stats['tokens_per_s'] = tokens / (finished - first_token_at)
+            
+            # 형식이 맞는 응답만 캐시 (max_tokens에서 잘린 JSON은 다음에 다시 요약)
+            text = ''.join(parts)
+            try:
+                parse_summary(text)
+                self.summary_cache.set(self.summary_cache_key(title, content, model), text)
+            except ValueError:
+                pass
+            
+        except Exception as e:
+            logger.error(f"AI 요약 스트리밍 중 오류 발생: {str(e)}")
+            self.metrics.inc('failures_total', stage='summarize')
+            stats['error'] = str(e)
+    
+    # 요약 성공 여부 (summary_schema.is_summary_ok, 앱/CLI에서 크롤러를 통해 사용)
+    is_summary_ok = staticmethod(is_summary_ok)
+    
+    def iter_articles(self, news_list, api_key, fetch_workers=4, summary_workers=2, incremental=False, stream=False,
+                      dedupe=True, check_changes=True):
+        """본문 크롤링과 AI 요약을 단계별 스레드 풀에서 겹쳐 실행하며 진행 이벤트를 생성
 
----
+        이벤트는 호출한 스레드에서 다음 형태로 전달됩니다.
+        - ('chunk', 인덱스, 텍스트 조각): stream=True일 때 요약 토큰이 도착할 때마다
+        - ('stats', 인덱스, 통계): stream=True일 때 요약이 끝나면 (TTFT, 초당 토큰 수 등)
+        - ('done', 인덱스, 결과): 기사 하나의 처리가 끝날 때마다
+        incremental=True이면 기사 인덱스에 같은 제목으로 요약이 남아 있는 기사는 저장된 결과를 재사용합니다.
+        check_changes=True이면 이런 기사도 본문을 다시 가져와(조건부 요청) 본문 지문이 바뀐 기사만 다시 요약하고,
+        False이면 본문 크롤링까지 건너뜁니다. 본문을 가져오지 못하면 저장된 결과를 그대로 씁니다.
+        dedupe=True이면 같은 기사 ID(URL만 다른 경우)는 한 번만 크롤링하고, 본문이 거의 같은 기사는
+        먼저 도착한 대표 기사만 요약한 뒤 요약을 재사용합니다. 이렇게 채운 결과에는 대표 기사 URL이 duplicate_of로 남습니다.
+        """
+        def make_record(news, content, summary=None, summary_data=None, duplicate_of=None):
+            return {
+                'rank': news['rank'],
+                'title': news['title'],
+                'url': news['url'],
+                'content': content,
+                'summary': summary,
+                'summary_data': summary_data,
+                'crawl_time': news['crawl_time'],
+                'duplicate_of': duplicate_of
+            }
+        
+        # 증분 모드: 이미 요약된 기사는 요약 없이 채움 (check_changes=True이면 본문 지문을 비교한 뒤)
+        new_indices = []
+        known_articles = {}
+        for i, news in enumerate(news_list):
+            known = self.article_index.get(news['url']) if incremental else None
+            if known and known['title'] == news['title'] and self.is_summary_ok(known['summary'], known['summary_data']):
+                if not check_changes:
+                    yield ('done', i, make_record(news, known['content'], known['summary'], known['summary_data']))
+                    continue
+                known_articles[i] = known
+            new_indices.append(i)
+        
+        # 대표 기사 인덱스 -> 결과를 재사용할 기사 인덱스 목록 (같은 기사 ID 또는 유사 본문)
+        followers = {}
+        fetch_indices = []
+        first_by_id = {}
+        for i in new_indices:
+            article_id = ArticleIndex.article_id_from_url(news_list[i]['url'])
+            if dedupe and article_id in first_by_id:
+                followers.setdefault(first_by_id[article_id], []).append(i)
+            else:
+                first_by_id[article_id] = i
+                fetch_indices.append(i)
+        near_duplicates = NearDuplicateIndex() if dedupe else None
+        finished = {}
+        
+        # 작업 스레드는 완료/토큰 이벤트를 큐에 넣고, 이 생성기가 호출한 스레드에서 꺼내 처리
+        events = queue.Queue()
+        
+        def summarize(i, record):
+            if not stream:
+                return self.summarize_with_gpt(record['title'], record['content'], api_key)
+            stats = {}
+            parts = []
+            for chunk in self.summarize_with_gpt_stream(record['title'], record['content'], api_key, stats):
+                parts.append(chunk)
+                events.put(('chunk', i, chunk))
+            events.put(('stats', i, stats))
+            if 'error' in stats:
+                return f"{SUMMARY_FAILED}: {stats['error']}", None
+            try:
+                return self.summary_result(record['title'], ''.join(parts))
+            except ValueError as e:
+                self.metrics.inc('failures_total', stage='summarize')
+                return f"{SUMMARY_FAILED}: {str(e)}", None
+        
+        with ThreadPoolExecutor(max_workers=max(1, fetch_workers)) as fetch_pool, \
+                ThreadPoolExecutor(max_workers=max(1, summary_workers)) as summary_pool:
+            
+            def submit_summary(i, record):
+                # 요약 단계: 본문이 도착하는 대로 요약 풀에 넘김
+                future = summary_pool.submit(summarize, i, record)
+                future.add_done_callback(lambda f, i=i, record=record: events.put(('summarized', i, (record, f))))
+            
+            def reuse(rep, record):
+                # 대표 기사의 요약을 재사용한 결과
+                record['summary'] = finished[rep]['summary']
+                record['summary_data'] = finished[rep]['summary_data']
+                record['duplicate_of'] = finished[rep]['url']
+                if self.is_summary_ok(record['summary'], record['summary_data']):
+                    self.article_index.upsert(record['url'], record['title'], record['content'], record['summary'],
+                                              record['summary_data'])
+                return record
+            
+            def finish(i, record):
+                # 결과를 확정하고, 이 기사를 따르는 기사들의 결과까지 (인덱스, 결과) 목록으로 반환
+                finished[i] = record
+                results = [(i, record)]
+                for follower in followers.pop(i, []):
+                    if isinstance(follower, tuple):
+                        j, follower_record = follower
+                        if not self.is_summary_ok(record['summary'], record['summary_data']):
+                            # 대표 기사 요약이 실패하면 유사 기사는 따로 요약
+                            submit_summary(j, follower_record)
+                            continue
+                        results.extend(finish(j, reuse(i, follower_record)))
+                    else:
+                        # 같은 기사 ID는 본문을 가져오지 못했거나 요약이 실패해도 그대로 따름
+                        follower_record = make_record(news_list[follower], record['content'])
+                        results.extend(finish(follower, reuse(i, follower_record)))
+                return results
+            
+            # 본문 크롤링 단계: 모든 기사를 한 번에 제출하고 풀 크기로 동시성 제한
+            for i in fetch_indices:
+                future = fetch_pool.submit(self.crawl_article_content, news_list[i]['url'])
+                future.add_done_callback(lambda f, i=i: events.put(('fetched', i, f)))
+            
+            remaining = len(new_indices)
+            while remaining:
+                kind, i, payload = events.get()
+                news = news_list[i]
+                
+                if kind in ('chunk', 'stats'):
+                    yield (kind, i, payload)
+                    continue
+                
+                if kind == 'fetched':
+                    content = payload.result()
+                    record = make_record(news, content)
+                    known = known_articles.get(i)
+                    if known and not content:
+                        self.metrics.inc('content_checks_total', result='unavailable')
+                        results = finish(i, make_record(news, known['content'], known['summary'], known['summary_data']))
+                    elif known and fingerprint(content)[0] == known['fingerprint']:
+                        self.metrics.inc('content_checks_total', result='unchanged')
+                        results = finish(i, make_record(news, content, known['summary'], known['summary_data']))
+                    elif not content:
+                        record['content'] = "본문을 가져올 수 없습니다."
+                        record['summary'] = SUMMARY_UNAVAILABLE
+                        results = finish(i, record)
+                    else:
+                        if known:
+                            # 게시 후 수정된 기사: 다시 요약하고, 인덱스에 기록할 때 문단 단위 차이를 남김
+                            self.metrics.inc('content_checks_total', result='changed')
+                            logger.info("기사 본문 수정 감지", extra={'fields': {'url': news['url'], 'title': news['title']}})
+                        rep = near_duplicates.find_or_add(i, content) if near_duplicates else None
+                        if rep is None or (rep in finished and not self.is_summary_ok(finished[rep]['summary'],
+                                                                                       finished[rep]['summary_data'])):
+                            submit_summary(i, record)
+                            continue
+                        if rep not in finished:
+                            # 대표 기사 요약이 끝나면 함께 채움
+                            followers.setdefault(rep, []).append((i, record))
+                            continue
+                        results = finish(i, reuse(rep, record))
+                else:
+                    record, future = payload
+                    record['summary'], record['summary_data'] = future.result()
+                    if self.is_summary_ok(record['summary'], record['summary_data']):
+                        self.article_index.upsert(record['url'], record['title'], record['content'], record['summary'],
+                                                  record['summary_data'])
+                    results = finish(i, record)
+                
+                for j, done_record in results:
+                    remaining -= 1
+                    yield ('done', j, done_record)
+    
+    @timed_stage('process_articles')
+    def process_articles(self, news_list, api_key, fetch_workers=4, summary_workers=2, progress_callback=None,
+                         incremental=False, dedupe=True, check_changes=True):
+        """본문 크롤링과 AI 요약을 단계별 스레드 풀에서 겹쳐 실행
 
-### 🧩 핵심 개념 & 용어
-- 기술적으로 중요하거나 어려운 핵심 용어 3개를 비유를 통해 한 줄로 설명하여 소화 및 기억을 돕습니다.
-    - **용어 1**:
-    - **용어 2**:
-    - **용어 3**:
+        progress_callback(완료 개수, 전체 개수, 뉴스)는 호출한 스레드에서 기사 하나가 끝날 때마다 호출됩니다.
+        incremental=True이면 기사 인덱스에 같은 제목으로 요약이 남아 있고 본문 지문이 같은 기사는 저장된 결과를
+        재사용합니다. (check_changes는 iter_articles 참고)
+        dedupe=True이면 URL만 다르거나 본문이 거의 같은 기사는 대표 기사 하나만 요약합니다. (iter_articles 참고)
+        결과는 news_list와 같은 순서로 반환합니다.
+        """
+        total = len(news_list)
+        enhanced_news = [None] * total
+        completed = 0
+        
+        for kind, i, payload in self.iter_articles(news_list, api_key, fetch_workers, summary_workers, incremental,
+                                                   dedupe=dedupe, check_changes=check_changes):
+            if kind != 'done':
+                continue
+            enhanced_news[i] = payload
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, total, news_list[i])
+        
+        return enhanced_news
+    
+    @timed_stage('save_run')
+    def save_run(self, news_data):
+        """실행 결과를 기사 저장소에 추가하고 run_id 반환"""
+        try:
+            summary_count = len([n for n in news_data if self.is_summary_ok(n.get('summary'), n.get('summary_data'))])
+            run_id = self.article_store.save_run(news_data, summary_count=summary_count)
+        except Exception as e:
+            logger.error(f"실행 결과 저장 중 오류: {str(e)}")
+            self.metrics.inc('failures_total', stage='save_run')
+            return None
+        self.update_search_index()
+        return run_id
+    
+    def update_search_index(self):
+        """검색 인덱스에 아직 색인하지 않은 실행의 기사를 추가하고 추가한 기사 수 반환"""
+        try:
+            with self.metrics.timer('stage_seconds', stage='update_search_index'):
+                return self.search_index.sync(self.article_store)
+        except Exception as e:
+            logger.warning(f"검색 인덱스 갱신 중 오류: {str(e)}")
+            self.metrics.inc('failures_total', stage='update_search_index')
+            return 0
+    
+    def search_articles(self, query, limit=20, offset=0, start=None, end=None, semantic=False):
+        """크롤링한 기사 검색 (semantic=True면 임베딩 의미 검색, 아니면 키워드 검색)
 
-### 📖 참고: 선행 지식 (Prerequisites)
-- 이 정보를 완전히 이해하기 위해 필요한 사전 지식이나 조건
-"""
-            
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",  # gpt-4.1-mini가 아직 없으므로 gpt-4o-mini 사용
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content
-            
+        검색 전에 아직 색인하지 않은 실행이 있으면 먼저 색인합니다.
+        """
+        self.update_search_index()
+        try:
+            if semantic:
+                return self.search_index.semantic_search(query, limit=limit, start=start, end=end)
+            return self.search_index.search(query, limit=limit, offset=offset, start=start, end=end)
         except Exception as e:
-            st.error(f"AI 요약 중 오류 발생: {str(e)}")
-            return f"요약 실패: {str(e)}"
+            logger.error(f"기사 검색 중 오류: {str(e)}")
+            return []
     
-    def save_to_csv(self, news_data):
-        """뉴스 데이터를 CSV 파일로 저장"""
+    @timed_stage('export_run_csv')
+    def export_run_csv(self, run_id):
+        """저장소의 실행 결과를 CSV 파일로 내보냄 (이미 내보낸 파일이 있으면 그대로 반환)"""
         try:
+            run = self.article_store.get_run(run_id)
+            if run is None:
+                raise ValueError(f"실행 {run_id}을(를) 찾을 수 없습니다.")
+            if run['csv_path'] and os.path.exists(run['csv_path']):
+                return run['csv_path']
+            
             # crawled_data 디렉토리 생성
             os.makedirs("crawled_data", exist_ok=True)
             
-            # 파일명 생성 (aitimes_yyyy_mm_dd_hhmmss.csv)
-            timestamp = datetime.now().strftime("%Y_%m_%d_%H%M%S")
+            # 파일명 생성 (aitimes_yyyy_mm_dd_hhmmss.csv, 실행 저장 시각 기준)
+            timestamp = datetime.strptime(run['created_at'], "%Y-%m-%d %H:%M:%S").strftime("%Y_%m_%d_%H%M%S")
             filename = f"crawled_data/aitimes_{timestamp}.csv"
+            if os.path.exists(filename):
+                filename = f"crawled_data/aitimes_{timestamp}_{run_id}.csv"
             
-            df = pd.DataFrame(news_data)
-            df.to_csv(filename, index=False, encoding='utf-8-sig')
+            # 저장소에서 묶음 단위로 읽어 바로 파일에 씀 (구조화 요약은 JSON 문자열 열)
+            write_csv(filename, self.article_store.stream_articles(run_id=run_id), CSV_COLUMNS)
+            self.article_store.set_run_file(run_id, csv_path=filename)
             return filename
         except Exception as e:
-            st.error(f"CSV 저장 중 오류: {str(e)}")
+            logger.error(f"CSV 저장 중 오류: {str(e)}")
+            self.metrics.inc('failures_total', stage='export_run_csv')
             return None
     
-    def create_pdf_report(self, csv_file_path):
-        """CSV 파일을 읽어서 PDF 리포트 생성"""
+    @timed_stage('export_articles')
+    def export_articles(self, start=None, end=None, fmt='csv', path=None):
+        """기간 내 모든 실행의 기사 행을 CSV 또는 JSONL 파일로 내보내고 (경로, 행 수) 반환
+
+        저장소에서 묶음 단위로 읽어 파일에 바로 쓰므로 몇 달치를 내보내도 메모리 사용량이 늘지 않습니다.
+        실패하면 (None, 0)을 반환합니다.
+        """
         try:
-            # CSV 파일 읽기
-            df = pd.read_csv(csv_file_path)
-            
-            # PDF 파일명 생성
-            csv_filename = os.path.basename(csv_file_path)
-            pdf_filename = csv_filename.replace('.csv', '_report.pdf')
-            pdf_path = os.path.join(os.path.dirname(csv_file_path), pdf_filename)
-            
-            # 한글 폰트 등록 (CID 폰트 사용)
-            try:
-                from reportlab.pdfbase.cidfonts import UnicodeCIDFont
-                
-                # 한글 지원 CID 폰트 등록 시도
-                korean_fonts = ['HYSMyeongJoStd-Medium', 'HYGothic-Medium', 'AppleGothic']
-                korean_font_registered = False
-                
-                for font_name in korean_fonts:
-                    try:
-                        pdfmetrics.registerFont(UnicodeCIDFont(font_name))
-                        korean_font_registered = True
-                        st.info(f"✅ 한글 CID 폰트 로드 성공: {font_name}")
-                        break
-                    except:
-                        continue
-                
-                if not korean_font_registered:
-                    st.info("ℹ️ CID 폰트를 사용할 수 없습니다. 기본 폰트를 사용합니다.")
-                    
-            except Exception as font_error:
-                st.info(f"ℹ️ CID 폰트 등록 중 오류: {str(font_error)}. 기본 폰트를 사용합니다.")
-            
-            # PDF 문서 생성
-            doc = SimpleDocTemplate(pdf_path, pagesize=A4,
-                                  rightMargin=inch, leftMargin=inch,
-                                  topMargin=inch, bottomMargin=inch)
-            
-            # 스타일 설정
-            styles = getSampleStyleSheet()
-            
-            # 사용할 폰트 결정 (CID 폰트 우선, 없으면 기본 폰트)
-            korean_fonts = ['HYSMyeongJoStd-Medium', 'HYGothic-Medium', 'AppleGothic']
-            available_korean_font = None
-            
-            for font_name in korean_fonts:
-                try:
-                    # 폰트가 등록되어 있는지 확인
-                    from reportlab.pdfbase.pdfmetrics import getFont
-                    getFont(font_name)
-                    available_korean_font = font_name
-                    break
-                except:
-                    continue
-            
-            regular_font = available_korean_font if available_korean_font else 'Helvetica'
-            bold_font = available_korean_font if available_korean_font else 'Helvetica-Bold'
-            
-            # 제목 스타일
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                spaceAfter=30,
-                alignment=1,  # 중앙 정렬
-                textColor='#2E86AB',
-                fontName=bold_font
-            )
-            
-            # 헤딩 스타일
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=16,
-                spaceAfter=12,
-                spaceBefore=20,
-                textColor='#A23B72',
-                fontName=bold_font
-            )
-            
-            # 본문 스타일
-            body_style = ParagraphStyle(
-                'CustomBody',
-                parent=styles['Normal'],
-                fontSize=11,
-                spaceAfter=12,
-                leading=14,
-                fontName=regular_font
-            )
-            
-            # 소제목 스타일
-            subtitle_style = ParagraphStyle(
-                'CustomSubtitle',
-                parent=styles['Normal'],
-                fontSize=13,
-                spaceAfter=8,
-                spaceBefore=12,
-                textColor='#F18F01',
-                fontName=bold_font
-            )
-            
-            # 리포트 내용 구성
-            story = []
-            
-            # 제목
-            crawl_time = df['crawl_time'].iloc[0] if 'crawl_time' in df.columns else "Unknown"
-            story.append(Paragraph(f"AI타임스 뉴스 리포트", title_style))
-            story.append(Paragraph(f"크롤링 시간: {crawl_time}", body_style))
-            story.append(Spacer(1, 20))
-            
-            # 요약 통계
-            story.append(Paragraph("📊 크롤링 요약", heading_style))
-            story.append(Paragraph(f"• 총 뉴스 개수: {len(df)}개", body_style))
-            
-            successful_summaries = len(df[~df['summary'].str.startswith('요약 실패', na=False)]) if 'summary' in df.columns else 0
-            story.append(Paragraph(f"• AI 요약 성공: {successful_summaries}개", body_style))
-            story.append(Spacer(1, 20))
-            
-            # 각 뉴스별 상세 리포트
-            for idx, row in df.iterrows():
-                # 페이지 나누기 (첫 번째 뉴스 제외)
-                if idx > 0:
-                    story.append(PageBreak())
-                
-                # 뉴스 제목
-                story.append(Paragraph(f"📰 뉴스 #{row.get('rank', idx+1)}: {row['title']}", heading_style))
-                story.append(Paragraph(f"URL: {row['url']}", body_style))
-                story.append(Spacer(1, 12))
-                
-                # AI 요약이 있는 경우
-                if 'summary' in row and pd.notna(row['summary']) and not str(row['summary']).startswith('요약 실패'):
-                    summary_text = str(row['summary'])
-                    
-                    # 마크다운을 HTML로 변환 후 단순화
-                    try:
-                        # 마크다운 특수 문자들을 단순화
-                        summary_text = summary_text.replace('### ', '')
-                        summary_text = summary_text.replace('## ', '')
-                        summary_text = summary_text.replace('# ', '')
-                        summary_text = summary_text.replace('**', '')
-                        summary_text = summary_text.replace('*', '•')
-                        summary_text = summary_text.replace('- ', '• ')
-                        
-                        # 이모지와 제목들을 적절히 처리
-                        lines = summary_text.split('\n')
-                        processed_lines = []
-                        
-                        for line in lines:
-                            line = line.strip()
-                            if not line:
-                                continue
-                                
-                            # 이모지가 포함된 섹션 제목들
-                            if any(emoji in line for emoji in ['🚀', '💡', '✨', '📚', '🤔', '📊', '👟', '🧩', '📖']):
-                                processed_lines.append(f"<b>{line}</b>")
-                            else:
-                                processed_lines.append(line)
-                        
-                        summary_text = '<br/>'.join(processed_lines)
-                        story.append(Paragraph(summary_text, body_style))
-                        
-                    except Exception as e:
-                        # 마크다운 처리 실패 시 원본 텍스트 사용
-                        clean_text = summary_text.replace('<', '&lt;').replace('>', '&gt;')
-                        story.append(Paragraph(clean_text, body_style))
-                        
-                else:
-                    story.append(Paragraph("AI 요약을 생성할 수 없었습니다.", body_style))
-                
-                story.append(Spacer(1, 20))
-            
-            # PDF 생성
-            doc.build(story)
-            return pdf_path
-            
+            if fmt not in EXPORT_FORMATS:
+                raise ValueError(f"지원하지 않는 형식: {fmt}")
+            if path is None:
+                period = f"{start or 'start'}_{end or 'end'}".replace('-', '_')
+                path = os.path.join("crawled_data", f"aitimes_export_{period}.{fmt}")
+            
+            articles = self.article_store.stream_articles(start=start, end=end)
+            if fmt == 'csv':
+                count = write_csv(path, articles, HISTORY_CSV_COLUMNS)
+            else:
+                count = write_jsonl(path, articles)
+            return path, count
         except Exception as e:
-            st.error(f"PDF 리포트 생성 중 오류: {str(e)}")
+            logger.error(f"기사 내보내기 중 오류: {str(e)}")
+            self.metrics.inc('failures_total', stage='export_articles')
+            return None, 0
+    
+    def create_run_pdf_report(self, run_id):
+        """저장소의 실행 결과로 PDF 리포트 생성 후 경로를 실행 기록에 남김"""
+        csv_file = self.export_run_csv(run_id)
+        if not csv_file:
             return None
+        pdf_path = self.create_pdf_report(csv_file)
+        if pdf_path:
+            self.article_store.set_run_file(run_id, pdf_path=pdf_path)
+        return pdf_path
     
-    def get_csv_files(self):
-        """crawled_data 디렉토리의 CSV 파일 목록 반환"""
+    @timed_stage('create_digest_pdf_report')
+    def create_digest_pdf_report(self, start=None, end=None, workers=None, progress_callback=None):
+        """기간 내 여러 실행의 기사를 하나의 다이제스트 PDF(표지 + 목차)로 생성
+
+        같은 기사가 여러 실행에 있으면 가장 최근 것만 사용합니다. workers개 프로세스에서 기사 조각을
+        나눠 렌더링하며, progress_callback(완료 수, 전체 수)으로 진행 상황을 알립니다.
+        """
         try:
-            if not os.path.exists("crawled_data"):
-                return []
+            # 리포트에는 본문이 필요 없으므로 본문을 빼고 묶음 단위로 읽음
+            articles = []
+            seen = set()
+            for article in self.article_store.stream_articles(start=start, end=end, with_content=False):
+                if article['article_id'] not in seen:
+                    seen.add(article['article_id'])
+                    articles.append(article)
+            if not articles:
+                raise ValueError("기간 내 기사가 없습니다.")
             
-            csv_files = []
-            for file in os.listdir("crawled_data"):
-                if file.endswith('.csv') and file.startswith('aitimes_'):
-                    csv_files.append(os.path.join("crawled_data", file))
+            os.makedirs("crawled_data", exist_ok=True)
+            period = f"{start or articles[-1]['crawl_time'][:10]} ~ {end or articles[0]['crawl_time'][:10]}"
+            pdf_path = f"crawled_data/aitimes_digest_{period.replace(' ~ ', '_').replace('-', '_')}.pdf"
+            return self.report_builder.build_digest(articles, period, pdf_path, workers, progress_callback)
             
-            # 최신순으로 정렬
-            csv_files.sort(key=os.path.getmtime, reverse=True)
-            return csv_files
+        except Exception as e:
+            logger.error(f"다이제스트 PDF 생성 중 오류: {str(e)}")
+            self.metrics.inc('failures_total', stage='create_digest_pdf_report')
+            return None
+    
+    def save_to_csv(self, news_data):
+        """뉴스 데이터를 기사 저장소에 추가하고 CSV 파일로도 내보냄"""
+        run_id = self.save_run(news_data)
+        if run_id is None:
+            return None
+        return self.export_run_csv(run_id)
+    
+    @timed_stage('create_pdf_report')
+    def create_pdf_report(self, csv_file_path):
+        """CSV 파일을 읽어서 PDF 리포트 생성 (내용이 그대로면 기존 리포트 반환)"""
+        try:
+            return self.report_builder.build(csv_file_path)
             
         except Exception as e:
-            st.error(f"CSV 파일 목록 조회 중 오류: {str(e)}")
-            return [] 
\ No newline at end of file
+            logger.error(f"PDF 리포트 생성 중 오류: {str(e)}")
+            self.metrics.inc('failures_total', stage='create_pdf_report')
+            return None
+    
+    def import_untracked_csv_files(self):
+        """실행 기록에 없는 crawled_data/aitimes_*.csv 파일을 저장소로 가져오고 가져온 개수 반환"""
+        if not os.path.exists("crawled_data"):
+            return 0
+        
+        tracked = self.article_store.tracked_csv_paths()
+        imported = 0
+        for file in sorted(os.listdir("crawled_data")):
+            path = os.path.join("crawled_data", file)
+            if file.endswith('.csv') and file.startswith('aitimes_') and path not in tracked:
+                try:
+                    self.article_store.import_csv(path, is_summary_ok=self.is_summary_ok)
+                    imported += 1
+                except Exception as e:
+                    logger.warning(f"CSV 가져오기 실패 ({path}): {str(e)}")
+        if imported:
+            self.update_search_index()
+        return imported
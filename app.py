@@ -1,8 +1,113 @@
 import streamlit as st
 import pandas as pd
-import time
 from aitimes_crawler import AITimesCrawler
+from exports import EXPORT_FORMATS
+from llm_backends import HedgedBackend, backend_from_env
+from job_queue import JobQueue, JobRunner
+from summary_schema import parse_partial_summary, summary_to_markdown
 import os
+import threading
+import time
+
+# 화면에서 내려받을 수 있는 파일 크기 상한(MB). Streamlit은 내려받을 파일 전체를 서버 메모리에 올리므로
+# 더 큰 파일은 버튼 대신 CLI 내보내기를 안내
+MAX_DOWNLOAD_MB = 50
+
+@st.cache_resource
+def get_crawler():
+    """커넥션 풀과 조건부 요청 캐시를 재실행 간에 공유하도록 크롤러를 한 번만 생성
+
+    LLM 백엔드는 LLM_BACKEND/LLM_HEDGE_BACKEND/LOCAL_LLM_BASE_URL 등 환경변수로 고릅니다. (기본: OpenAI)
+    """
+    return AITimesCrawler(llm=backend_from_env())
+
+@st.cache_resource
+def get_job_runner():
+    """요약 작업 큐와 백그라운드 작업자를 프로세스당 한 번만 시작 (모든 세션이 공유)"""
+    return JobRunner(get_crawler(), JobQueue()).start()
+
+def format_stream_stats(stats):
+    """TTFT와 초당 토큰 수를 한 줄로 표시"""
+    if stats.get('cached'):
+        return "⚡ 캐시된 요약"
+    if 'ttft_s' not in stats:
+        return ""
+    text = f"⏱️ 첫 토큰 {stats['ttft_s']:.2f}초"
+    if stats.get('tokens_per_s'):
+        text += f" · {stats['tokens_per_s']:.1f} 토큰/초 · {stats['completion_tokens']} 토큰"
+    return text
+
+def file_data(path):
+    """다운로드 버튼용 지연 읽기 함수 (페이지를 그릴 때마다 파일 전체를 읽지 않고, 누를 때 한 번 읽음)"""
+    def read():
+        with open(path, 'rb') as f:
+            return f.read()
+    return read
+
+def download_file_button(label, path, mime, key=None):
+    """파일 다운로드 버튼 (MAX_DOWNLOAD_MB보다 큰 파일은 메모리에 올리지 않고 CLI 내보내기를 안내)"""
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    if size_mb > MAX_DOWNLOAD_MB:
+        st.warning(f"⚠️ 파일이 {size_mb:.0f}MB로 화면에서 내려받기에는 너무 큽니다. (상한 {MAX_DOWNLOAD_MB}MB) "
+                   f"서버의 `{path}` 파일을 직접 쓰거나, 기간을 나눠 "
+                   f"`python aitimes_cli.py export --start ... --end ... --output ...`로 내보내세요.")
+        return
+    st.download_button(label=label, data=file_data(path), file_name=os.path.basename(path), mime=mime, key=key)
+
+def render_summary(summary_data):
+    """구조화 요약을 필드별로 표시 (비유/첫걸음은 강조 상자, 숫자/용어는 표)"""
+    if summary_data['analogy']:
+        st.info(f"💡 {summary_data['analogy']}")
+    if summary_data['key_points']:
+        st.markdown("#### ✨ 핵심 요약")
+        st.markdown('\n'.join(f"{i}. {point}" for i, point in enumerate(summary_data['key_points'], 1)))
+    if summary_data['details']:
+        st.markdown("#### 📚 상세 내용")
+        st.markdown(summary_data['details'])
+    if summary_data['critical_points']:
+        st.markdown("#### 🤔 비판적 관점")
+        st.markdown('\n'.join(f"- {point}" for point in summary_data['critical_points']))
+    if summary_data['numbers']:
+        st.markdown("#### 📊 숫자")
+        st.dataframe(pd.DataFrame(summary_data['numbers']).rename(columns={'label': '항목', 'value': '값'}),
+                     use_container_width=True, hide_index=True)
+    if summary_data['next_step']:
+        st.success(f"👟 쉬운 첫걸음: {summary_data['next_step']}")
+    if summary_data['terms']:
+        st.markdown("#### 🧩 핵심 개념 & 용어")
+        st.markdown('\n'.join(f"- **{term['term']}**: {term['explanation']}" for term in summary_data['terms']))
+    if summary_data['prerequisites']:
+        st.markdown("#### 📖 참고: 선행 지식")
+        st.markdown(summary_data['prerequisites'])
+
+def load_run_into_session(crawler, run_id, stream_stats=None):
+    """저장소의 실행 결과를 대시보드에서 보도록 세션 상태에 불러옴"""
+    st.session_state.enhanced_news = [
+        dict(news, content=news['content'] or '', summary=news['summary'] or '')
+        for news in crawler.article_store.load_run(run_id)
+    ]
+    st.session_state.run_id = run_id
+    st.session_state.stream_stats = stream_stats or {}
+
+def start_digest_job(crawler, start, end, workers):
+    """다이제스트 PDF를 백그라운드 스레드에서 생성하고 진행 상황을 담을 상태 dict 반환
+
+    작업 스레드는 Streamlit API를 호출하지 않고 이 dict만 갱신하며, 화면은 fragment가 주기적으로 읽어 그립니다.
+    """
+    job = {'completed': 0, 'total': 0, 'pdf_path': None, 'finished': False}
+    
+    def progress(completed, total):
+        job['completed'] = completed
+        job['total'] = total
+    
+    def run():
+        try:
+            job['pdf_path'] = crawler.create_digest_pdf_report(start, end, workers=workers, progress_callback=progress)
+        finally:
+            job['finished'] = True
+    
+    threading.Thread(target=run, name="digest-pdf", daemon=True).start()
+    return job
 
 def main():
     st.set_page_config(
@@ -24,8 +129,39 @@ def main():
         help="https://platform.openai.com/api-keys 에서 API 키를 발급받을 수 있습니다."
     )
     
-    # 크롤러 인스턴스 생성
-    crawler = AITimesCrawler()
+    # 동시 처리 설정
+    fetch_workers = st.sidebar.number_input(
+        "본문 크롤링 동시 처리 수", min_value=1, max_value=16, value=4,
+        help="기사 본문을 동시에 가져올 최대 개수입니다."
+    )
+    summary_workers = st.sidebar.number_input(
+        "AI 요약 동시 처리 수", min_value=1, max_value=8, value=2,
+        help="동시에 요약할 최대 기사 수입니다. 실제 OpenAI 동시 요청 수는 분당 요청/토큰 한도와 429 응답에 맞춰 이 안에서 자동으로 조절됩니다."
+    )
+    
+    incremental = st.sidebar.checkbox(
+        "증분 크롤링 (새 기사만 처리)", value=True,
+        help="이전에 요약한 기사는 본문만 다시 확인해 내용이 바뀌지 않았으면 AI 요약을 건너뛰고 저장된 결과를 재사용합니다. "
+             "게시 후 수정된 기사만 다시 요약합니다."
+    )
+    
+    stream_summaries = st.sidebar.checkbox(
+        "요약 실시간 표시 (스트리밍)", value=True,
+        help="AI 요약이 생성되는 대로 기사별로 바로 보여줍니다."
+    )
+    
+    feed_mode = st.sidebar.checkbox(
+        "전체 피드 크롤링 (목록 페이지)", value=False,
+        help="메인 상위 10개 대신 전체 기사 목록을 페이지를 넘기며 크롤링합니다."
+    )
+    if feed_mode:
+        feed_max_pages = st.sidebar.number_input("목록 최대 페이지", min_value=1, max_value=500, value=10)
+        feed_max_articles = st.sidebar.number_input("최대 기사 수", min_value=10, max_value=10000, value=200)
+    
+    # 크롤러와 요약 작업자 (프로세스 내 공유)
+    crawler = get_crawler()
+    runner = get_job_runner()
+    st.sidebar.caption(f"🧠 LLM 백엔드: {crawler.llm.name} ({crawler.llm.model})")
     
     # 메인 컨텐츠
     col1, col2 = st.columns([1, 1])
@@ -35,7 +171,12 @@ def main():
         
         if st.button("AI타임스 뉴스 크롤링 시작", type="primary"):
             with st.spinner("뉴스 목록을 가져오는 중..."):
-                news_list = crawler.crawl_news_list()
+                if feed_mode:
+                    news_list = crawler.crawl_news_feed(
+                        max_pages=int(feed_max_pages), max_articles=int(feed_max_articles)
+                    )
+                else:
+                    news_list = crawler.crawl_news_list()
                 
                 if news_list:
                     st.success(f"✅ {len(news_list)}개의 뉴스를 발견했습니다!")
@@ -55,7 +196,7 @@ def main():
         st.subheader("🤖 AI 요약 생성")
         
         if st.button("본문 크롤링 및 AI 요약", type="secondary"):
-            if not api_key:
+            if not api_key and crawler.llm.requires_api_key:
                 st.error("❌ OpenAI API 키를 먼저 입력해주세요!")
                 return
             
@@ -63,59 +204,72 @@ def main():
                 st.error("❌ 먼저 뉴스 크롤링을 실행해주세요!")
                 return
             
-            news_list = st.session_state.news_list
-            
-            # 진행 상황 표시
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            enhanced_news = []
+            # 작업 큐에 넣고 화면은 상태만 확인 (새로고침하거나 다른 사용자가 눌러도 작업은 한 번만 실행)
+            job_id, created = runner.submit_summarize(
+                st.session_state.news_list,
+                api_key,
+                fetch_workers=int(fetch_workers),
+                summary_workers=int(summary_workers),
+                incremental=incremental,
+                stream=stream_summaries
+            )
+            st.session_state.job_id = job_id
+            st.session_state.loaded_job_id = None
+            if not created:
+                st.info(f"ℹ️ 같은 기사 목록의 작업 #{job_id}이(가) 이미 진행 중이라 그 결과를 함께 기다립니다.")
+        
+        job_id = st.session_state.get('job_id')
+        job = runner.queue.get(job_id) if job_id else None
+        job_active = job is not None and job['status'] in ('queued', 'running')
+        
+        @st.fragment(run_every=1.0 if job_active else None)
+        def job_status():
+            job = runner.queue.get(job_id) if job_id else None
+            if job is None:
+                return
             
-            for i, news in enumerate(news_list):
-                status_text.text(f"📄 {i+1}/{len(news_list)}: {news['title'][:50]}... 처리 중")
-                
-                # 본문 크롤링
-                content = crawler.crawl_article_content(news['url'])
-                
-                if content:
-                    # AI 요약
-                    status_text.text(f"🤖 {i+1}/{len(news_list)}: AI 요약 생성 중...")
-                    summary = crawler.summarize_with_gpt(news['title'], content, api_key)
-                    
-                    enhanced_news.append({
-                        'rank': news['rank'],
-                        'title': news['title'],
-                        'url': news['url'],
-                        'content': content,
-                        'summary': summary,
-                        'crawl_time': news['crawl_time']
-                    })
-                else:
-                    enhanced_news.append({
-                        'rank': news['rank'],
-                        'title': news['title'],
-                        'url': news['url'],
-                        'content': "본문을 가져올 수 없습니다.",
-                        'summary': "요약을 생성할 수 없습니다.",
-                        'crawl_time': news['crawl_time']
-                    })
-                
-                # 진행률 업데이트
-                progress_bar.progress((i + 1) / len(news_list))
+            if job['status'] == 'queued':
+                st.progress(0.0, text=f"⏳ 작업 #{job['job_id']} 대기 중...")
+                return
+            if job['status'] == 'running':
+                total = job['total'] or len(job['params']['news_list'])
+                st.progress(job['completed'] / total if total else 0.0,
+                            text=f"📄 작업 #{job['job_id']}: {job['completed']}/{total}개 기사 처리 완료")
                 
-                # API 호출 제한을 위한 지연
-                time.sleep(1)
+                # 스트리밍 중인 기사의 요약을 토큰이 도착한 만큼 표시
+                live = runner.live(job['job_id'])
+                if live:
+                    news_list = job['params']['news_list']
+                    for i, text in live['texts'].items():
+                        if i in live['done']:
+                            continue
+                        with st.expander(f"{news_list[i]['rank']}. {news_list[i]['title']}", expanded=True):
+                            # 아직 닫히지 않은 JSON에서 받은 필드까지만 그림
+                            st.markdown(summary_to_markdown(news_list[i]['title'], parse_partial_summary(text)) + " ▌")
+                return
             
-            # CSV 저장
-            csv_file = crawler.save_to_csv(enhanced_news)
-            if csv_file:
-                st.success(f"✅ 모든 처리가 완료되었습니다! 파일: {csv_file}")
-                
-                # 세션 상태에 저장
-                st.session_state.enhanced_news = enhanced_news
-                st.session_state.csv_file = csv_file
+            if job_active:
+                # 작업이 끝났으면 폴링을 멈추도록 전체 화면을 다시 그림
+                st.rerun()
             
-            status_text.text("✅ 완료!")
+            if job['status'] == 'failed':
+                st.error(f"❌ 작업 #{job['job_id']} 실패: {job['error']}")
+            elif st.session_state.get('loaded_job_id') != job['job_id']:
+                load_run_into_session(crawler, job['run_id'], (job['result'] or {}).get('stream_stats'))
+                st.session_state.loaded_job_id = job['job_id']
+                st.rerun()
+            else:
+                st.success(f"✅ 모든 처리가 완료되었습니다! 실행 #{job['run_id']}로 저장했습니다.")
+        
+        job_status()
+    
+    # 다른 세션에서 끝난 최근 작업 결과를 공유 (이 세션에서 아직 아무 결과도 보지 않았을 때)
+    if 'enhanced_news' not in st.session_state and not job_active:
+        latest = runner.queue.latest_done('summarize')
+        if latest is not None:
+            load_run_into_session(crawler, latest['run_id'], (latest['result'] or {}).get('stream_stats'))
+            st.session_state.loaded_job_id = latest['job_id']
+            st.caption(f"ℹ️ 가장 최근에 완료된 작업 #{latest['job_id']}({latest['finished_at']})의 결과를 보여줍니다.")
     
     # 결과 표시
     if 'enhanced_news' in st.session_state:
@@ -132,17 +286,67 @@ def main():
             successful_crawls = len([n for n in enhanced_news if n['content'] != "본문을 가져올 수 없습니다."])
             st.metric("본문 크롤링 성공", successful_crawls)
         with col3:
-            successful_summaries = len([n for n in enhanced_news if not n['summary'].startswith("요약 실패")])
+            successful_summaries = len([n for n in enhanced_news if crawler.is_summary_ok(n['summary'], n.get('summary_data'))])
             st.metric("AI 요약 성공", successful_summaries)
         
+        # 요약 캐시 통계
+        cache_stats = crawler.summary_cache.stats()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("요약 캐시 히트", cache_stats['hits'])
+        with col2:
+            st.metric("요약 캐시 미스", cache_stats['misses'])
+        with col3:
+            st.metric("캐시된 요약 수", cache_stats['entries'])
+        
+        # LLM 백엔드별 속도 제한 통계 (429/5xx 재시도와 한도 대기 누적)
+        for backend in crawler.llm.backends():
+            if backend.rate_limiter is None:
+                continue
+            limiter_stats = backend.rate_limiter.stats()
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric(f"{backend.name} 동시 요청 수", limiter_stats['concurrency'],
+                          help=f"모델: {backend.model}, 추정 한도: 분당 요청 {limiter_stats['requests_per_minute']:,}회, "
+                               f"분당 토큰 {limiter_stats['tokens_per_minute']:,}개")
+            with col2:
+                st.metric(f"{backend.name} 429/5xx 재시도", limiter_stats['retries'])
+            with col3:
+                st.metric(f"{backend.name} 한도 대기 시간(누적)", f"{limiter_stats['wait_s']:.1f}초")
+        
+        # 주 백엔드가 늦거나 실패해 보조 백엔드에도 보낸 요청 (hedge)
+        if isinstance(crawler.llm, HedgedBackend):
+            hedge_stats = crawler.llm.stats()
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("보조 백엔드 추가 요청", hedge_stats['hedged'],
+                          help=f"{crawler.llm.primary.name} 응답이 최근 지연의 p{crawler.llm.quantile * 100:.0f}를 넘기면 "
+                               f"{crawler.llm.secondary.name}에도 같은 요청을 보냅니다.")
+            with col2:
+                st.metric("주 백엔드 실패 대체", hedge_stats['fallbacks'])
+            with col3:
+                st.metric(f"{crawler.llm.secondary.name} 응답 사용", hedge_stats['wins'][crawler.llm.secondary.name],
+                          help=f"전체 {hedge_stats['requests']}건 중")
+        
         # 뉴스 선택 및 상세 보기
         st.subheader("📰 뉴스 상세 보기")
         
+        # 유사 기사 묶기: 다른 기사의 요약을 재사용한 기사는 목록에서 숨기고 대표 기사에 함께 표시
+        group_duplicates = st.toggle("유사 기사 묶기", value=True, key="group_duplicates")
+        related_titles = {}
+        for news in enhanced_news:
+            if news.get('duplicate_of'):
+                related_titles.setdefault(news['duplicate_of'], []).append(news['title'])
+        
         # 뉴스 선택 드롭다운
         news_titles = [f"{news['rank']}. {news['title']}" for news in enhanced_news]
+        visible_indices = [
+            i for i, news in enumerate(enhanced_news)
+            if not (group_duplicates and news.get('duplicate_of'))
+        ]
         selected_news_index = st.selectbox(
             "보고 싶은 뉴스를 선택하세요:",
-            range(len(news_titles)),
+            visible_indices,
             format_func=lambda x: news_titles[x]
         )
         
@@ -152,12 +356,24 @@ def main():
         st.markdown(f"### 📖 {selected_news['title']}")
         st.markdown(f"**순위:** {selected_news['rank']}")
         st.markdown(f"**URL:** {selected_news['url']}")
+        if selected_news.get('duplicate_of'):
+            st.caption(f"유사 기사의 요약을 재사용했습니다: {selected_news['duplicate_of']}")
+        elif related_titles.get(selected_news['url']):
+            st.caption("같은 내용의 기사: " + ", ".join(related_titles[selected_news['url']]))
+        
+        # 스트리밍 통계는 기사 ID로 저장됨 (저장된 실행의 순서는 요청한 기사 목록과 다를 수 있음)
+        stats_text = format_stream_stats(st.session_state.get('stream_stats', {}).get(selected_news['article_id'], {}))
+        if stats_text:
+            st.caption(stats_text)
         
         # 탭으로 원문과 요약 분리
         tab1, tab2 = st.tabs(["🤖 AI 요약", "📄 원문"])
         
         with tab1:
-            if selected_news['summary'] and not selected_news['summary'].startswith("요약 실패"):
+            if selected_news.get('summary_data'):
+                render_summary(selected_news['summary_data'])
+            elif crawler.is_summary_ok(selected_news['summary']):
+                # 구조화 요약 도입 전 실행은 마크다운 그대로
                 st.markdown(selected_news['summary'])
             else:
                 st.error("AI 요약을 생성할 수 없었습니다.")
@@ -169,7 +385,7 @@ def main():
                 st.error("본문을 가져올 수 없었습니다.")
         
         # CSV 다운로드 및 PDF 리포트
-        if 'csv_file' in st.session_state:
+        if 'run_id' in st.session_state:
             st.markdown("---")
             st.subheader("💾 데이터 다운로드")
             
@@ -177,71 +393,272 @@ def main():
             
             with col1:
                 try:
-                    with open(st.session_state.csv_file, 'rb') as file:
-                        st.download_button(
-                            label="📥 CSV 파일 다운로드",
-                            data=file.read(),
-                            file_name=os.path.basename(st.session_state.csv_file),
-                            mime='text/csv'
-                        )
+                    # 저장소에서 CSV로 내보내기 (실행당 한 번만 파일 생성)
+                    csv_file = crawler.export_run_csv(st.session_state.run_id)
+                    download_file_button("📥 CSV 파일 다운로드", csv_file, 'text/csv')
                 except Exception as e:
                     st.error(f"파일 다운로드 중 오류: {str(e)}")
             
             with col2:
                 if st.button("📄 PDF 리포트 생성", type="secondary"):
                     with st.spinner("PDF 리포트를 생성하는 중..."):
-                        pdf_path = crawler.create_pdf_report(st.session_state.csv_file)
+                        pdf_path = crawler.create_run_pdf_report(st.session_state.run_id)
                         
                         if pdf_path and os.path.exists(pdf_path):
                             st.success("✅ PDF 리포트가 생성되었습니다!")
                             
                             try:
-                                with open(pdf_path, 'rb') as pdf_file:
-                                    st.download_button(
-                                        label="📥 PDF 리포트 다운로드",
-                                        data=pdf_file.read(),
-                                        file_name=os.path.basename(pdf_path),
-                                        mime='application/pdf'
-                                    )
+                                download_file_button("📥 PDF 리포트 다운로드", pdf_path, 'application/pdf')
                             except Exception as e:
                                 st.error(f"PDF 다운로드 중 오류: {str(e)}")
                         else:
                             st.error("❌ PDF 리포트 생성에 실패했습니다.")
     
-    # 기존 CSV 파일로 PDF 생성
+    # 실행 기록 (저장소에서 페이지 단위로 조회)
     st.markdown("---")
-    st.subheader("📂 기존 데이터로 PDF 리포트 생성")
-    
-    csv_files = crawler.get_csv_files()
-    if csv_files:
-        selected_csv = st.selectbox(
-            "PDF로 변환할 CSV 파일을 선택하세요:",
-            csv_files,
-            format_func=lambda x: os.path.basename(x)
+    st.subheader("📂 실행 기록")
+    
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        date_range = st.date_input("실행 날짜 범위", value=(), key="history_dates")
+    with col2:
+        title_filter = st.text_input("기사 제목 검색", key="history_title")
+    with col3:
+        page_size = st.selectbox("페이지 크기", [10, 20, 50], key="history_page_size")
+    
+    # 필터가 바뀌면 첫 페이지로
+    filters = (tuple(date_range), title_filter, page_size)
+    if st.session_state.get('history_filters') != filters:
+        st.session_state.history_filters = filters
+        st.session_state.history_page = 0
+    page = st.session_state.get('history_page', 0)
+    
+    start = date_range[0].isoformat() if len(date_range) > 0 else None
+    end = date_range[-1].isoformat() if len(date_range) > 0 else None
+    runs, has_more = crawler.article_store.list_runs(
+        limit=page_size, offset=page * page_size, start=start, end=end, title=title_filter or None
+    )
+    
+    if runs:
+        df_runs = pd.DataFrame(runs)[['run_id', 'created_at', 'article_count', 'summary_count', 'csv_path', 'pdf_path']]
+        df_runs.columns = ['실행', '실행 시각', '기사 수', '요약 성공', 'CSV', 'PDF']
+        st.dataframe(df_runs, use_container_width=True, hide_index=True)
+        
+        col1, col2, col3 = st.columns([1, 1, 3])
+        with col1:
+            if st.button("◀ 이전", disabled=page == 0, key="history_prev"):
+                st.session_state.history_page = page - 1
+                st.rerun()
+        with col2:
+            if st.button("다음 ▶", disabled=not has_more, key="history_next"):
+                st.session_state.history_page = page + 1
+                st.rerun()
+        with col3:
+            st.caption(f"{page + 1} 페이지")
+        
+        run_labels = {run['run_id']: f"#{run['run_id']} · {run['created_at']} · 기사 {run['article_count']}개" for run in runs}
+        selected_run = st.selectbox(
+            "실행을 선택하세요:",
+            list(run_labels),
+            format_func=lambda x: run_labels[x]
         )
         
-        if st.button("📄 선택한 파일로 PDF 생성"):
-            with st.spinner("PDF 리포트를 생성하는 중..."):
-                pdf_path = crawler.create_pdf_report(selected_csv)
-                
-                if pdf_path and os.path.exists(pdf_path):
-                    st.success("✅ PDF 리포트가 생성되었습니다!")
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("📊 대시보드에서 보기", key="history_load"):
+                load_run_into_session(crawler, selected_run)
+                st.rerun()
+        with col2:
+            if st.button("📄 선택한 실행으로 PDF 생성", key="history_pdf"):
+                with st.spinner("PDF 리포트를 생성하는 중..."):
+                    pdf_path = crawler.create_run_pdf_report(selected_run)
                     
-                    try:
-                        with open(pdf_path, 'rb') as pdf_file:
-                            st.download_button(
-                                label="📥 PDF 리포트 다운로드",
-                                data=pdf_file.read(),
-                                file_name=os.path.basename(pdf_path),
-                                mime='application/pdf',
-                                key="existing_csv_pdf"
-                            )
-                    except Exception as e:
-                        st.error(f"PDF 다운로드 중 오류: {str(e)}")
-                else:
-                    st.error("❌ PDF 리포트 생성에 실패했습니다.")
+                    if pdf_path and os.path.exists(pdf_path):
+                        st.success("✅ PDF 리포트가 생성되었습니다!")
+                        
+                        try:
+                            download_file_button("📥 PDF 리포트 다운로드", pdf_path, 'application/pdf', key="existing_run_pdf")
+                        except Exception as e:
+                            st.error(f"PDF 다운로드 중 오류: {str(e)}")
+                    else:
+                        st.error("❌ PDF 리포트 생성에 실패했습니다.")
+    else:
+        st.info("📂 조건에 맞는 실행 기록이 없습니다.")
+    
+    # 저장소 도입 전 CSV 파일은 요청할 때만 디렉토리를 훑어 가져옴
+    if st.button("📥 기존 CSV 파일 가져오기", key="history_import"):
+        with st.spinner("crawled_data 폴더의 CSV 파일을 가져오는 중..."):
+            imported = crawler.import_untracked_csv_files()
+        st.success(f"✅ {imported}개의 CSV 파일을 실행 기록으로 가져왔습니다.")
+    
+    # 기사 검색 (제목/요약/본문 전문 검색, 임베딩 모델이 있으면 의미 검색)
+    st.markdown("---")
+    st.subheader("🔎 기사 검색")
+    
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        search_query = st.text_input("검색어", key="search_query",
+                                     placeholder="예: 엔비디아 반도체 (두 글자 이상 단어, 모든 단어 포함)")
+    with col2:
+        search_range = st.date_input("크롤링 날짜 범위", value=(), key="search_dates")
+    with col3:
+        semantic_available = crawler.search_index.semantic_available
+        search_mode = st.radio(
+            "검색 방식", ["키워드", "의미"], key="search_mode", horizontal=True,
+            disabled=not semantic_available,
+            help=None if semantic_available else "sentence-transformers를 설치하면 의미 검색을 사용할 수 있습니다."
+        )
+    
+    if search_query:
+        started = time.perf_counter()
+        results = crawler.search_articles(
+            search_query,
+            limit=20,
+            start=search_range[0].isoformat() if len(search_range) > 0 else None,
+            end=search_range[-1].isoformat() if len(search_range) > 0 else None,
+            semantic=search_mode == "의미"
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        st.caption(f"검색 결과 {len(results)}건 · {elapsed_ms:.0f}ms · 색인된 기사 {crawler.search_index.count():,}개")
+        
+        for result in results:
+            st.markdown(f"**[{result['title']}]({result['url']})** · {result['crawl_time']} · 실행 #{result['run_id']}")
+            if result['snippet']:
+                st.caption(result['snippet'])
+        if not results:
+            st.info("🔎 검색 결과가 없습니다.")
+    
+    # 게시 후 본문이 수정된 기사 (증분 크롤링에서 본문 지문이 바뀐 기사)
+    changes = crawler.article_index.recent_changes(limit=10)
+    if changes:
+        st.markdown("---")
+        st.subheader("📝 수정된 기사")
+        
+        for change in changes:
+            changed_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(change['changed_at']))
+            added = sum(len(op['added']) for op in change['diff'])
+            removed = sum(len(op['removed']) for op in change['diff'])
+            with st.expander(f"{change['title']} · v{change['version']} · {changed_at} (+{added} / -{removed}문단)"):
+                st.markdown(f"[기사 보기]({change['url']})")
+                lines = []
+                for op in change['diff']:
+                    lines.extend(f"- {paragraph}" for paragraph in op['removed'])
+                    lines.extend(f"+ {paragraph}" for paragraph in op['added'])
+                st.code('\n'.join(lines), language='diff', wrap_lines=True)
+    
+    # 기간 다이제스트 PDF (여러 프로세스에서 렌더링, 백그라운드 실행)
+    st.markdown("---")
+    st.subheader("🗓️ 기간 다이제스트 PDF")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        digest_range = st.date_input("다이제스트 기간", value=(), key="digest_dates")
+    with col2:
+        digest_workers = st.number_input(
+            "렌더링 프로세스 수", min_value=1, max_value=32, value=os.cpu_count() or 1, key="digest_workers",
+            help="기사 조각을 나눠 렌더링할 프로세스 수입니다."
+        )
+    
+    job = st.session_state.get('digest_job')
+    running = job is not None and not job['finished']
+    
+    if st.button("📚 다이제스트 PDF 생성", disabled=running, key="digest_start"):
+        start = digest_range[0].isoformat() if len(digest_range) > 0 else None
+        end = digest_range[-1].isoformat() if len(digest_range) > 0 else None
+        st.session_state.digest_job = start_digest_job(crawler, start, end, int(digest_workers))
+        st.rerun()
+    
+    @st.fragment(run_every=1.0 if running else None)
+    def digest_status():
+        job = st.session_state.get('digest_job')
+        if job is None:
+            return
+        
+        if not job['finished']:
+            total = job['total']
+            if total:
+                st.progress(job['completed'] / total, text=f"📄 기사 {job['completed']}/{total}개 렌더링 완료")
+            else:
+                st.progress(0.0, text="📄 기사를 불러오는 중...")
+            return
+        
+        if running:
+            # 작업이 끝났으면 폴링을 멈추도록 전체 화면을 다시 그림
+            st.rerun()
+        
+        pdf_path = job['pdf_path']
+        if pdf_path and os.path.exists(pdf_path):
+            st.success("✅ 다이제스트 PDF가 생성되었습니다!")
+            
+            try:
+                download_file_button("📥 다이제스트 PDF 다운로드", pdf_path, 'application/pdf', key="digest_pdf")
+            except Exception as e:
+                st.error(f"PDF 다운로드 중 오류: {str(e)}")
+        else:
+            st.error("❌ 다이제스트 PDF 생성에 실패했습니다.")
+    
+    digest_status()
+    
+    # 기간 내보내기 (저장소에서 묶음 단위로 읽어 파일로 바로 씀)
+    st.markdown("---")
+    st.subheader("📦 기간 내보내기")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        export_range = st.date_input("내보낼 기간", value=(), key="export_dates")
+    with col2:
+        export_format = st.radio("형식", ['csv', 'jsonl'], horizontal=True, key="export_format")
+    
+    if st.button("📦 내보내기 파일 생성", key="export_start"):
+        start = export_range[0].isoformat() if len(export_range) > 0 else None
+        end = export_range[-1].isoformat() if len(export_range) > 0 else None
+        with st.spinner("기사를 내보내는 중..."):
+            export_path, export_count = crawler.export_articles(start, end, fmt=export_format)
+        st.session_state.export_file = (export_path, export_count)
+    
+    export_file = st.session_state.get('export_file')
+    if export_file:
+        export_path, export_count = export_file
+        if export_path and os.path.exists(export_path):
+            st.success(f"✅ {export_count}개 기사 행을 내보냈습니다.")
+            download_file_button(
+                "📥 내보낸 파일 다운로드",
+                export_path,
+                EXPORT_FORMATS[os.path.splitext(export_path)[1][1:]],
+                key="export_download"
+            )
+        else:
+            st.error("❌ 기사 내보내기에 실패했습니다.")
+    
+    # 단계별 성능 지표 (크롤러가 살아 있는 동안 누적)
+    st.markdown("---")
+    st.subheader("⏱️ 성능 지표")
+    
+    histogram_rows, value_rows = crawler.metrics.snapshot()
+    if histogram_rows:
+        df_metrics = pd.DataFrame(histogram_rows)
+        # 초 단위 지표는 밀리초로 보여줌
+        is_seconds = df_metrics['metric'].str.endswith('_seconds')
+        for column in ('mean', 'p50', 'p95'):
+            df_metrics[column] = df_metrics[column].where(~is_seconds, df_metrics[column] * 1000).round(1)
+        df_metrics['unit'] = is_seconds.map({True: 'ms', False: ''})
+        st.dataframe(
+            df_metrics[['metric', 'labels', 'count', 'mean', 'p50', 'p95', 'unit']],
+            use_container_width=True, hide_index=True
+        )
+        
+        with st.expander("카운터/게이지"):
+            st.dataframe(pd.DataFrame(value_rows), use_container_width=True, hide_index=True)
+        
+        st.download_button(
+            label="📥 Prometheus 텍스트 형식으로 다운로드",
+            data=crawler.metrics.render(),
+            file_name="aitimes_metrics.prom",
+            mime='text/plain',
+            key="metrics_download"
+        )
     else:
-        st.info("📂 crawled_data 폴더에 CSV 파일이 없습니다.")
+        st.info("📭 아직 기록된 지표가 없습니다. 크롤링을 실행하면 단계별 시간이 집계됩니다.")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,161 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse, parse_qs
+
+from content_fingerprint import diff_content, fingerprint
+
+
+class ArticleIndex:
+    """이미 크롤링·요약한 기사를 기록하는 SQLite 인덱스
+
+    aitimes 기사 URL의 idxno를 기사 ID로 사용하며, idxno가 없는 URL은 URL 자체를 ID로 씁니다.
+    증분 크롤링 시 여기 기록된 기사는 본문 지문(정규화한 본문 해시)이 같으면 요약을 건너뛰고 저장된 결과를 재사용합니다.
+    기록된 본문이 바뀌면 버전을 올리고, 이전 본문과의 문단 단위 차이를 article_versions에 남깁니다.
+    """
+
+    def __init__(self, db_path=os.path.join("crawled_data", "article_index.db")):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                article_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                summary_data TEXT,
+                fingerprint TEXT,
+                paragraph_hashes TEXT,
+                version INTEGER NOT NULL DEFAULT 1,
+                first_seen REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS article_versions (
+                article_id TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                diff TEXT NOT NULL,
+                changed_at REAL NOT NULL,
+                PRIMARY KEY (article_id, version)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_article_versions_changed_at ON article_versions (changed_at)")
+        # 이전 버전 DB에는 구조화 요약(JSON)과 본문 지문 열이 없으므로 추가 (지문은 처음 비교할 때 본문에서 계산)
+        columns = [row['name'] for row in self._conn.execute("PRAGMA table_info(articles)")]
+        if 'summary_data' not in columns:
+            self._conn.execute("ALTER TABLE articles ADD COLUMN summary_data TEXT")
+        if 'fingerprint' not in columns:
+            self._conn.execute("ALTER TABLE articles ADD COLUMN fingerprint TEXT")
+            self._conn.execute("ALTER TABLE articles ADD COLUMN paragraph_hashes TEXT")
+            self._conn.execute("ALTER TABLE articles ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        self._conn.commit()
+
+    @staticmethod
+    def article_id_from_url(url):
+        """URL에서 기사 ID(idxno) 추출"""
+        query = parse_qs(urlparse(url).query)
+        idxno = query.get('idxno')
+        if idxno and idxno[0]:
+            return idxno[0]
+        return url
+
+    @staticmethod
+    def _to_dict(row):
+        article = dict(row)
+        article['summary_data'] = json.loads(article['summary_data']) if article['summary_data'] else None
+        if article['fingerprint']:
+            article['paragraph_hashes'] = json.loads(article['paragraph_hashes'])
+        else:
+            article['fingerprint'], article['paragraph_hashes'] = fingerprint(article['content'])
+        return article
+
+    def get(self, url):
+        """URL에 해당하는 기사 기록 반환 (없으면 None)"""
+        article_id = self.article_id_from_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM articles WHERE article_id = ?", (article_id,)
+            ).fetchone()
+        return self._to_dict(row) if row else None
+
+    def upsert(self, url, title, content, summary, summary_data=None):
+        """기사의 본문과 요약(마크다운, 구조화 요약 딕셔너리)을 기록 (이미 있으면 갱신)
+
+        기록된 본문과 지문이 다르면 버전을 올리고 문단 단위 차이를 남긴 뒤 새 버전 번호를 반환합니다.
+        """
+        article_id = self.article_id_from_url(url)
+        now = time.time()
+        data = json.dumps(summary_data, ensure_ascii=False) if summary_data else None
+        content_hash, paragraph_hashes = fingerprint(content)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, fingerprint, version FROM articles WHERE article_id = ?", (article_id,)
+            ).fetchone()
+            version = 1
+            if row is not None:
+                version = row['version']
+                if (row['fingerprint'] or fingerprint(row['content'])[0]) != content_hash:
+                    version += 1
+                    diff = diff_content(row['content'], content)
+                    self._conn.execute("""
+                        INSERT OR REPLACE INTO article_versions (article_id, version, title, fingerprint, diff, changed_at)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """, (article_id, version, title, content_hash, json.dumps(diff, ensure_ascii=False), now))
+            self._conn.execute("""
+                INSERT INTO articles (article_id, url, title, content, summary, summary_data, fingerprint,
+                                      paragraph_hashes, version, first_seen, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(article_id) DO UPDATE SET
+                    url = excluded.url,
+                    title = excluded.title,
+                    content = excluded.content,
+                    summary = excluded.summary,
+                    summary_data = excluded.summary_data,
+                    fingerprint = excluded.fingerprint,
+                    paragraph_hashes = excluded.paragraph_hashes,
+                    version = excluded.version,
+                    updated_at = excluded.updated_at
+            """, (article_id, url, title, content, summary, data, content_hash, json.dumps(paragraph_hashes), version,
+                  now, now))
+            self._conn.commit()
+        return version
+
+    def history(self, url):
+        """기사의 본문 수정 이력을 버전 순으로 반환 (버전 2부터, diff는 diff_content 형식)"""
+        article_id = self.article_id_from_url(url)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM article_versions WHERE article_id = ? ORDER BY version", (article_id,)
+            ).fetchall()
+        return [dict(row, diff=json.loads(row['diff'])) for row in rows]
+
+    def recent_changes(self, limit=20):
+        """최근 본문이 수정된 기사 버전 목록 (최신순, 현재 URL 포함)"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT v.*, a.url FROM article_versions v JOIN articles a ON a.article_id = v.article_id
+                ORDER BY v.changed_at DESC LIMIT ?
+            """, (limit,)).fetchall()
+        return [dict(row, diff=json.loads(row['diff'])) for row in rows]
+
+    def iter_articles(self):
+        """기록된 모든 기사를 갱신 시각 순으로 반환"""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM articles ORDER BY updated_at").fetchall()
+        for row in rows:
+            yield self._to_dict(row)
+
+    def count(self):
+        """기록된 기사 수 반환"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
@@ -0,0 +1,368 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from itertools import chain
+
+from article_index import ArticleIndex
+from content_fingerprint import fingerprint
+from exports import read_csv_rows
+from summary_schema import SUMMARY_SECTIONS, SUMMARY_FIELDS
+
+
+class ArticleStore:
+    """실행(run)별 크롤링 결과를 쌓아 두는 SQLite(WAL) 저장소
+
+    - runs: 실행마다 한 행 (시간, 기사 수, 요약 성공 수, 내보낸 파일 경로)
+    - articles: 기사 ID(idxno)별 한 행 (처음/마지막으로 본 시각, 최신 제목)
+    - run_articles: 실행별 순위/제목과 본문·요약 해시, 본문 지문(정규화한 본문 해시) (추가만 함)
+    - bodies: 본문·요약 원문을 zlib으로 압축해 해시 기준으로 한 번만 저장
+    - summary_fields: 구조화 요약을 필드별 열로 요약 해시당 한 번만 저장 (목록 필드는 JSON 배열)
+
+    실행이 쌓여도 같은 본문과 요약은 중복 저장되지 않으며, 날짜 범위·순위·제목으로
+    파일을 전부 읽지 않고 조회할 수 있습니다.
+    """
+
+    def __init__(self, db_path=os.path.join("crawled_data", "articles.db")):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL,
+                crawl_time TEXT NOT NULL,
+                article_count INTEGER NOT NULL,
+                summary_count INTEGER NOT NULL,
+                csv_path TEXT,
+                pdf_path TEXT
+            );
+            CREATE TABLE IF NOT EXISTS articles (
+                article_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS run_articles (
+                run_id INTEGER NOT NULL REFERENCES runs (run_id),
+                article_id TEXT NOT NULL REFERENCES articles (article_id),
+                rank INTEGER,
+                title TEXT NOT NULL,
+                crawl_time TEXT NOT NULL,
+                content_hash TEXT,
+                summary_hash TEXT,
+                duplicate_of TEXT,
+                fingerprint TEXT,
+                PRIMARY KEY (run_id, article_id)
+            );
+            CREATE TABLE IF NOT EXISTS bodies (
+                hash TEXT PRIMARY KEY,
+                data BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS summary_fields (
+                summary_hash TEXT PRIMARY KEY,
+                analogy TEXT NOT NULL,
+                key_points TEXT NOT NULL,
+                details TEXT NOT NULL,
+                critical_points TEXT NOT NULL,
+                numbers TEXT NOT NULL,
+                next_step TEXT NOT NULL,
+                terms TEXT NOT NULL,
+                prerequisites TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_run_articles_crawl_time ON run_articles (crawl_time);
+            CREATE INDEX IF NOT EXISTS idx_run_articles_article ON run_articles (article_id);
+            CREATE INDEX IF NOT EXISTS idx_run_articles_rank ON run_articles (rank);
+            CREATE INDEX IF NOT EXISTS idx_runs_created_at ON runs (created_at);
+        """)
+        # 이전 버전 DB에는 유사 기사 대표 URL과 본문 지문 열이 없으므로 추가
+        columns = [row['name'] for row in self._conn.execute("PRAGMA table_info(run_articles)")]
+        if 'duplicate_of' not in columns:
+            self._conn.execute("ALTER TABLE run_articles ADD COLUMN duplicate_of TEXT")
+        if 'fingerprint' not in columns:
+            self._conn.execute("ALTER TABLE run_articles ADD COLUMN fingerprint TEXT")
+        self._conn.commit()
+
+    @staticmethod
+    def _body_hash(text):
+        return None if text is None else hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _put_body(self, text, digest=None):
+        """본문/요약을 압축 저장하고 해시 반환 (이미 있으면 재사용)"""
+        if text is None:
+            return None
+        data = text.encode('utf-8')
+        digest = digest or hashlib.sha256(data).hexdigest()
+        self._conn.execute(
+            "INSERT OR IGNORE INTO bodies (hash, data) VALUES (?, ?)", (digest, zlib.compress(data, 6))
+        )
+        return digest
+
+    def _get_body(self, digest, conn=None):
+        if digest is None:
+            return None
+        row = (conn or self._conn).execute("SELECT data FROM bodies WHERE hash = ?", (digest,)).fetchone()
+        return zlib.decompress(row['data']).decode('utf-8') if row else None
+
+    def _put_summary_fields(self, digest, summary_data):
+        """구조화 요약을 필드별 열로 저장 (같은 요약 해시가 있으면 재사용)"""
+        if digest is None or not summary_data:
+            return
+        values = [
+            summary_data.get(key) if kind == 'text' else json.dumps(summary_data.get(key) or [], ensure_ascii=False)
+            for key, _, _, kind in SUMMARY_SECTIONS
+        ]
+        self._conn.execute(
+            f"INSERT OR IGNORE INTO summary_fields (summary_hash, {', '.join(SUMMARY_FIELDS)}) "
+            f"VALUES (?{', ?' * len(SUMMARY_FIELDS)})",
+            [digest] + [value or '' for value in values]
+        )
+
+    @staticmethod
+    def _summary_from_row(row):
+        if row['fields_hash'] is None:
+            return None
+        return {
+            key: row[key] if kind == 'text' else json.loads(row[key])
+            for key, _, _, kind in SUMMARY_SECTIONS
+        }
+
+    def save_run(self, news_data, summary_count=None, is_summary_ok=None):
+        """실행 결과(기사 목록 또는 기사를 하나씩 생성하는 이터러블)를 추가하고 run_id 반환
+
+        summary_count 대신 is_summary_ok(요약, 구조화 요약)를 주면 저장하면서 요약 성공 수를 셉니다.
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = iter(news_data)
+        first = next(rows, None)
+        crawl_time = first.get('crawl_time', now) if first else now
+
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (created_at, crawl_time, article_count, summary_count) VALUES (?, ?, ?, ?)",
+                (now, crawl_time, 0, 0)
+            )
+            run_id = cursor.lastrowid
+
+            # 같은 기사가 URL만 달리해 여러 번 있으면 처음 것(높은 순위)만 남기고,
+            # 무시된 행은 개수/요약 성공 수에 넣지 않으며 기사 URL·제목도 덮어쓰지 않음
+            article_count = 0
+            counted_summaries = 0
+            for news in (chain([first], rows) if first else ()):
+                article_id = ArticleIndex.article_id_from_url(news['url'])
+                seen = news.get('crawl_time', crawl_time)
+                content, summary = news.get('content'), news.get('summary')
+                content_hash, summary_hash = self._body_hash(content), self._body_hash(summary)
+                self._conn.execute("""
+                    INSERT OR IGNORE INTO articles (article_id, url, title, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (article_id, news['url'], news['title'], seen, seen))
+                cursor = self._conn.execute("""
+                    INSERT OR IGNORE INTO run_articles
+                        (run_id, article_id, rank, title, crawl_time, content_hash, summary_hash, duplicate_of,
+                         fingerprint)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    run_id, article_id, _to_rank(news.get('rank')), news['title'], seen,
+                    content_hash, summary_hash, news.get('duplicate_of'),
+                    fingerprint(content)[0] if content else None
+                ))
+                if cursor.rowcount != 1:
+                    continue
+
+                article_count += 1
+                if is_summary_ok and is_summary_ok(summary, news.get('summary_data')):
+                    counted_summaries += 1
+                self._put_body(content, content_hash)
+                self._put_body(summary, summary_hash)
+                self._put_summary_fields(summary_hash, news.get('summary_data'))
+                self._conn.execute(
+                    "UPDATE articles SET url = ?, title = ?, last_seen = ? WHERE article_id = ?",
+                    (news['url'], news['title'], seen, article_id)
+                )
+            self._conn.execute(
+                "UPDATE runs SET article_count = ?, summary_count = ? WHERE run_id = ?",
+                (article_count, counted_summaries if summary_count is None else summary_count, run_id)
+            )
+            self._conn.commit()
+        return run_id
+
+    def set_run_file(self, run_id, csv_path=None, pdf_path=None):
+        """실행에 대해 내보낸 CSV/PDF 경로 기록"""
+        with self._lock:
+            if csv_path:
+                self._conn.execute("UPDATE runs SET csv_path = ? WHERE run_id = ?", (csv_path, run_id))
+            if pdf_path:
+                self._conn.execute("UPDATE runs SET pdf_path = ? WHERE run_id = ?", (pdf_path, run_id))
+            self._conn.commit()
+
+    def get_run(self, run_id):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list_runs(self, limit=20, offset=0, start=None, end=None, title=None):
+        """실행 목록을 최신순으로 한 페이지만 조회. (실행 목록, 다음 페이지 존재 여부) 반환
+
+        start/end는 'YYYY-MM-DD[ HH:MM:SS]' 형식의 실행 시각 범위, title은 실행에 포함된 기사 제목 검색어입니다.
+        전체 개수를 세지 않고 limit + 1개만 읽으므로 실행이 쌓여도 페이지 크기만큼만 읽습니다.
+        """
+        conditions = []
+        params = []
+        if start:
+            conditions.append("r.created_at >= ?")
+            params.append(start)
+        if end:
+            conditions.append("r.created_at <= ?")
+            params.append(end if len(end) > 10 else end + " 23:59:59")
+        if title:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM run_articles ra WHERE ra.run_id = r.run_id AND ra.title LIKE ?)"
+            )
+            params.append(f"%{title}%")
+
+        sql = "SELECT r.* FROM runs r"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY r.created_at DESC, r.run_id DESC LIMIT ? OFFSET ?"
+        params.extend([limit + 1, offset])
+
+        with self._lock:
+            rows = [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+        return rows[:limit], len(rows) > limit
+
+    def tracked_csv_paths(self):
+        """실행 기록에 연결된 CSV 경로 집합"""
+        with self._lock:
+            rows = self._conn.execute("SELECT csv_path FROM runs WHERE csv_path IS NOT NULL").fetchall()
+        return {row['csv_path'] for row in rows}
+
+    def run_ids_after(self, run_id):
+        """run_id보다 뒤에 추가된 실행 ID 목록 (검색 인덱스 증분 갱신용)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT run_id FROM runs WHERE run_id > ? ORDER BY run_id", (run_id,)).fetchall()
+        return [row['run_id'] for row in rows]
+
+    def load_run(self, run_id):
+        """실행의 기사 목록을 순위 순으로 반환 (save_to_csv에 넘기던 형식)"""
+        return self.query_articles(run_id=run_id, limit=None)
+
+    @staticmethod
+    def _article_query(run_id=None, start=None, end=None, max_rank=None, title=None, with_bodies=True):
+        """query_articles/stream_articles가 함께 쓰는 (SQL, 매개변수)"""
+        conditions = []
+        params = []
+        if run_id is not None:
+            conditions.append("ra.run_id = ?")
+            params.append(run_id)
+        if start:
+            conditions.append("ra.crawl_time >= ?")
+            params.append(start)
+        if end:
+            # 날짜만 주면 그 날의 끝까지 포함
+            conditions.append("ra.crawl_time <= ?")
+            params.append(end if len(end) > 10 else end + " 23:59:59")
+        if max_rank is not None:
+            conditions.append("ra.rank <= ?")
+            params.append(max_rank)
+        if title:
+            conditions.append("ra.title LIKE ?")
+            params.append(f"%{title}%")
+
+        sql = """
+            SELECT ra.run_id, ra.article_id, ra.rank, ra.title, ra.crawl_time,
+                   ra.content_hash, ra.summary_hash, ra.duplicate_of, a.url
+        """
+        if with_bodies:
+            sql += ", sf.summary_hash AS fields_hash, " + ", ".join(f"sf.{key}" for key in SUMMARY_FIELDS)
+        sql += " FROM run_articles ra JOIN articles a ON a.article_id = ra.article_id"
+        if with_bodies:
+            sql += " LEFT JOIN summary_fields sf ON sf.summary_hash = ra.summary_hash"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY ra.crawl_time DESC, ra.run_id DESC, ra.rank"
+        return sql, params
+
+    def _record(self, row, with_bodies, with_content, conn=None):
+        record = {
+            'run_id': row['run_id'],
+            'article_id': row['article_id'],
+            'rank': row['rank'],
+            'title': row['title'],
+            'url': row['url'],
+            'crawl_time': row['crawl_time'],
+            'duplicate_of': row['duplicate_of']
+        }
+        if with_bodies:
+            record['content'] = self._get_body(row['content_hash'], conn) if with_content else None
+            record['summary'] = self._get_body(row['summary_hash'], conn)
+            record['summary_data'] = self._summary_from_row(row)
+        return record
+
+    def query_articles(self, run_id=None, start=None, end=None, max_rank=None, title=None,
+                       limit=100, offset=0, with_bodies=True, with_content=True):
+        """조건에 맞는 실행별 기사 행 조회
+
+        start/end는 'YYYY-MM-DD[ HH:MM:SS]' 형식의 크롤링 시각 범위, max_rank는 순위 상한,
+        title은 제목에 포함된 문자열입니다. 최신 크롤링 순, 같은 실행 안에서는 순위 순으로 정렬합니다.
+        with_bodies=True이면 본문, 요약과 구조화 요약(summary_data, 없으면 None)을 함께 반환합니다.
+        with_content=False이면 본문은 읽지 않고 None으로 둡니다. (가장 큰 열이라 리포트처럼 필요 없을 때 제외)
+        """
+        sql, params = self._article_query(run_id, start, end, max_rank, title, with_bodies)
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            return [self._record(row, with_bodies, with_content) for row in rows]
+
+    def stream_articles(self, run_id=None, start=None, end=None, max_rank=None, title=None,
+                        with_content=True, chunk_size=500):
+        """query_articles와 같은 순서의 기사 행을 하나씩 생성 (기간 전체 내보내기용)
+
+        별도 읽기 연결에서 chunk_size개씩 읽고 본문/요약은 행마다 풀어서, 기사 수와 관계없이
+        메모리는 한 묶음만큼만 씁니다. WAL 스냅샷을 읽으므로 내보내는 동안 저장이 막히지 않습니다.
+        """
+        sql, params = self._article_query(run_id, start, end, max_rank, title, with_bodies=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._record(row, True, with_content, conn)
+        finally:
+            conn.close()
+
+    def import_csv(self, csv_path, is_summary_ok=None):
+        """기존 aitimes_*.csv 스냅샷을 실행 하나로 가져오고 run_id 반환 (행을 하나씩 읽어 바로 저장)"""
+        def rows():
+            for news in read_csv_rows(csv_path):
+                # 구조화 요약 열이 있는 CSV(이 버전에서 내보낸 파일)는 JSON 문자열을 딕셔너리로
+                if news.get('summary_data'):
+                    news['summary_data'] = json.loads(news['summary_data'])
+                yield news
+
+        run_id = self.save_run(rows(), is_summary_ok=is_summary_ok)
+        self.set_run_file(run_id, csv_path=csv_path)
+        return run_id
+
+
+def _to_rank(rank):
+    try:
+        return int(rank)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,219 @@
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from article_index import ArticleIndex
+from llm_backends import OpenAIBackend, openai_backend
+
+logger = logging.getLogger(__name__)
+
+# OpenAI Batch API의 배치당 최대 요청 수
+MAX_BATCH_REQUESTS = 50000
+
+# 더 이상 상태가 바뀌지 않는 배치 상태
+TERMINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+# Batch API 호출은 속도 제한기를 거치지 않으므로 SDK 재시도(지수 백오프) 횟수
+BATCH_MAX_RETRIES = 5
+
+
+class BatchSummarizer:
+    """OpenAI Batch API로 여러 기사를 한 번에 요약
+
+    기사별 요청을 JSONL 파일 하나로 묶어 제출하고, 배치 ID와 요청한 기사 목록을 SQLite에 기록합니다.
+    poll()로 끝난 배치(completed뿐 아니라 expired/cancelled처럼 일부만 처리된 배치 포함)의 결과를 내려받아
+    기사 인덱스와 요약 캐시에 기사 ID(custom_id) 기준으로 합칩니다.
+    대화형 사용은 기존 summarize_with_gpt(동기 호출)를 그대로 사용합니다.
+    Batch API는 항상 OpenAI로 보내므로 크롤러의 OpenAI 백엔드 클라이언트를 쓰고, 요약 백엔드가 로컬 서버처럼
+    OpenAI가 아니면 크롤러의 openai_base_url로 OpenAI 백엔드를 따로 만듭니다.
+    """
+
+    def __init__(self, crawler, api_key, db_path=os.path.join("crawled_data", "summary_batches.db")):
+        self.crawler = crawler
+        self.api_key = api_key
+        self.backend = openai_backend(crawler.llm) or OpenAIBackend(base_url=crawler.openai_base_url)
+        self._client = None
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS batches (
+                batch_id TEXT PRIMARY KEY,
+                input_file_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                article_count INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                merged_at REAL,
+                error_file_id TEXT,
+                error_count INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS batch_items (
+                batch_id TEXT NOT NULL,
+                custom_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                PRIMARY KEY (batch_id, custom_id)
+            );
+        """)
+        # 이전 버전 DB에는 오류 파일 열이 없으므로 추가
+        columns = [row['name'] for row in self._conn.execute("PRAGMA table_info(batches)")]
+        if 'error_file_id' not in columns:
+            self._conn.execute("ALTER TABLE batches ADD COLUMN error_file_id TEXT")
+            self._conn.execute("ALTER TABLE batches ADD COLUMN error_count INTEGER")
+        self._conn.commit()
+
+    @property
+    def client(self):
+        """백엔드 클라이언트(연결 풀 공유)에 SDK 재시도만 켠 복사본 (백엔드 클라이언트는 재시도를 제한기에 맡겨 0회)"""
+        if self._client is None:
+            self._client = self.backend.client(self.api_key).with_options(max_retries=BATCH_MAX_RETRIES)
+        return self._client
+
+    def submit(self, articles, max_requests=MAX_BATCH_REQUESTS):
+        """기사 목록(url, title, content)을 배치로 제출하고 배치 ID 목록 반환"""
+        items = {}
+        for article in articles:
+            if not article.get('content'):
+                continue
+            # 같은 기사가 여러 번 들어오면 마지막 것만 요청
+            items[ArticleIndex.article_id_from_url(article['url'])] = article
+
+        batch_ids = []
+        keys = list(items)
+        for start in range(0, len(keys), max_requests):
+            chunk = [(key, items[key]) for key in keys[start:start + max_requests]]
+            batch_ids.append(self._submit_chunk(chunk))
+        return batch_ids
+
+    def _submit_chunk(self, chunk):
+        lines = []
+        for custom_id, article in chunk:
+            lines.append(json.dumps({
+                'custom_id': custom_id,
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': self.crawler.summary_request(article['title'], article['content'])
+            }, ensure_ascii=False))
+        payload = ('\n'.join(lines) + '\n').encode('utf-8')
+
+        input_file = self.client.files.create(file=('summaries.jsonl', io.BytesIO(payload)), purpose='batch')
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO batches (batch_id, input_file_id, status, article_count, created_at) VALUES (?, ?, ?, ?, ?)",
+                (batch.id, input_file.id, batch.status, len(chunk), time.time())
+            )
+            self._conn.executemany(
+                "INSERT INTO batch_items (batch_id, custom_id, url, title, content) VALUES (?, ?, ?, ?, ?)",
+                [(batch.id, custom_id, a['url'], a['title'], a['content']) for custom_id, a in chunk]
+            )
+            self._conn.commit()
+
+        logger.info(f"요약 배치 제출: {batch.id} ({len(chunk)}개 기사)")
+        return batch.id
+
+    def pending_batches(self):
+        """아직 결과를 합치지 않은 배치 ID 목록"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT batch_id FROM batches WHERE merged_at IS NULL ORDER BY created_at"
+            ).fetchall()
+        return [row['batch_id'] for row in rows]
+
+    def poll(self, batch_id):
+        """배치 상태를 조회하고, 끝났으면 결과를 합침. (상태, 합친 요약 수) 반환
+
+        expired/cancelled 배치도 처리된 요청의 결과 파일이 있으면 합치고, 오류 파일이 있으면 실패 수를 기록합니다.
+        결과를 내려받거나 합치다 실패하면 merged_at을 남기지 않으므로 다음 poll에서 다시 시도합니다.
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        merged = 0
+        error_count = None
+
+        if batch.status in TERMINAL_STATUSES:
+            if batch.output_file_id:
+                merged = self._merge(batch_id, self.client.files.content(batch.output_file_id).text)
+            if batch.error_file_id:
+                error_count = self._log_errors(batch_id, self.client.files.content(batch.error_file_id).text)
+
+        with self._lock:
+            self._conn.execute("UPDATE batches SET status = ? WHERE batch_id = ?", (batch.status, batch_id))
+            if batch.status in TERMINAL_STATUSES:
+                self._conn.execute(
+                    "UPDATE batches SET merged_at = ?, error_file_id = ?, error_count = ? WHERE batch_id = ?",
+                    (time.time(), batch.error_file_id, error_count, batch_id)
+                )
+            self._conn.commit()
+        return batch.status, merged
+
+    def wait(self, batch_ids=None, interval=30, timeout=None):
+        """배치가 모두 끝날 때까지 interval초마다 폴링. {배치 ID: (상태, 합친 요약 수)} 반환"""
+        remaining = list(batch_ids or self.pending_batches())
+        results = {}
+        deadline = time.time() + timeout if timeout else None
+
+        while remaining:
+            for batch_id in list(remaining):
+                status, merged = self.poll(batch_id)
+                results[batch_id] = (status, merged)
+                if status in TERMINAL_STATUSES:
+                    remaining.remove(batch_id)
+                    logger.info(f"요약 배치 종료: {batch_id} ({status}, {merged}개 요약 반영)")
+
+            if not remaining or (deadline and time.time() >= deadline):
+                break
+            time.sleep(interval)
+        return results
+
+    @staticmethod
+    def _log_errors(batch_id, error_text):
+        """배치 오류 파일(JSONL)의 실패 요청 수를 세고 첫 오류를 로그로 남김"""
+        errors = [json.loads(line) for line in error_text.splitlines() if line.strip()]
+        if errors:
+            first = errors[0]
+            body = ((first.get('response') or {}).get('body') or {})
+            message = (first.get('error') or body.get('error') or {}).get('message')
+            logger.warning(f"요약 배치 {batch_id}: {len(errors)}개 요청 실패 (예: {first.get('custom_id')} {message})")
+        return len(errors)
+
+    def _merge(self, batch_id, output_text):
+        """배치 결과 JSONL을 기사 인덱스와 요약 캐시에 반영"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT custom_id, url, title, content FROM batch_items WHERE batch_id = ?", (batch_id,)
+            ).fetchall()
+        items = {row['custom_id']: row for row in rows}
+
+        merged = 0
+        for line in output_text.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            item = items.get(result.get('custom_id'))
+            response = result.get('response') or {}
+            if item is None or result.get('error') or response.get('status_code') != 200:
+                logger.warning(f"배치 요약 실패: {result.get('custom_id')} {result.get('error')}")
+                continue
+
+            text = response['body']['choices'][0]['message']['content']
+            try:
+                summary, summary_data = self.crawler.summary_result(item['title'], text)
+            except ValueError as e:
+                logger.warning(f"배치 요약 형식 오류: {result.get('custom_id')} {str(e)}")
+                continue
+            self.crawler.summary_cache.set(self.crawler.summary_cache_key(item['title'], item['content']), text)
+            self.crawler.article_index.upsert(item['url'], item['title'], item['content'], summary, summary_data)
+            merged += 1
+        return merged
@@ -0,0 +1,210 @@
+"""기간 내보내기 메모리 벤치마크
+
+임시 기사 저장소에 가짜 기사 N개(여러 실행, 여러 날짜)를 넣고, 내보내기 방식마다 새 프로세스에서
+최대 RSS 증가량(ru_maxrss)과 소요 시간을 측정합니다.
+
+    pandas_csv    이전 방식: 전체 행을 리스트로 읽어 DataFrame.to_csv
+    stream_csv    export_articles(fmt='csv'): 저장소에서 묶음 단위로 읽어 바로 씀
+    stream_jsonl  export_articles(fmt='jsonl')
+    digest_pdf    create_digest_pdf_report (기사 수가 --pdf-max 이하일 때만)
+
+결과는 실행마다 한 줄씩 JSON Lines 파일에 추가되며, 같은 규모의 직전 결과와 비교해 변화율을 출력합니다.
+
+    python benchmarks/export_benchmark.py --sizes 1000 10000 --body-kb 4
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, ROOT)
+
+METHODS = ('pandas_csv', 'stream_csv', 'stream_jsonl', 'digest_pdf')
+
+# 하루에 저장할 실행 수와 실행당 기사 수 (대시보드에서 10분마다 상위 10개를 모으는 것과 비슷한 분포)
+RUNS_PER_DAY = 24
+ARTICLES_PER_RUN = 10
+
+SUMMARY_DATA = {
+    'analogy': "도서관 사서가 책 내용을 한 장으로 정리해 주는 것과 같습니다.",
+    'key_points': ["첫 번째 핵심", "두 번째 핵심", "세 번째 핵심"],
+    'details': "상세 설명 " * 20,
+    'critical_points': ["비판적으로 볼 점", "한계"],
+    'numbers': [{'label': "성능 향상", 'value': "30%"}],
+    'next_step': "오늘 한 번 써 보세요.",
+    'terms': [{'term': "LLM", 'explanation': "대규모 언어 모델"}],
+    'prerequisites': "없음"
+}
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS(MB) (리눅스는 KB, macOS는 바이트 단위)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def seed_store(workdir, size, body_kb):
+    """workdir/crawled_data/articles.db에 기사 size개를 실행/날짜별로 나눠 저장"""
+    from article_store import ArticleStore
+    from summary_schema import summary_to_markdown
+
+    store = ArticleStore(os.path.join(workdir, "crawled_data", "articles.db"))
+    filler = "인공지능 모델이 새로운 기록을 세웠다. " * max(1, body_kb * 1024 // 60)
+    start = datetime(2025, 1, 1)
+    for run_start in range(0, size, ARTICLES_PER_RUN):
+        run_index = run_start // ARTICLES_PER_RUN
+        crawl_time = (start + timedelta(hours=24 / RUNS_PER_DAY * run_index)).strftime("%Y-%m-%d %H:%M:%S")
+        news_data = []
+        for i in range(run_start, min(size, run_start + ARTICLES_PER_RUN)):
+            title = f"벤치마크 기사 {i}"
+            news_data.append({
+                'rank': i - run_start + 1,
+                'title': title,
+                'url': f"https://www.aitimes.com/news/articleView.html?idxno={100000 + i}",
+                'content': f"[{i}] {filler}",
+                'summary': summary_to_markdown(title, SUMMARY_DATA),
+                'summary_data': SUMMARY_DATA,
+                'crawl_time': crawl_time
+            })
+        store.save_run(news_data, summary_count=len(news_data))
+
+
+def run_method(method, workdir):
+    """새 프로세스에서 method 하나를 실행하고 측정값을 한 줄 JSON으로 출력"""
+    # 크롤러는 crawled_data/를 현재 디렉토리 기준으로 쓰므로 임시 디렉토리에서 실행
+    os.chdir(workdir)
+    from aitimes_crawler import AITimesCrawler
+
+    crawler = AITimesCrawler()
+    if method == 'pandas_csv':
+        import pandas as pd
+    base_rss = peak_rss_mb()
+
+    started = time.perf_counter()
+    rows = 0
+    if method == 'pandas_csv':
+        articles = crawler.article_store.query_articles(limit=None)
+        df = pd.DataFrame(articles)
+        df['summary_data'] = df['summary_data'].map(lambda data: json.dumps(data, ensure_ascii=False))
+        df.to_csv(os.path.join("crawled_data", "pandas_export.csv"), index=False, encoding='utf-8-sig')
+        rows = len(df)
+    elif method in ('stream_csv', 'stream_jsonl'):
+        path, rows = crawler.export_articles(fmt=method.split('_')[1])
+        if path is None:
+            raise RuntimeError("내보내기 실패")
+    elif method == 'digest_pdf':
+        if crawler.create_digest_pdf_report() is None:
+            raise RuntimeError("다이제스트 생성 실패")
+    wall = time.perf_counter() - started
+
+    print(json.dumps({
+        'wall_s': round(wall, 3),
+        'rows': rows,
+        'base_rss_mb': round(base_rss, 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'delta_rss_mb': round(peak_rss_mb() - base_rss, 1)
+    }))
+
+
+def run_size(size, args):
+    """기사 size개 규모로 방식별 측정"""
+    methods = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        started = time.perf_counter()
+        seed_store(workdir, size, args.body_kb)
+        seed_s = time.perf_counter() - started
+
+        for method in args.methods:
+            if method == 'digest_pdf' and size > args.pdf_max:
+                continue
+            result = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', method, '--workdir', workdir],
+                cwd=ROOT, capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                print(result.stderr, file=sys.stderr)
+                raise SystemExit(f"{method} 측정 실패")
+            methods[method] = json.loads(result.stdout.strip().splitlines()[-1])
+        # WAL 모드라 체크포인트 전 기록은 -wal 파일에 있으므로 함께 셈
+        db_path = os.path.join(workdir, "crawled_data", "articles.db")
+        db_mb = sum(os.path.getsize(path) for path in (db_path, db_path + '-wal') if os.path.exists(path)) / (1024 * 1024)
+
+    return {'methods': methods, 'seed_s': round(seed_s, 2), 'db_mb': round(db_mb, 1)}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_previous(output_path):
+    """규모별 직전 결과 (변화율 비교용)"""
+    previous = {}
+    if os.path.exists(output_path):
+        with open(output_path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    previous[record['size']] = record
+    return previous
+
+
+def print_report(record, previous):
+    print(f"\n== 기사 {record['size']}개 (본문 {record['params']['body_kb']}KB, DB {record['db_mb']}MB) ==")
+    print(f"{'method':<16}{'wall_s':>10}{'rows':>10}{'Δrss_mb':>10}{'peak_mb':>10}{'Δrss':>9}")
+    for name, method in record['methods'].items():
+        change = ''
+        if previous and name in previous['methods'] and previous['methods'][name]['delta_rss_mb']:
+            ratio = method['delta_rss_mb'] / previous['methods'][name]['delta_rss_mb'] - 1
+            change = f"{ratio:+.0%}"
+        print(f"{name:<16}{method['wall_s']:>10.3f}{method['rows']:>10}"
+              f"{method['delta_rss_mb']:>10.1f}{method['peak_rss_mb']:>10.1f}{change:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--body-kb', type=int, default=4, help="기사 본문 크기(KB)")
+    parser.add_argument('--methods', nargs='+', choices=METHODS, default=list(METHODS))
+    parser.add_argument('--pdf-max', type=int, default=1000, help="다이제스트 PDF를 측정할 최대 기사 수")
+    parser.add_argument('--output', default=os.path.join(BENCHMARK_DIR, 'export_results.jsonl'))
+    parser.add_argument('--child', choices=METHODS, help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_method(args.child, args.workdir)
+        return
+
+    previous = load_previous(args.output)
+    commit = git_commit()
+
+    for size in args.sizes:
+        result = run_size(size, args)
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': commit,
+            'python': platform.python_version(),
+            'size': size,
+            'params': {'body_kb': args.body_kb, 'pdf_max': args.pdf_max},
+            **result
+        }
+        print_report(record, previous.get(size))
+        with open(args.output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
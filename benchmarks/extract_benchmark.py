@@ -0,0 +1,86 @@
+"""본문 추출 엔진 벤치마크
+
+저장된 aitimes 기사 HTML 코퍼스(디렉토리의 *.html)에 대해 각 추출기의 처리량(페이지/초)과
+기존 구현(BeautifulSoup html.parser 전체 파싱, 고정 선택자 순서)과의 출력 일치 여부를 비교합니다.
+
+    # 현재 메인 페이지 상위 기사로 코퍼스 저장
+    python benchmarks/extract_benchmark.py --corpus corpus/ --record
+    # 벤치마크 실행
+    python benchmarks/extract_benchmark.py --corpus corpus/ --repeat 5
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractors import EXTRACTORS, SoupExtractor  # noqa: E402
+
+
+def record_corpus(corpus_dir):
+    """메인 페이지 상위 기사들의 원본 HTML을 코퍼스 디렉토리에 저장"""
+    from aitimes_crawler import AITimesCrawler
+    from article_index import ArticleIndex
+
+    crawler = AITimesCrawler()
+    os.makedirs(corpus_dir, exist_ok=True)
+    for news in crawler.crawl_news_list():
+        html = crawler._fetch(news['url'])
+        article_id = ArticleIndex.article_id_from_url(news['url'])
+        with open(os.path.join(corpus_dir, f"{article_id}.html"), 'w', encoding='utf-8') as f:
+            f.write(html)
+        print(f"저장: {news['url']}")
+
+
+def reference_extract(html, url):
+    """기존 crawl_article_content와 같은 동작 (BeautifulSoup 전체 파싱, 고정 선택자 순서)"""
+    return SoupExtractor(partial=False).extract(html, url)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', required=True, help="*.html 파일이 있는 디렉토리")
+    parser.add_argument('--record', action='store_true', help="벤치마크 전에 현재 기사로 코퍼스 저장")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.record:
+        record_corpus(args.corpus)
+
+    pages = []
+    for path in sorted(glob.glob(os.path.join(args.corpus, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages.append((f"https://www.aitimes.com/{os.path.basename(path)}", f.read()))
+    if not pages:
+        print("코퍼스에 HTML 파일이 없습니다.")
+        return 1
+
+    expected = [reference_extract(html, url) for url, html in pages]
+
+    candidates = [('soup (부분 파싱)', lambda: SoupExtractor(partial=True))]
+    for name, extractor_class in EXTRACTORS.items():
+        candidates.append((name, extractor_class))
+
+    print(f"{len(pages)}개 페이지 × {args.repeat}회")
+    print(f"{'추출기':<20}{'페이지/초':>12}{'일치':>10}")
+    for name, factory in candidates:
+        try:
+            extractor = factory()
+        except ImportError:
+            print(f"{name:<20}{'미설치':>12}")
+            continue
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            outputs = [extractor.extract(html, url) for url, html in pages]
+        elapsed = time.perf_counter() - started
+
+        matches = sum(1 for out, exp in zip(outputs, expected) if out == exp)
+        print(f"{name:<20}{len(pages) * args.repeat / elapsed:>12.1f}{f'{matches}/{len(pages)}':>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
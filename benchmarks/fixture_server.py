@@ -0,0 +1,451 @@
+"""벤치마크용 로컬 대역 서버
+
+aitimes.com 메인/목록/기사 페이지와 OpenAI 호환 chat completions / files / batches 엔드포인트를 흉내 냅니다.
+기사 페이지는 fixtures 디렉토리의 기록된 HTML(article_*.html)이 있으면 그것을 순환해 사용하고,
+없으면 article.html 템플릿에 제목과 본문을 채워 만듭니다.
+
+    with FixtureServer(article_count=100, llm_latency=0.2) as server:
+        crawler = AITimesCrawler(base_url=server.base_url, openai_base_url=server.openai_base_url)
+"""
+import email.parser
+import email.policy
+import glob
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+FAKE_SUMMARY = """## 🚀 {title}
+
+### 💡 핵심 비유 (Analogy)
+- 벤치마크용 가짜 요약입니다.
+
+### ✨ 핵심 요약 (Key Points)
+- 가장 중요한 내용 3가지 요약
+    - Point 1
+    - Point 2
+    - Point 3
+
+### 📚 상세 내용 (Details)
+- 로컬 대역 서버가 생성한 고정 응답입니다.
+"""
+
+# response_format이 json_schema인 요약 요청에 돌려줄 구조화 요약
+FAKE_SUMMARY_DATA = {
+    'analogy': "{title}: 벤치마크용 가짜 요약입니다.",
+    'key_points': ["Point 1", "Point 2", "Point 3"],
+    'details': "로컬 대역 서버가 생성한 고정 응답입니다.",
+    'critical_points': ["Point 1", "Point 2"],
+    'numbers': [{'label': "핵심 통계", 'value': "20%"}],
+    'next_step': "대역 서버 응답을 확인합니다.",
+    'terms': [{'term': "대역 서버", 'explanation': "실제 서버 대신 응답하는 연습 상대"}],
+    'prerequisites': "없음"
+}
+
+
+FILLER_SENTENCES = [
+    "국내외 기업들이 생성형 AI를 업무에 도입하면서 생산성 향상 효과를 보고 있다.",
+    "데이터 보안과 비용 문제는 여전히 과제로 남아 있다.",
+    "정부는 AI 기본법 시행령을 통해 고영향 AI에 대한 관리 기준을 마련하기로 했다.",
+    "반도체 업계는 추론용 칩 수요가 급증하면서 생산 능력을 늘리고 있다.",
+    "오픈소스 모델의 성능이 빠르게 올라오면서 상용 모델과의 격차가 줄어들고 있다.",
+    "전문가들은 에이전트 기술이 내년 기업 시장의 핵심 화두가 될 것으로 내다봤다.",
+    "스타트업들은 특정 산업에 특화된 소형 언어모델로 틈새시장을 공략하고 있다.",
+    "클라우드 업체들은 GPU 공급 부족을 해소하기 위해 데이터센터 투자를 확대했다.",
+    "교육 현장에서는 AI 디지털 교과서 도입을 두고 찬반 의견이 엇갈린다.",
+    "의료 분야에서는 영상 판독 보조 AI가 식약처 인허가를 잇달아 받고 있다.",
+    "저작권 단체들은 학습 데이터 사용에 대한 보상 체계를 요구하고 있다.",
+    "금융권은 내부 업무에 대형 언어모델을 적용하기 위한 망분리 규제 완화를 요청했다.",
+    "로봇 기업들은 휴머노이드 플랫폼에 멀티모달 모델을 결합하는 실험을 이어가고 있다.",
+    "보고서에 따르면 올해 국내 AI 시장 규모는 전년 대비 20% 이상 성장할 전망이다.",
+    "이번 발표는 개발자 행사에서 공개됐으며 다음 달부터 순차적으로 제공된다.",
+    "회사 측은 안전성 평가를 거쳐 기능을 단계적으로 확대하겠다고 밝혔다."
+]
+
+
+def _random_word(rng):
+    return ''.join(chr(0xAC00 + rng.randrange(11172)) for _ in range(rng.randint(2, 4)))
+
+
+class FixtureServer:
+    """기록된 aitimes 페이지와 가짜 OpenAI 엔드포인트를 제공하는 스레드 HTTP 서버"""
+
+    def __init__(self, article_count=10, llm_latency=0.0, llm_jitter=0.0, paragraphs=12, batch_latency=0.0,
+                 token_latency=0.0, duplicate_every=0, rate_limit_rpm=0, rate_window=60.0, error_rate=0.0,
+                 tail_rate=0.0, tail_latency=0.0, fixtures_dir=FIXTURES_DIR, host='127.0.0.1', port=0):
+        self.article_count = article_count
+        # 0보다 크면 idxno가 이 값의 배수인 기사는 바로 앞 기사와 본문이 같은 유사 기사로 생성
+        self.duplicate_every = duplicate_every
+        # 첫 토큰(비스트리밍은 전체 응답)까지의 지연과 스트리밍 토큰 간 지연(초)
+        self.llm_latency = llm_latency
+        self.llm_jitter = llm_jitter
+        self.token_latency = token_latency
+        # chat completions 요청 중 tail_rate 비율은 tail_latency초를 더 기다림 (API가 느린 날의 꼬리 지연)
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.paragraphs = paragraphs
+        # 배치가 제출 후 completed가 되기까지 걸리는 시간(초)
+        self.batch_latency = batch_latency
+        # 0보다 크면 rate_window초 동안 chat completions 요청을 이 수만큼만 받고 나머지는 429로 거절
+        # (rate_window를 줄이면 분당 한도를 짧은 시간에 재현할 수 있음)
+        self.rate_limit_rpm = rate_limit_rpm
+        self.rate_window = rate_window
+        # chat completions 요청 중 이 비율만큼 500 오류로 응답
+        self.error_rate = error_rate
+        self._request_times = deque()
+        self.files = {}
+        self.batches = {}
+        self._api_lock = threading.RLock()
+
+        with open(os.path.join(fixtures_dir, 'article.html'), encoding='utf-8') as f:
+            self.article_template = f.read()
+        self.recorded_articles = []
+        for path in sorted(glob.glob(os.path.join(fixtures_dir, 'article_*.html'))):
+            with open(path, encoding='utf-8') as f:
+                self.recorded_articles.append(f.read())
+
+        self.stats = {'page_requests': 0, 'not_modified': 0, 'llm_requests': 0, 'bytes_sent': 0,
+                      'rate_limited': 0, 'server_errors': 0}
+        self._stats_lock = threading.Lock()
+
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openai_base_url(self):
+        return self.base_url + "/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def article_url(self, idxno):
+        return f"{self.base_url}/news/articleView.html?idxno={idxno}"
+
+    def article_title(self, idxno):
+        return f"AI 벤치마크 기사 {idxno}: 생성형 AI 도입 사례와 과제"
+
+    def news_list(self, crawl_time="2026-01-01 00:00:00"):
+        """crawl_news_list 결과와 같은 형식의 전체 기사 목록 (상위 10개 제한 없이)"""
+        return [
+            {'rank': str(i), 'title': self.article_title(i), 'url': self.article_url(i), 'crawl_time': crawl_time}
+            for i in range(1, self.article_count + 1)
+        ]
+
+    def render_front_page(self):
+        links = '\n'.join(
+            f'<li><a class="auto-valign" href="/news/articleView.html?idxno={i}">'
+            f'<em class="number">{i}</em><span class="auto-titles">{self.article_title(i)}</span></a></li>'
+            for i in range(1, self.article_count + 1)
+        )
+        return f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>AI타임스</title></head>' \
+               f'<body><section class="auto-article"><ul>{links}</ul></section></body></html>'
+
+    def render_list_page(self, page, page_size=20):
+        """articleList.html 목록 페이지 (기사마다 사진 링크 + 제목 링크, 앞뒤 5페이지 페이지네이션)"""
+        last_page = max(1, -(-self.article_count // page_size))
+        first = (page - 1) * page_size + 1
+        items = '\n'.join(
+            f'<li><a href="/news/articleView.html?idxno={i}" class="thumb"><img src="/photo/{i}.jpg"></a>'
+            f'<h4 class="titles"><a href="/news/articleView.html?idxno={i}&sc_order_by=E">{self.article_title(i)}</a></h4></li>'
+            for i in range(first, min(first + page_size, self.article_count + 1))
+        )
+        pages = '\n'.join(
+            f'<a href="/news/articleList.html?page={p}&view_type=sm&sc_order_by=E">{p}</a>'
+            for p in range(max(1, page - 5), min(last_page, page + 5) + 1)
+        )
+        return f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>전체기사 - AI타임스</title></head>' \
+               f'<body><a href="/">AI타임스</a><a href="https://example.com/ad">광고</a>' \
+               f'<section id="section-list"><ul class="type2">{items}</ul></section>' \
+               f'<nav class="pagination">{pages}</nav></body></html>'
+
+    def render_article(self, idxno):
+        if self.recorded_articles:
+            return self.recorded_articles[idxno % len(self.recorded_articles)]
+
+        source = idxno - 1 if self.duplicate_every and idxno % self.duplicate_every == 0 and idxno > 1 else idxno
+        # 기사마다 문장 조합이 달라 유사 기사 검출에 걸리지 않도록 idxno로 고정한 난수로 문단 생성
+        rng = random.Random(source)
+        body = '\n'.join(
+            f'    <p>{rng.choice(FILLER_SENTENCES)} ' + ' '.join(_random_word(rng) for _ in range(30)) + '</p>'
+            for _ in range(self.paragraphs)
+        )
+        return self.article_template.replace('{{title}}', self.article_title(idxno)).replace('{{body}}', body)
+
+    def admit_chat_request(self):
+        """rate_limit_rpm/error_rate에 따라 (상태 코드, 응답 헤더) 결정 (200이면 요청 처리)"""
+        with self._api_lock:
+            now = time.monotonic()
+            while self._request_times and self._request_times[0] <= now - self.rate_window:
+                self._request_times.popleft()
+            if not self.rate_limit_rpm:
+                return (500 if random.random() < self.error_rate else 200), {}
+
+            # 헤더의 한도/잔량은 OpenAI처럼 분당 값으로 환산해 보냄
+            per_minute = 60 / self.rate_window
+            reset = self.rate_window - (now - self._request_times[0]) if self._request_times else 0
+            headers = {
+                'x-ratelimit-limit-requests': str(int(self.rate_limit_rpm * per_minute)),
+                'x-ratelimit-reset-requests': f"{max(reset, 0.001):.3f}s"
+            }
+            if len(self._request_times) >= self.rate_limit_rpm:
+                headers['x-ratelimit-remaining-requests'] = '0'
+                headers['retry-after-ms'] = str(int(max(reset, 0.001) * 1000))
+                return 429, headers
+            self._request_times.append(now)
+            headers['x-ratelimit-remaining-requests'] = str(int((self.rate_limit_rpm - len(self._request_times)) * per_minute))
+        return (500 if random.random() < self.error_rate else 200), headers
+
+    def chat_completion(self, request, delay=True):
+        """가짜 chat completion 응답 (설정된 지연 후 고정 요약 반환, 구조화 출력 요청이면 JSON)"""
+        seconds = self.llm_latency + random.uniform(0, self.llm_jitter) if delay else 0
+        if delay and random.random() < self.tail_rate:
+            seconds += self.tail_latency
+        if seconds > 0:
+            time.sleep(seconds)
+
+        prompt = request['messages'][-1]['content']
+        title = prompt.split('기사 제목:', 1)[-1].split('\n', 1)[0].strip() if '기사 제목:' in prompt else ''
+        if (request.get('response_format') or {}).get('type') == 'json_schema':
+            content = json.dumps(dict(FAKE_SUMMARY_DATA, analogy=FAKE_SUMMARY_DATA['analogy'].format(title=title)),
+                                 ensure_ascii=False)
+        else:
+            content = FAKE_SUMMARY.format(title=title)
+        prompt_tokens = len(prompt) // 2
+        completion_tokens = len(content) // 2
+        return {
+            'id': 'chatcmpl-fixture',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'gpt-4o-mini'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens
+            }
+        }
+
+
+    def stream_chat_completion(self, request):
+        """stream=True 요청에 대한 SSE 이벤트 생성 (첫 토큰 전 llm_latency, 토큰마다 token_latency 대기)"""
+        completion = self.chat_completion(request)
+        content = completion['choices'][0]['message']['content']
+        base = {'id': completion['id'], 'object': 'chat.completion.chunk',
+                'created': completion['created'], 'model': completion['model']}
+
+        # 한국어 요약을 몇 글자씩 잘라 토큰처럼 전송
+        pieces = [content[i:i + 3] for i in range(0, len(content), 3)]
+        for piece in pieces:
+            if self.token_latency > 0:
+                time.sleep(self.token_latency)
+            yield dict(base, choices=[{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}])
+        yield dict(base, choices=[{'index': 0, 'delta': {}, 'finish_reason': 'stop'}])
+        if (request.get('stream_options') or {}).get('include_usage'):
+            usage = dict(completion['usage'], completion_tokens=len(pieces))
+            usage['total_tokens'] = usage['prompt_tokens'] + usage['completion_tokens']
+            yield dict(base, choices=[], usage=usage)
+
+    def create_file(self, content, purpose):
+        with self._api_lock:
+            file_id = f"file-{len(self.files) + 1}"
+            self.files[file_id] = content
+        return {'id': file_id, 'object': 'file', 'bytes': len(content), 'created_at': int(time.time()),
+                'filename': f"{file_id}.jsonl", 'purpose': purpose, 'status': 'processed'}
+
+    def create_batch(self, request):
+        with self._api_lock:
+            batch_id = f"batch-{len(self.batches) + 1}"
+            self.batches[batch_id] = {
+                'id': batch_id,
+                'object': 'batch',
+                'endpoint': request['endpoint'],
+                'input_file_id': request['input_file_id'],
+                'completion_window': request['completion_window'],
+                'status': 'in_progress',
+                'created_at': int(time.time()),
+                'output_file_id': None,
+                'error_file_id': None,
+                'request_counts': {'total': 0, 'completed': 0, 'failed': 0}
+            }
+        return self.batches[batch_id]
+
+    def retrieve_batch(self, batch_id):
+        """batch_latency가 지난 배치는 결과 파일을 만들고 completed로 전환"""
+        with self._api_lock:
+            return self._advance_batch(self.batches[batch_id])
+
+    def _advance_batch(self, batch):
+        if batch['status'] == 'in_progress' and time.time() - batch['created_at'] >= self.batch_latency:
+            lines = []
+            for line in self.files[batch['input_file_id']].decode('utf-8').splitlines():
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                completion = self.chat_completion(request['body'], delay=False)
+                lines.append(json.dumps({
+                    'id': f"batch_req_{request['custom_id']}",
+                    'custom_id': request['custom_id'],
+                    'response': {'status_code': 200, 'request_id': request['custom_id'], 'body': completion},
+                    'error': None
+                }, ensure_ascii=False))
+            output = self.create_file(('\n'.join(lines) + '\n').encode('utf-8'), 'batch_output')
+            batch.update({
+                'status': 'completed',
+                'output_file_id': output['id'],
+                'request_counts': {'total': len(lines), 'completed': len(lines), 'failed': 0}
+            })
+        return batch
+
+
+def _parse_multipart(content_type, body):
+    """multipart/form-data 본문을 {필드 이름: 바이트}로 변환"""
+    message = email.parser.BytesParser(policy=email.policy.default).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode('latin-1') + body
+    )
+    return {
+        part.get_param('name', header='content-disposition'): part.get_payload(decode=True)
+        for part in message.iter_parts()
+    }
+
+
+def _make_handler(fixture):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        # keep-alive 커넥션 재사용이 측정되도록 HTTP/1.1 사용
+        protocol_version = 'HTTP/1.1'
+        # 헤더와 본문을 따로 쓸 때 Nagle 지연(~40ms)이 측정값에 섞이지 않도록 비활성화
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, body=b'', content_type='text/html; charset=utf-8', headers=None):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+            fixture.count('bytes_sent', len(body))
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path == '/':
+                fixture.count('page_requests')
+                self._send(200, fixture.render_front_page().encode('utf-8'))
+            elif parsed.path.startswith('/v1/batches/'):
+                batch_id = parsed.path.rsplit('/', 1)[-1]
+                if batch_id in fixture.batches:
+                    self._send_json(200, fixture.retrieve_batch(batch_id))
+                else:
+                    self._send_json(404, {'error': {'message': 'batch not found'}})
+            elif parsed.path.startswith('/v1/files/') and parsed.path.endswith('/content'):
+                file_id = parsed.path.split('/')[3]
+                if file_id in fixture.files:
+                    self._send(200, fixture.files[file_id], content_type='application/octet-stream')
+                else:
+                    self._send_json(404, {'error': {'message': 'file not found'}})
+            elif parsed.path == '/news/articleList.html':
+                fixture.count('page_requests')
+                page = int(parse_qs(parsed.query).get('page', ['1'])[0])
+                self._send(200, fixture.render_list_page(page).encode('utf-8'))
+            elif parsed.path == '/news/articleView.html':
+                fixture.count('page_requests')
+                idxno = int(parse_qs(parsed.query).get('idxno', ['0'])[0])
+                body = fixture.render_article(idxno).encode('utf-8')
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    fixture.count('not_modified')
+                    self._send(304, headers={'ETag': etag})
+                else:
+                    self._send(200, body, headers={'ETag': etag})
+            else:
+                self._send(404, b'not found')
+
+        def _send_stream(self, chunks, headers=None):
+            """SSE 응답 (길이를 모르므로 전송 후 연결 종료)"""
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Connection', 'close')
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.close_connection = True
+            try:
+                for chunk in chunks:
+                    data = f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8')
+                    self.wfile.write(data)
+                    self.wfile.flush()
+                    fixture.count('bytes_sent', len(data))
+                self.wfile.write(b"data: [DONE]\n\n")
+            except (BrokenPipeError, ConnectionResetError):
+                # 클라이언트가 스트림을 중간에 닫음 (hedge에서 진 쪽 요청 등)
+                pass
+
+        def _send_json(self, status, payload, headers=None):
+            self._send(status, json.dumps(payload, ensure_ascii=False).encode('utf-8'),
+                       content_type='application/json', headers=headers)
+
+        def do_POST(self):
+            path = urlparse(self.path).path
+            length = int(self.headers.get('Content-Length', 0))
+            body = self.rfile.read(length)
+
+            if path == '/v1/chat/completions':
+                fixture.count('llm_requests')
+                request = json.loads(body)
+                status, headers = fixture.admit_chat_request()
+                if status == 429:
+                    fixture.count('rate_limited')
+                    self._send_json(429, {'error': {'message': 'Rate limit reached for requests',
+                                                    'type': 'requests', 'code': 'rate_limit_exceeded'}}, headers)
+                elif status != 200:
+                    fixture.count('server_errors')
+                    self._send_json(status, {'error': {'message': 'The server had an error', 'type': 'server_error'}})
+                elif request.get('stream'):
+                    self._send_stream(fixture.stream_chat_completion(request), headers)
+                else:
+                    self._send_json(200, fixture.chat_completion(request), headers)
+            elif path == '/v1/files':
+                fields = _parse_multipart(self.headers['Content-Type'], body)
+                self._send_json(200, fixture.create_file(fields['file'], fields['purpose'].decode('utf-8')))
+            elif path == '/v1/batches':
+                self._send_json(200, fixture.create_batch(json.loads(body)))
+            else:
+                self._send_json(404, {'error': {'message': 'not found'}})
+
+    return FixtureHandler
@@ -0,0 +1,123 @@
+"""LLM 백엔드 hedge 꼬리 지연 벤치마크
+
+가짜 OpenAI 서버(일부 요청이 tail_latency초 더 느림)와 가짜 로컬 서버(조금 느리지만 꼬리 없음) 두 개를 띄우고,
+주 백엔드만 쓸 때와 p95 기한을 넘기면 로컬 서버에도 보내는 hedge를 쓸 때의 기사별 요약 지연 p50/p95/p99를 비교합니다.
+hedge는 처음 --warmup개 요청으로 지연 표본을 모은 뒤 측정합니다.
+결과는 실행마다 한 줄씩 JSON Lines 파일에 추가됩니다.
+
+    python benchmarks/hedge_benchmark.py --articles 200 --tail-rate 0.05 --tail-latency 2
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCHMARK_DIR)
+
+from aitimes_crawler import AITimesCrawler  # noqa: E402
+from fixture_server import FixtureServer  # noqa: E402
+from llm_backends import LOCAL_PER_MINUTE, HedgedBackend, OpenAIBackend  # noqa: E402
+from pipeline_benchmark import FAKE_API_KEY, git_commit, percentile, timed_map  # noqa: E402
+
+
+def latency_result(latencies):
+    return {
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+        'max_ms': round(max(latencies) * 1000, 1)
+    }
+
+
+def run_mode(mode, primary_server, local_server, items, warmup, args):
+    """mode('primary' 또는 'hedged') 백엔드로 warmup개를 먼저 요약한 뒤 items를 요약하며 지연 측정"""
+    # 대역 서버는 한도 헤더를 보내지 않으므로 토큰 버킷이 지연에 섞이지 않게 한도를 풀어 둠
+    primary = OpenAIBackend('openai', base_url=primary_server.openai_base_url, requests_per_minute=LOCAL_PER_MINUTE,
+                            tokens_per_minute=LOCAL_PER_MINUTE, max_concurrency=args.workers)
+    llm = primary
+    if mode == 'hedged':
+        local = OpenAIBackend('local', 'local', local_server.openai_base_url, api_key='local',
+                              requests_per_minute=LOCAL_PER_MINUTE, tokens_per_minute=LOCAL_PER_MINUTE,
+                              max_concurrency=args.workers)
+        llm = HedgedBackend(primary, local, quantile=args.quantile, initial_delay=args.hedge_delay)
+
+    # 요약 캐시가 비어 있도록 모드마다 새 디렉토리에서 실행
+    os.makedirs(mode)
+    os.chdir(mode)
+    crawler = AITimesCrawler(llm=llm)
+    summarize = lambda item: crawler.summarize_with_gpt(item[0], item[1], FAKE_API_KEY)
+    timed_map(summarize, warmup, args.workers)
+    before = dict(local_server.stats)
+    wall, latencies, results = timed_map(summarize, items, args.workers)
+    os.chdir('..')
+
+    result = dict(latency_result(latencies), wall_s=round(wall, 3),
+                  failures=sum(1 for _, data in results if data is None))
+    if mode == 'hedged':
+        stats = llm.stats()
+        result.update(hedged=stats['hedged'], fallbacks=stats['fallbacks'], wins=stats['wins'],
+                      local_requests=local_server.stats['llm_requests'] - before['llm_requests'])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=40, help="지연 표본을 모을 사전 요청 수 (측정에서 제외)")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.2, help="주 서버 기본 지연(초)")
+    parser.add_argument('--jitter', type=float, default=0.1, help="주 서버 지연 편차 상한(초)")
+    parser.add_argument('--tail-rate', type=float, default=0.05, help="주 서버에서 느린 요청 비율")
+    parser.add_argument('--tail-latency', type=float, default=2.0, help="느린 요청에 더할 지연(초)")
+    parser.add_argument('--local-latency', type=float, default=0.4, help="로컬 서버 지연(초)")
+    parser.add_argument('--quantile', type=float, default=0.95)
+    parser.add_argument('--hedge-delay', type=float, default=1.0, help="지연 표본이 모이기 전 기한(초)")
+    parser.add_argument('--output', default=os.path.join(BENCHMARK_DIR, 'hedge_results.jsonl'))
+    args = parser.parse_args()
+
+    count = args.warmup + args.articles
+    # 크롤러는 crawled_data/를 현재 디렉토리 기준으로 쓰므로 임시 디렉토리에서 실행
+    with tempfile.TemporaryDirectory() as workdir, FixtureServer(article_count=count, llm_latency=args.latency, llm_jitter=args.jitter,
+                       tail_rate=args.tail_rate, tail_latency=args.tail_latency) as primary_server, \
+            FixtureServer(article_count=count, llm_latency=args.local_latency) as local_server:
+        os.chdir(workdir)
+        # 본문은 한 번만 가져와 두 모드에서 같이 씀
+        fetcher = AITimesCrawler(base_url=primary_server.base_url)
+        news_list = primary_server.news_list()
+        _, _, contents = timed_map(lambda news: fetcher.crawl_article_content(news['url']), news_list, args.workers)
+        items = [(news['title'], content) for news, content in zip(news_list, contents)]
+        warmup, measured = items[:args.warmup], items[args.warmup:]
+
+        modes = {mode: run_mode(mode, primary_server, local_server, measured, warmup, args)
+                 for mode in ('primary', 'hedged')}
+        os.chdir(ROOT)
+
+    record = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'size': args.articles,
+        'params': {key: getattr(args, key) for key in ('warmup', 'workers', 'latency', 'jitter', 'tail_rate',
+                                                       'tail_latency', 'local_latency', 'quantile')},
+        'modes': modes
+    }
+
+    print(f"\n== 기사 {args.articles}개 (느린 요청 {args.tail_rate:.0%} +{args.tail_latency}초) ==")
+    print(f"{'mode':<10}{'p50_ms':>10}{'p95_ms':>10}{'p99_ms':>10}{'max_ms':>10}{'hedged':>8}{'local':>8}")
+    for name, mode in modes.items():
+        print(f"{name:<10}{mode['p50_ms']:>10.1f}{mode['p95_ms']:>10.1f}{mode['p99_ms']:>10.1f}{mode['max_ms']:>10.1f}"
+              f"{mode.get('hedged', 0):>8}{mode.get('local_requests', 0):>8}")
+
+    with open(args.output, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
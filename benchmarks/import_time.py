@@ -0,0 +1,64 @@
+"""aitimes_crawler 임포트 시간 벤치마크
+
+`python -X importtime`으로 새 인터프리터에서 모듈을 여러 번 임포트해 누적 임포트 시간의 중앙값을 측정합니다.
+예산(--budget-ms)을 넘거나 무거운 의존성(streamlit, openai, reportlab, pandas, markdown)이
+임포트 시점에 로드되면 종료 코드 1로 실패합니다.
+
+    python benchmarks/import_time.py --budget-ms 400
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 기능을 처음 사용할 때만 로드되어야 하는 모듈
+LAZY_MODULES = ('streamlit', 'openai', 'reportlab', 'pandas', 'markdown')
+
+
+def measure(module, runs):
+    """module의 누적 임포트 시간(ms) 목록과 로드된 최상위 모듈 집합 반환"""
+    timings = []
+    loaded = set()
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            _, cumulative, name = line.split('|')
+            name = name.strip()
+            loaded.add(name.split('.')[0])
+            if name == module:
+                timings.append(int(cumulative.strip()) / 1000)
+    return timings, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='aitimes_crawler')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=400)
+    args = parser.parse_args()
+
+    timings, loaded = measure(args.module, args.runs)
+    median_ms = statistics.median(timings)
+    print(f"{args.module}: 중앙값 {median_ms:.1f}ms (최소 {min(timings):.1f}ms, 최대 {max(timings):.1f}ms, {args.runs}회)")
+
+    failed = False
+    eager = sorted(set(LAZY_MODULES) & loaded)
+    if eager:
+        print(f"실패: 임포트 시점에 로드된 무거운 모듈: {', '.join(eager)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"실패: 임포트 시간이 예산 {args.budget_ms:.0f}ms를 초과했습니다.")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
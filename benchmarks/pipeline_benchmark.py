@@ -0,0 +1,214 @@
+"""크롤링 → 요약 → 저장 → 리포트 파이프라인 오프라인 벤치마크
+
+로컬 대역 서버(fixture_server.py)를 띄우고 단계별(crawl_news_list, crawl_news_feed, crawl_article_content,
+summarize_with_gpt, save_to_csv, create_pdf_report)과 전체(process_articles) 처리량/지연을 측정합니다.
+결과는 실행마다 한 줄씩 JSON Lines 파일에 추가되며, 같은 규모의 직전 결과와 비교해 변화율을 출력합니다.
+
+    python benchmarks/pipeline_benchmark.py --sizes 10 100 1000 --llm-latency 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, ROOT)
+
+from aitimes_crawler import AITimesCrawler  # noqa: E402
+from batch_summarizer import BatchSummarizer  # noqa: E402
+from fixture_server import FixtureServer  # noqa: E402
+
+FAKE_API_KEY = 'sk-fixture'
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def stage_result(wall_seconds, latencies=None, items=1):
+    """단계별 측정값 (벽시계 시간, 처리량, 항목별 지연 p50/p95)"""
+    latencies = latencies or [wall_seconds]
+    return {
+        'wall_s': round(wall_seconds, 4),
+        'items': items,
+        'throughput_per_s': round(items / wall_seconds, 2) if wall_seconds else None,
+        'p50_ms': round(statistics.median(latencies) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2)
+    }
+
+
+def timed_map(func, items, workers):
+    """func를 스레드 풀로 items에 적용하고 (벽시계 시간, 항목별 지연, 결과) 반환"""
+    def timed(item):
+        started = time.perf_counter()
+        result = func(item)
+        return time.perf_counter() - started, result
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outputs = list(pool.map(timed, items))
+    wall = time.perf_counter() - started
+    return wall, [latency for latency, _ in outputs], [result for _, result in outputs]
+
+
+def run_size(size, args):
+    """기사 size개 규모로 단계별 + 전체 파이프라인 측정"""
+    stages = {}
+    with tempfile.TemporaryDirectory() as workdir, \
+            FixtureServer(article_count=size, llm_latency=args.llm_latency, llm_jitter=args.llm_jitter,
+                          rate_limit_rpm=args.rate_limit_rpm, error_rate=args.error_rate) as server:
+        # 크롤러는 crawled_data/를 현재 디렉토리 기준으로 쓰므로 임시 디렉토리에서 실행
+        os.chdir(workdir)
+        news_list = server.news_list()
+
+        # 단계별 측정
+        os.makedirs('stages', exist_ok=True)
+        os.chdir('stages')
+        crawler = AITimesCrawler(base_url=server.base_url, openai_base_url=server.openai_base_url)
+
+        started = time.perf_counter()
+        crawler.crawl_news_list()
+        stages['crawl_news_list'] = stage_result(time.perf_counter() - started)
+
+        # 목록 페이지(20개씩) 페이지네이션 크롤링으로 size개 모두 수집
+        started = time.perf_counter()
+        feed = crawler.crawl_news_feed(max_pages=size, max_articles=size, delay=0, workers=args.fetch_workers)
+        stages['crawl_news_feed'] = stage_result(time.perf_counter() - started, items=len(feed))
+
+        wall, latencies, contents = timed_map(
+            lambda news: crawler.crawl_article_content(news['url']), news_list, args.fetch_workers)
+        stages['crawl_article_content'] = stage_result(wall, latencies, size)
+
+        wall, latencies, _ = timed_map(
+            lambda pair: crawler.summarize_with_gpt(pair[0]['title'], pair[1], FAKE_API_KEY),
+            list(zip(news_list, contents)), args.summary_workers)
+        stages['summarize_with_gpt'] = stage_result(wall, latencies, size)
+
+        if args.batch:
+            # Batch API 경로 (요약 캐시가 비어 있는 새 크롤러로 제출 → 완료까지 폴링)
+            os.chdir(workdir)
+            os.makedirs('batch', exist_ok=True)
+            os.chdir('batch')
+            batch_crawler = AITimesCrawler(base_url=server.base_url, openai_base_url=server.openai_base_url)
+            articles = [dict(news, content=content) for news, content in zip(news_list, contents)]
+
+            started = time.perf_counter()
+            summarizer = BatchSummarizer(batch_crawler, FAKE_API_KEY)
+            summarizer.wait(summarizer.submit(articles), interval=0.1)
+            stages['summarize_batch'] = stage_result(time.perf_counter() - started, items=size)
+
+        # 전체 파이프라인 (요약 캐시/조건부 요청 캐시가 비어 있는 새 크롤러)
+        os.chdir(workdir)
+        os.makedirs('end_to_end', exist_ok=True)
+        os.chdir('end_to_end')
+        crawler = AITimesCrawler(base_url=server.base_url, openai_base_url=server.openai_base_url)
+
+        started = time.perf_counter()
+        enhanced_news = crawler.process_articles(
+            news_list, FAKE_API_KEY,
+            fetch_workers=args.fetch_workers, summary_workers=args.summary_workers)
+        stages['process_articles'] = stage_result(time.perf_counter() - started, items=size)
+
+        started = time.perf_counter()
+        csv_file = crawler.save_to_csv(enhanced_news)
+        stages['save_to_csv'] = stage_result(time.perf_counter() - started, items=size)
+
+        if not args.skip_pdf:
+            started = time.perf_counter()
+            crawler.create_pdf_report(csv_file)
+            stages['create_pdf_report'] = stage_result(time.perf_counter() - started, items=size)
+
+        os.chdir(ROOT)
+        server_stats = dict(server.stats)
+
+    return {'stages': stages, 'server': server_stats}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_previous(output_path):
+    """규모별 직전 결과 (변화율 비교용)"""
+    previous = {}
+    if os.path.exists(output_path):
+        with open(output_path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    previous[record['size']] = record
+    return previous
+
+
+def print_report(record, previous):
+    print(f"\n== 기사 {record['size']}개 ==")
+    print(f"{'stage':<24}{'wall_s':>10}{'items/s':>10}{'p50_ms':>10}{'p95_ms':>10}{'Δwall':>9}")
+    for name, stage in record['stages'].items():
+        change = ''
+        if previous and name in previous['stages'] and previous['stages'][name]['wall_s']:
+            ratio = stage['wall_s'] / previous['stages'][name]['wall_s'] - 1
+            change = f"{ratio:+.0%}"
+        print(f"{name:<24}{stage['wall_s']:>10.3f}{stage['throughput_per_s'] or 0:>10.1f}"
+              f"{stage['p50_ms']:>10.1f}{stage['p95_ms']:>10.1f}{change:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--llm-latency', type=float, default=0.2, help="가짜 OpenAI 응답 지연(초)")
+    parser.add_argument('--llm-jitter', type=float, default=0.0, help="응답 지연에 더할 무작위 편차 상한(초)")
+    parser.add_argument('--rate-limit-rpm', type=int, default=0, help="가짜 OpenAI 분당 요청 한도 (넘으면 429, 0이면 제한 없음)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="가짜 OpenAI가 500 오류로 응답할 비율")
+    parser.add_argument('--fetch-workers', type=int, default=4)
+    parser.add_argument('--summary-workers', type=int, default=2)
+    parser.add_argument('--skip-pdf', action='store_true')
+    parser.add_argument('--batch', action='store_true', help="Batch API 요약 단계도 측정")
+    parser.add_argument('--output', default=os.path.join(BENCHMARK_DIR, 'results.jsonl'))
+    args = parser.parse_args()
+
+    previous = load_previous(args.output)
+    commit = git_commit()
+
+    for size in args.sizes:
+        result = run_size(size, args)
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': commit,
+            'python': platform.python_version(),
+            'size': size,
+            'params': {
+                'llm_latency': args.llm_latency,
+                'llm_jitter': args.llm_jitter,
+                'rate_limit_rpm': args.rate_limit_rpm,
+                'error_rate': args.error_rate,
+                'fetch_workers': args.fetch_workers,
+                'summary_workers': args.summary_workers
+            },
+            **result
+        }
+        print_report(record, previous.get(size))
+        with open(args.output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    print(f"\n결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+import difflib
+import hashlib
+import re
+import unicodedata
+
+from content_prep import clean_content
+
+_WHITESPACE = re.compile(r'\s+')
+
+# 문단 해시 길이 (16진수 16자 = 64비트, 기사 하나의 문단끼리 충돌할 일은 사실상 없음)
+PARAGRAPH_HASH_SIZE = 8
+
+
+def normalize_paragraphs(content):
+    """비교용 문단 목록 (바이라인/저작권 줄 제거, NFKC 정규화, 공백 정리)
+
+    띄어쓰기·전각 문자·기자 이름 줄만 바뀐 수정은 본문이 바뀐 것으로 보지 않습니다.
+    """
+    paragraphs = []
+    for line in clean_content(content).split('\n'):
+        line = _WHITESPACE.sub(' ', unicodedata.normalize('NFKC', line)).strip()
+        if line:
+            paragraphs.append(line)
+    return paragraphs
+
+
+def paragraph_hash(paragraph):
+    return hashlib.blake2b(paragraph.encode('utf-8'), digest_size=PARAGRAPH_HASH_SIZE).hexdigest()
+
+
+def fingerprint(content):
+    """본문 지문 (정규화한 전체 본문 해시, 문단별 해시 목록)"""
+    paragraphs = normalize_paragraphs(content)
+    content_hash = hashlib.sha256('\n'.join(paragraphs).encode('utf-8')).hexdigest()
+    return content_hash, [paragraph_hash(paragraph) for paragraph in paragraphs]
+
+
+def diff_content(old_content, new_content):
+    """두 본문의 문단 단위 차이 목록
+
+    문단 해시 열을 비교해 바뀐 구간만 {'op': replace|insert|delete, 'old': [시작, 끝], 'new': [시작, 끝],
+    'removed': [지운 문단], 'added': [추가한 문단]} 형태로 반환합니다. 같은 문단은 담지 않으므로
+    문단 몇 개만 고친 기사는 고친 문단만큼만 저장됩니다.
+    """
+    old_paragraphs = normalize_paragraphs(old_content)
+    new_paragraphs = normalize_paragraphs(new_content)
+    matcher = difflib.SequenceMatcher(None, [paragraph_hash(p) for p in old_paragraphs],
+                                      [paragraph_hash(p) for p in new_paragraphs], autojunk=False)
+    return [
+        {
+            'op': tag,
+            'old': [i1, i2],
+            'new': [j1, j2],
+            'removed': old_paragraphs[i1:i2],
+            'added': new_paragraphs[j1:j2]
+        }
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal'
+    ]
@@ -0,0 +1,97 @@
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# 본문 추출 시 함께 잡히는 기자 이름/저작권/관련기사/사진 설명 줄
+BOILERPLATE_PATTERNS = [
+    re.compile(r'^.{0,40}기자\s*[\w.+-]+@[\w.-]+$'),          # 홍길동 기자 gildong@aitimes.com
+    re.compile(r'^[\w.+-]+@[\w.-]+$'),                         # 이메일만 있는 줄
+    re.compile(r'^.{0,20}\s기자$'),                           # 홍길동 기자
+    re.compile(r'저작권자\s*©|무단\s*전재\s*및\s*재배포\s*금지|^copyright\s*©|all rights reserved', re.IGNORECASE),
+    re.compile(r'(등록번호|발행인|편집인|사업자\s*번호).*\||\|.*(등록번호|발행인|편집인|사업자\s*번호)'),  # 하단 회사 정보
+    re.compile(r'^\[?관련\s*기사\]?'),
+    re.compile(r'^▶'),
+    re.compile(r'^\((사진|이미지|그래픽|자료|출처)\s*=.{0,60}\)$')    # (사진=셔터스톡)
+]
+
+# 한글 등 비ASCII 문자는 대략 한 글자당 1토큰, ASCII는 4글자당 1토큰으로 어림
+_NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+_encoders = {}
+
+
+def _get_encoder(model):
+    """tiktoken 인코더 (설치되지 않았거나 인코딩 파일을 받을 수 없으면 None)"""
+    if model not in _encoders:
+        try:
+            import tiktoken
+            _encoders[model] = tiktoken.encoding_for_model(model)
+        except Exception as e:
+            logger.debug(f"tiktoken을 사용할 수 없어 토큰 수를 어림합니다: {str(e)}")
+            _encoders[model] = None
+    return _encoders[model]
+
+
+def count_tokens(text, model="gpt-4o-mini"):
+    """텍스트의 토큰 수 (tiktoken이 없으면 문자 종류로 어림)"""
+    if not text:
+        return 0
+    encoder = _get_encoder(model)
+    if encoder is not None:
+        return len(encoder.encode(text))
+    non_ascii = len(_NON_ASCII.findall(text))
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+def is_boilerplate(line):
+    return any(pattern.search(line) for pattern in BOILERPLATE_PATTERNS)
+
+
+def clean_content(content):
+    """기사 본문에서 빈 줄, 연속 중복 줄, 바이라인/저작권/관련기사/사진 설명 줄 제거"""
+    lines = []
+    for line in (content or '').split('\n'):
+        line = line.strip()
+        if not line or is_boilerplate(line) or (lines and lines[-1] == line):
+            continue
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def truncate_to_tokens(content, max_tokens, model="gpt-4o-mini"):
+    """문단 단위로 max_tokens까지만 남김 (첫 문단이 넘치면 글자 수 비율로 자름)"""
+    if count_tokens(content, model) <= max_tokens:
+        return content
+
+    kept = []
+    used = 0
+    for paragraph in content.split('\n'):
+        tokens = count_tokens(paragraph, model) + 1
+        if used + tokens > max_tokens:
+            if not kept:
+                kept.append(paragraph[:max(1, len(paragraph) * max_tokens // tokens)])
+            break
+        kept.append(paragraph)
+        used += tokens
+    return '\n'.join(kept)
+
+
+def split_chunks(content, chunk_tokens, model="gpt-4o-mini"):
+    """문단 경계를 지키며 chunk_tokens 이하 조각으로 나눔 (한 문단이 넘치면 그 문단만 잘라 넣음)"""
+    chunks = []
+    current = []
+    used = 0
+    for paragraph in content.split('\n'):
+        tokens = count_tokens(paragraph, model) + 1
+        if current and used + tokens > chunk_tokens:
+            chunks.append('\n'.join(current))
+            current, used = [], 0
+        if tokens > chunk_tokens:
+            paragraph = truncate_to_tokens(paragraph, chunk_tokens, model)
+            tokens = chunk_tokens
+        current.append(paragraph)
+        used += tokens
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
@@ -0,0 +1,88 @@
+import re
+import threading
+import zlib
+
+# 공백을 정리한 본문의 연속 5글자를 한 단위(shingle)로 비교
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+BANDS = 16
+# 추정 자카드 유사도가 이 값 이상이면 같은 기사로 묶음
+SIMILARITY_THRESHOLD = 0.8
+
+# 2^32보다 작은 가장 큰 소수 (32비트 해시 × 32비트 계수가 uint64 안에서 계산되도록)
+_PRIME = 4294967291
+_WHITESPACE = re.compile(r'\s+')
+
+
+class NearDuplicateIndex:
+    """MinHash + LSH 기반 유사 기사 인덱스
+
+    본문을 5글자 shingle 집합으로 바꿔 NUM_PERM개의 MinHash 서명을 만들고, 서명을 BANDS개 구간으로 나눈
+    버킷에 넣습니다. 같은 버킷에 걸린 후보만 서명으로 유사도를 추정하므로 기사가 많아져도 전체를 비교하지 않습니다.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, num_perm=NUM_PERM, bands=BANDS, seed=1):
+        import numpy as np
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm, dtype=np.uint64)
+        self._signatures = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def signature(self, text):
+        """본문의 MinHash 서명 (본문이 shingle 하나보다 짧으면 None)"""
+        import numpy as np
+
+        text = _WHITESPACE.sub(' ', text or '').strip()
+        shingles = {zlib.crc32(text[i:i + SHINGLE_SIZE].encode('utf-8'))
+                    for i in range(len(text) - SHINGLE_SIZE + 1)}
+        if not shingles:
+            return None
+        # (a·x + b) mod p 해시 함수 NUM_PERM개를 한 번에 적용
+        values = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        hashed = (values[:, None] * self._a[None, :] + self._b[None, :]) % np.uint64(_PRIME)
+        return hashed.min(axis=0)
+
+    def _band_keys(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def find(self, text, signature=None):
+        """이미 등록된 기사 중 가장 비슷한 기사 키 (threshold 미만이면 None)"""
+        signature = self.signature(text) if signature is None else signature
+        if signature is None:
+            return None
+
+        with self._lock:
+            candidates = set()
+            for band_key in self._band_keys(signature):
+                candidates.update(self._buckets.get(band_key, ()))
+            best_key, best_similarity = None, self.threshold
+            for key in candidates:
+                similarity = float((self._signatures[key] == signature).mean())
+                if similarity >= best_similarity:
+                    best_key, best_similarity = key, similarity
+        return best_key
+
+    def add(self, key, text, signature=None):
+        """기사를 인덱스에 등록"""
+        signature = self.signature(text) if signature is None else signature
+        if signature is None:
+            return
+        with self._lock:
+            self._signatures[key] = signature
+            for band_key in self._band_keys(signature):
+                self._buckets.setdefault(band_key, []).append(key)
+
+    def find_or_add(self, key, text):
+        """비슷한 기사가 있으면 그 키를, 없으면 key로 등록하고 None 반환"""
+        signature = self.signature(text)
+        match = self.find(text, signature)
+        if match is None:
+            self.add(key, text, signature)
+        return match
@@ -0,0 +1,71 @@
+import csv
+import json
+import os
+import sys
+
+# CSV로 내보낼 때의 열 순서
+CSV_COLUMNS = ['rank', 'title', 'url', 'content', 'summary', 'summary_data', 'crawl_time', 'duplicate_of']
+
+# 기간 내보내기는 여러 실행의 행이 섞이므로 실행 ID를 앞에 붙임
+HISTORY_CSV_COLUMNS = ['run_id'] + CSV_COLUMNS
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+# 긴 본문이 기본 필드 크기 제한(128KB)을 넘어도 읽을 수 있도록
+csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+
+def _atomic_write(path, write):
+    """임시 파일에 쓴 뒤 교체 (쓰는 도중의 파일을 다운로드하거나 읽지 않도록)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8-sig' if path.endswith('.csv') else 'utf-8', newline='') as f:
+            count = write(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return count
+
+
+def write_csv(path, articles, columns=CSV_COLUMNS):
+    """기사 행을 하나씩 CSV로 쓰고 쓴 행 수 반환 (구조화 요약은 JSON 문자열 열, 없는 값은 빈 칸)"""
+    def write(f):
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore', lineterminator='\n')
+        writer.writeheader()
+        count = 0
+        for article in articles:
+            if article.get('summary_data'):
+                article = dict(article, summary_data=json.dumps(article['summary_data'], ensure_ascii=False))
+            writer.writerow(article)
+            count += 1
+        return count
+
+    return _atomic_write(path, write)
+
+
+def write_jsonl(path, articles):
+    """기사 행을 한 줄에 하나씩 JSON으로 쓰고 쓴 행 수 반환"""
+    def write(f):
+        count = 0
+        for article in articles:
+            f.write(json.dumps(article, ensure_ascii=False))
+            f.write('\n')
+            count += 1
+        return count
+
+    return _atomic_write(path, write)
+
+
+def read_csv_rows(path, skip_columns=()):
+    """CSV 행을 딕셔너리로 하나씩 생성 (빈 칸은 None, skip_columns 열은 버림)"""
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            yield {key: value if value != '' else None for key, value in row.items() if key not in skip_columns}
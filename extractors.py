@@ -0,0 +1,190 @@
+from bs4 import BeautifulSoup, SoupStrainer
+
+# 기사 본문 컨테이너 후보 (기본 시도 순서)
+CONTENT_SELECTORS = [
+    'div.news-content',
+    'div.article-content',
+    'div.view-content',
+    'div#article-content',
+    'div.content'
+]
+
+
+def _parse_selector(selector):
+    """'div.class' / 'div#id' 형태의 선택자를 (태그, 속성, 값)으로 분해"""
+    if '#' in selector:
+        tag, value = selector.split('#', 1)
+        return tag, 'id', value
+    tag, value = selector.split('.', 1)
+    return tag, 'class', value
+
+
+_CONTAINER_RULES = [_parse_selector(s) for s in CONTENT_SELECTORS]
+
+
+def _is_content_container(tag, attrs=None):
+    """SoupStrainer용 필터: 본문 컨테이너 후보 태그인지 확인
+
+    bs4 4.13 이상은 태그 생성 전에 이름만, 생성 후 Tag 객체를 넘기고, 그 이전 버전은 (태그 이름, 속성)을 넘깁니다.
+    """
+    if attrs is None:
+        if isinstance(tag, str):
+            return any(tag == name for name, _, _ in _CONTAINER_RULES)
+        tag, attrs = tag.name, tag.attrs
+    attrs = dict(attrs)
+    for name, attr, value in _CONTAINER_RULES:
+        if tag != name:
+            continue
+        attr_value = attrs.get(attr) or ''
+        values = attr_value.split() if isinstance(attr_value, str) else attr_value
+        if value in values:
+            return True
+    return False
+
+
+class BaseExtractor:
+    """기사 HTML에서 본문 문단을 추출하는 엔진의 공통 인터페이스
+
+    하위 클래스는 _find_container(문서, 선택자)와 _paragraph_texts(노드)를 구현합니다.
+    CONTENT_SELECTORS 순서로 처음 매칭된 컨테이너의 p 태그를 사용하고, 없으면 문서 전체의 p 태그로 대체합니다.
+    (선택자 하나를 찾는 데 수 μs라 호스트별로 순서를 바꿔도 이득이 없고, 선택자가 중첩된 페이지에서는
+    결과가 크롤링 순서에 따라 달라지므로 순서는 고정)
+    """
+
+    name = 'base'
+
+    def extract(self, html, url=None):
+        """본문 텍스트 반환 (문단은 줄바꿈으로 구분)"""
+        document = self._parse(html)
+
+        content = ""
+        for selector in CONTENT_SELECTORS:
+            container = self._find_container(document, selector)
+            if container is not None:
+                content = '\n'.join(self._paragraph_texts(container))
+                break
+
+        # 위 방법으로 찾지 못한 경우, 모든 p 태그 시도
+        if not content:
+            content = '\n'.join(self._paragraph_texts(self._parse_full(html, document)))
+
+        return content.strip()
+
+    def _parse(self, html):
+        raise NotImplementedError
+
+    def _parse_full(self, html, document):
+        """본문 컨테이너를 찾지 못했을 때 사용할 전체 문서 (기본: _parse 결과 재사용)"""
+        return document
+
+    def _find_container(self, document, selector):
+        raise NotImplementedError
+
+    def _paragraph_texts(self, node):
+        raise NotImplementedError
+
+
+class SoupExtractor(BaseExtractor):
+    """BeautifulSoup 기반 추출기
+
+    partial=True이면 SoupStrainer로 본문 컨테이너 후보 div만 트리로 만들고,
+    컨테이너가 없을 때만 전체 문서를 다시 파싱합니다. aitimes 기사는 컨테이너 후보가 없어 대부분 두 번 파싱하게 되므로
+    (벤치마크 코퍼스에서 부분 파싱 253 vs 전체 파싱 285 페이지/초) 기본값은 전체 파싱입니다.
+    """
+
+    name = 'soup'
+
+    def __init__(self, parser='html.parser', partial=False):
+        self.parser = parser
+        self.partial = partial
+
+        self._strainer = SoupStrainer(_is_content_container) if partial else None
+
+    def _parse(self, html):
+        return BeautifulSoup(html, self.parser, parse_only=self._strainer)
+
+    def _parse_full(self, html, document):
+        if self.partial:
+            return BeautifulSoup(html, self.parser)
+        return document
+
+    def _find_container(self, document, selector):
+        return document.select_one(selector)
+
+    def _paragraph_texts(self, node):
+        texts = (p.get_text(strip=True) for p in node.find_all('p'))
+        return [text for text in texts if text]
+
+
+class LxmlExtractor(BaseExtractor):
+    """lxml 기반 추출기 (C 파서 + 미리 컴파일한 XPath)"""
+
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+
+        self._fromstring = lxml.html.fromstring
+        self._xpaths = {}
+        for selector in CONTENT_SELECTORS:
+            tag, attr, value = _parse_selector(selector)
+            if attr == 'id':
+                expression = f"(//{tag}[@id='{value}'])[1]"
+            else:
+                expression = f"(//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {value} ')])[1]"
+            self._xpaths[selector] = etree.XPath(expression)
+        self._paragraphs = etree.XPath('.//p')
+
+    def _parse(self, html):
+        return self._fromstring(html)
+
+    def _find_container(self, document, selector):
+        matches = self._xpaths[selector](document)
+        return matches[0] if matches else None
+
+    def _paragraph_texts(self, node):
+        # BeautifulSoup의 get_text(strip=True)와 같이 텍스트 노드별로 공백을 제거해 이어붙임
+        texts = (''.join(t.strip() for t in p.itertext()) for p in self._paragraphs(node))
+        return [text for text in texts if text]
+
+
+class SelectolaxExtractor(BaseExtractor):
+    """selectolax(Lexbor) 기반 추출기"""
+
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+
+        self._parser_class = LexborHTMLParser
+
+    def _parse(self, html):
+        return self._parser_class(html)
+
+    def _find_container(self, document, selector):
+        return document.css_first(selector)
+
+    def _paragraph_texts(self, node):
+        texts = (p.text(deep=True, separator='', strip=True) for p in node.css('p'))
+        return [text for text in texts if text]
+
+
+EXTRACTORS = {
+    'selectolax': SelectolaxExtractor,
+    'lxml': LxmlExtractor,
+    'soup': SoupExtractor
+}
+
+
+def get_extractor(name='auto'):
+    """이름으로 추출기 생성 ('auto'는 설치된 가장 빠른 엔진 선택: selectolax → lxml → soup)"""
+    if name != 'auto':
+        return EXTRACTORS[name]()
+
+    for extractor_class in EXTRACTORS.values():
+        try:
+            return extractor_class()
+        except ImportError:
+            continue
+    return SoupExtractor()
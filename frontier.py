@@ -0,0 +1,193 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from urllib.parse import urljoin, urlparse, parse_qsl, urlencode, urlunparse
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from article_index import ArticleIndex
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_PATH = '/news/articleView.html'
+LIST_PATH = '/news/articleList.html'
+
+# 목록 페이지 URL에서 남길 쿼리 파라미터 (정렬/추적용 파라미터는 버려 같은 페이지를 한 번만 방문)
+LIST_PARAMS = ('sc_section_code', 'sc_sub_section_code', 'sc_serial_code', 'view_type', 'page')
+
+# 섹션을 지정하지 않으면 전체 기사 목록부터 크롤링
+DEFAULT_SECTIONS = (None,)
+
+
+def normalize_url(href, base_url):
+    """상대 경로를 절대 URL로 바꾸고 기사/목록 페이지면 필요한 파라미터만 정렬해 남김
+
+    기사 URL은 idxno만, 목록 URL은 LIST_PARAMS만 남기며 page=1은 생략합니다.
+    aitimes 기사/목록 페이지가 아니거나 다른 호스트면 None을 반환합니다.
+    """
+    parsed = urlparse(urljoin(base_url, href.strip()))
+    if parsed.scheme not in ('http', 'https') or parsed.netloc.lower() != urlparse(base_url).netloc.lower():
+        return None
+
+    query = dict(parse_qsl(parsed.query))
+    if parsed.path == ARTICLE_PATH:
+        if not query.get('idxno'):
+            return None
+        query = {'idxno': query['idxno']}
+    elif parsed.path == LIST_PATH:
+        query = {key: value for key, value in query.items() if key in LIST_PARAMS and value}
+        if query.get('page') == '1':
+            del query['page']
+    else:
+        return None
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path, '', urlencode(sorted(query.items())), ''))
+
+
+def list_key(url):
+    """페이지 번호를 뺀 목록 식별자 (같은 목록의 다른 페이지인지 확인용)"""
+    query = [(key, value) for key, value in parse_qsl(urlparse(url).query) if key != 'page']
+    return urlparse(url).path, tuple(query)
+
+
+def page_number(url):
+    try:
+        return int(dict(parse_qsl(urlparse(url).query)).get('page', 1))
+    except ValueError:
+        return 1
+
+
+class HostThrottle:
+    """호스트별 최소 요청 간격 유지
+
+    요청마다 다음 빈 시각을 예약하고 그때까지 기다리므로, 여러 스레드가 동시에 요청해도 같은 호스트에는
+    delay초에 한 번씩만 요청이 시작됩니다. (응답 대기는 겹칠 수 있음)
+    """
+
+    def __init__(self, delay):
+        self.delay = delay
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if self.delay <= 0:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class FrontierCrawler:
+    """섹션/목록 페이지를 페이지네이션을 따라가며 기사 목록을 모으는 프론티어 크롤러
+
+    시작 목록 페이지들에서 출발해 목록 페이지 링크(다음 페이지, 다른 섹션)를 너비 우선으로 따라갑니다.
+    방문할 URL은 정규화 후 집합으로 중복을 제거하고, 기사는 idxno 기준으로 한 번만 모읍니다.
+    max_depth는 시작 목록에서 다른 섹션 목록으로 넘어간 횟수(같은 목록의 페이지 이동은 세지 않음),
+    max_pages는 목록별 page 번호 상한, max_articles는 모을 기사 수 상한입니다.
+    """
+
+    def __init__(self, crawler, sections=DEFAULT_SECTIONS, max_depth=1, max_pages=10, max_articles=500,
+                 delay=0.5, workers=4):
+        self.crawler = crawler
+        self.sections = sections
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.max_articles = max_articles
+        self.workers = workers
+        self.throttle = HostThrottle(delay)
+        self._strainer = SoupStrainer('a', href=True)
+
+    def seed_urls(self):
+        urls = []
+        for section in self.sections:
+            query = {'view_type': 'sm'}
+            if section:
+                query['sc_section_code'] = section
+            urls.append(normalize_url(f"{LIST_PATH}?{urlencode(query)}", self.crawler.main_url))
+        return urls
+
+    def parse_list_page(self, html, page_url):
+        """목록 페이지에서 (기사 URL, 제목) 목록과 목록 페이지 URL 목록 추출"""
+        soup = BeautifulSoup(html, 'html.parser', parse_only=self._strainer)
+        articles = {}
+        list_urls = []
+        for link in soup.find_all('a'):
+            url = normalize_url(link['href'], page_url)
+            if url is None:
+                continue
+            if urlparse(url).path == ARTICLE_PATH:
+                # 같은 기사에 사진 링크(제목 없음)와 제목 링크가 함께 있으므로 가장 긴 텍스트를 제목으로 사용
+                title = link.get_text(strip=True)
+                if len(title) > len(articles.get(url, '')):
+                    articles[url] = title
+                else:
+                    articles.setdefault(url, '')
+            else:
+                list_urls.append(url)
+        return [(url, title) for url, title in articles.items() if title], list_urls
+
+    def _visit(self, url):
+        self.throttle.wait(url)
+        html = self.crawler._fetch(url)
+        with self.crawler.metrics.timer('parse_seconds', page='list'):
+            return self.parse_list_page(html, url)
+
+    def crawl(self):
+        """기사 목록을 crawl_news_list와 같은 형식(rank, title, url, crawl_time)으로 반환 (발견 순서)"""
+        crawl_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        frontier = deque((url, 0) for url in self.seed_urls())
+        seen_pages = {url for url, _ in frontier}
+        seen_articles = set()
+        news_data = []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            running = {}
+            while (frontier or running) and len(news_data) < self.max_articles:
+                # 동시 요청 수를 workers로 제한하며 프론티어에서 꺼내 요청
+                while frontier and len(running) < self.workers:
+                    url, depth = frontier.popleft()
+                    running[pool.submit(self._visit, url)] = (url, depth)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, depth = running.pop(future)
+                    try:
+                        articles, list_urls = future.result()
+                    except Exception as e:
+                        logger.warning(f"목록 페이지 크롤링 실패 ({url}): {str(e)}")
+                        self.crawler.metrics.inc('failures_total', stage='crawl_list_page')
+                        continue
+
+                    for article_url, title in articles:
+                        article_id = ArticleIndex.article_id_from_url(article_url)
+                        if article_id in seen_articles or len(news_data) >= self.max_articles:
+                            continue
+                        seen_articles.add(article_id)
+                        news_data.append({
+                            'rank': str(len(news_data) + 1),
+                            'title': title,
+                            'url': article_url,
+                            'crawl_time': crawl_time
+                        })
+
+                    key = list_key(url)
+                    for list_url in list_urls:
+                        if list_url in seen_pages or page_number(list_url) > self.max_pages:
+                            continue
+                        next_depth = depth if list_key(list_url) == key else depth + 1
+                        if next_depth <= self.max_depth:
+                            seen_pages.add(list_url)
+                            frontier.append((list_url, next_depth))
+
+            # 기사 수 상한에 도달하면 남은 요청은 결과를 기다리지 않음
+            for future in running:
+                future.cancel()
+
+        logger.info(f"피드 크롤링 완료: 목록 페이지 {len(seen_pages)}개 발견, 기사 {len(news_data)}개")
+        return news_data
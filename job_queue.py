@@ -0,0 +1,336 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from article_index import ArticleIndex
+
+logger = logging.getLogger(__name__)
+
+# 이 시간(초) 동안 진행 기록이 없는 작업은 작업자가 사라진 것으로 보고 실패 처리
+STALE_AFTER = 600
+
+
+class JobQueue:
+    """SQLite(WAL) 기반 요약 작업 큐
+
+    여러 Streamlit 세션(과 같은 파일을 여는 다른 프로세스)이 작업 상태와 결과(run_id)를 함께 봅니다.
+    같은 기사 목록의 작업이 대기/실행 중이면 새로 만들지 않고 그 작업 ID를 돌려주므로,
+    여러 사용자가 동시에 눌러도 크롤링/요약은 한 번만 실행됩니다.
+    """
+
+    def __init__(self, db_path=os.path.join("crawled_data", "jobs.db"), stale_after=STALE_AFTER):
+        self.db_path = db_path
+        self.stale_after = stale_after
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                job_key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                params TEXT NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 0,
+                total INTEGER NOT NULL DEFAULT 0,
+                run_id INTEGER,
+                result TEXT,
+                error TEXT,
+                worker TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                finished_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, job_id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_key ON jobs (job_key, status);
+        """)
+
+    @staticmethod
+    def _now():
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    @staticmethod
+    def make_key(kind, params):
+        """같은 작업인지 판단하는 키 (params는 결과에 영향을 주는 값만 넣음)"""
+        data = json.dumps([kind, params], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _to_dict(row):
+        if row is None:
+            return None
+        job = dict(row)
+        job['params'] = json.loads(job['params'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def _expire_stale(self):
+        """진행 기록이 오래된 대기/실행 작업을 실패로 표시 (작업자 프로세스가 종료된 경우)"""
+        cutoff = (datetime.now() - timedelta(seconds=self.stale_after)).strftime("%Y-%m-%d %H:%M:%S")
+        self._conn.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? "
+            "WHERE status IN ('queued', 'running') AND updated_at < ?",
+            ("작업자가 응답하지 않아 중단되었습니다. 다시 실행해주세요.", self._now(), cutoff)
+        )
+
+    def submit(self, kind, params, key_params):
+        """작업을 추가하고 (job_id, 새로 만들었는지) 반환
+
+        key_params가 같은 작업이 대기/실행 중이면 그 작업을 그대로 반환합니다.
+        """
+        job_key = self.make_key(kind, key_params)
+        now = self._now()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._expire_stale()
+                row = self._conn.execute(
+                    "SELECT job_id FROM jobs WHERE job_key = ? AND status IN ('queued', 'running') "
+                    "ORDER BY job_id LIMIT 1",
+                    (job_key,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute("COMMIT")
+                    return row['job_id'], False
+                cursor = self._conn.execute(
+                    "INSERT INTO jobs (kind, job_key, status, params, created_at, updated_at) "
+                    "VALUES (?, ?, 'queued', ?, ?, ?)",
+                    (kind, job_key, json.dumps(params, ensure_ascii=False), now, now)
+                )
+                self._conn.execute("COMMIT")
+                return cursor.lastrowid, True
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def claim(self, worker, job_ids):
+        """job_ids 중 가장 오래된 대기 작업 하나를 running으로 바꿔 반환 (없으면 None)"""
+        if not job_ids:
+            return None
+        placeholders = ','.join('?' * len(job_ids))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._expire_stale()
+                row = self._conn.execute(
+                    f"SELECT job_id FROM jobs WHERE status = 'queued' AND job_id IN ({placeholders}) "
+                    "ORDER BY job_id LIMIT 1",
+                    list(job_ids)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'running', worker = ?, updated_at = ? WHERE job_id = ?",
+                    (worker, self._now(), row['job_id'])
+                )
+                job = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (row['job_id'],)).fetchone()
+                self._conn.execute("COMMIT")
+                return self._to_dict(job)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def queued_ids(self, job_ids):
+        """job_ids 중 아직 대기 중인 작업 ID 집합"""
+        if not job_ids:
+            return set()
+        placeholders = ','.join('?' * len(job_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT job_id FROM jobs WHERE status = 'queued' AND job_id IN ({placeholders})", list(job_ids)
+            ).fetchall()
+        return {row['job_id'] for row in rows}
+
+    def progress(self, job_id, completed, total):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET completed = ?, total = ?, updated_at = ? WHERE job_id = ?",
+                (completed, total, self._now(), job_id)
+            )
+
+    def finish(self, job_id, run_id, result=None):
+        now = self._now()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'done', run_id = ?, result = ?, updated_at = ?, finished_at = ? "
+                "WHERE job_id = ?",
+                (run_id, json.dumps(result, ensure_ascii=False) if result is not None else None, now, now, job_id)
+            )
+
+    def fail(self, job_id, error):
+        now = self._now()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, updated_at = ?, finished_at = ? WHERE job_id = ?",
+                (error, now, now, job_id)
+            )
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_dict(row)
+
+    def latest_done(self, kind=None):
+        """가장 최근에 끝난 성공 작업 (세션마다 결과를 다시 만들지 않고 공유하기 위함)"""
+        query = "SELECT * FROM jobs WHERE status = 'done'"
+        params = []
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        with self._lock:
+            row = self._conn.execute(query + " ORDER BY finished_at DESC, job_id DESC LIMIT 1", params).fetchone()
+        return self._to_dict(row)
+
+    def list_jobs(self, limit=20):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM jobs ORDER BY job_id DESC LIMIT ?", (limit,)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+
+class JobRunner:
+    """작업 큐의 요약 작업을 백그라운드 스레드에서 실행
+
+    API 키는 DB에 저장하지 않고 이 프로세스 메모리에만 두므로, 작업은 키를 받은 프로세스의 작업자만 가져갑니다.
+    재시작 전 프로세스나 다른 프로세스가 만든 대기 작업에 합류하면 합류한 세션의 키를 넘겨받아 이 프로세스에서도
+    가져갈 수 있게 하고, 먼저 가져간 작업자가 실행합니다.
+    스트리밍 작업의 토큰은 live()로 읽을 수 있도록 메모리에 모으며, 작업 스레드는 Streamlit API를 호출하지 않습니다.
+    """
+
+    def __init__(self, crawler, queue, workers=1, poll_interval=1.0):
+        self.crawler = crawler
+        self.queue = queue
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.name = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._secrets = {}
+        self._live = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def submit_summarize(self, news_list, api_key, fetch_workers=4, summary_workers=2, incremental=True, stream=False):
+        """기사 목록 요약 작업 제출 후 (job_id, 새로 만들었는지) 반환
+
+        같은 기사 목록(URL/제목)과 증분 설정의 작업이 이미 대기/실행 중이면 그 작업에 합류합니다.
+        합류한 작업이 대기 중인데 이 프로세스에 키가 없으면(작업을 만든 프로세스가 재시작/종료된 경우 등)
+        api_key로 넘겨받아 이 프로세스의 작업자도 실행할 수 있게 합니다.
+        """
+        params = {
+            'news_list': news_list,
+            'fetch_workers': fetch_workers,
+            'summary_workers': summary_workers,
+            'incremental': incremental,
+            'stream': stream
+        }
+        key_params = {
+            'articles': [(news['url'], news['title']) for news in news_list],
+            'incremental': incremental
+        }
+        job_id, created = self.queue.submit('summarize', params, key_params)
+        with self._lock:
+            held = job_id in self._secrets
+        if created or (not held and self.queue.queued_ids([job_id])):
+            with self._lock:
+                self._secrets[job_id] = api_key
+            self._wake.set()
+        return job_id, created
+
+    def live(self, job_id):
+        """스트리밍 중인 기사별 요약 텍스트와 통계 ({'texts': {인덱스: 텍스트}, 'stats': {...}, 'done': set})"""
+        with self._lock:
+            state = self._live.get(job_id)
+            if state is None:
+                return None
+            return {'texts': dict(state['texts']), 'stats': dict(state['stats']), 'done': set(state['done'])}
+
+    def _work(self):
+        while True:
+            with self._lock:
+                job_ids = list(self._secrets)
+            job = None
+            try:
+                job = self.queue.claim(self.name, job_ids)
+            except Exception as e:
+                logger.warning(f"작업 가져오기 실패: {str(e)}")
+            if job is None:
+                # 다른 프로세스가 먼저 가져간(또는 실패 처리된) 작업의 키는 버림
+                try:
+                    gone = set(job_ids) - self.queue.queued_ids(job_ids)
+                except Exception as e:
+                    logger.warning(f"대기 작업 확인 실패: {str(e)}")
+                    gone = set()
+                with self._lock:
+                    for job_id in gone:
+                        self._secrets.pop(job_id, None)
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+
+            with self._lock:
+                api_key = self._secrets.pop(job['job_id'], None)
+            try:
+                run_id, result = self._run_summarize(job, api_key)
+                if run_id is None:
+                    raise RuntimeError("실행 결과를 저장하지 못했습니다.")
+                self.queue.finish(job['job_id'], run_id, result)
+            except Exception as e:
+                logger.error(f"작업 {job['job_id']} 실행 중 오류: {str(e)}")
+                self.queue.fail(job['job_id'], str(e))
+            finally:
+                with self._lock:
+                    self._live.pop(job['job_id'], None)
+
+    def _run_summarize(self, job, api_key):
+        """본문 크롤링 + 요약 후 저장소에 실행을 추가하고 (run_id, 결과 부가 정보) 반환"""
+        params = job['params']
+        news_list = params['news_list']
+        total = len(news_list)
+        job_id = job['job_id']
+        self.queue.progress(job_id, 0, total)
+
+        state = {'texts': {}, 'stats': {}, 'done': set()}
+        with self._lock:
+            self._live[job_id] = state
+
+        enhanced_news = [None] * total
+        completed = 0
+        for kind, i, payload in self.crawler.iter_articles(
+                news_list, api_key, params['fetch_workers'], params['summary_workers'],
+                incremental=params['incremental'], stream=params['stream']):
+            with self._lock:
+                if kind == 'chunk':
+                    state['texts'][i] = state['texts'].get(i, '') + payload
+                elif kind == 'stats':
+                    state['stats'][i] = payload
+                else:
+                    state['done'].add(i)
+            if kind == 'done':
+                enhanced_news[i] = payload
+                completed += 1
+                self.queue.progress(job_id, completed, total)
+
+        run_id = self.crawler.save_run(enhanced_news)
+        # 저장된 실행은 같은 기사 ID를 한 번만 담아 순서가 기사 목록과 달라지므로, 스트리밍 통계는 기사 ID로 저장
+        # (같은 기사가 URL만 달리해 여러 번 있으면 저장되는 처음 것의 통계)
+        stream_stats = {}
+        for i in sorted(state['stats']):
+            stream_stats.setdefault(ArticleIndex.article_id_from_url(news_list[i]['url']), state['stats'][i])
+        return run_id, {'stream_stats': stream_stats}
@@ -0,0 +1,388 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from types import SimpleNamespace
+
+from content_prep import count_tokens
+from rate_limiter import OpenAIRateLimiter, DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_TOKENS_PER_MINUTE
+from summary_schema import SUMMARY_SECTIONS, PAIR_KEYS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPENAI_MODEL = "gpt-4o-mini"  # gpt-4.1-mini가 아직 없으므로 gpt-4o-mini 사용
+
+# llama.cpp server 기본 주소 (vLLM은 http://localhost:8000/v1, Ollama는 http://localhost:11434/v1)
+DEFAULT_LOCAL_BASE_URL = "http://localhost:8080/v1"
+DEFAULT_LOCAL_MODEL = "local"
+
+# 로컬 서버는 분당 한도가 없으므로 토큰 버킷이 사실상 막지 않도록 큰 값을 쓰고 동시 요청 수로만 제한
+LOCAL_PER_MINUTE = 10 ** 9
+
+BACKEND_KINDS = ('openai', 'local', 'fake')
+
+# 주 백엔드 지연의 이 분위수를 넘기면 보조 백엔드에도 요청
+DEFAULT_HEDGE_QUANTILE = 0.95
+# 지연 표본이 HEDGE_MIN_SAMPLES개 모이기 전까지 쓰는 기한(초)
+DEFAULT_HEDGE_DELAY = 10.0
+HEDGE_MIN_SAMPLES = 20
+HEDGE_WINDOW = 200
+
+
+class LLMBackend:
+    """chat completions 요청을 처리하는 백엔드 공통 인터페이스
+
+    complete(request, api_key)는 응답(choices[0].message.content, usage)을, stream(request, api_key)은
+    청크(choices[0].delta.content, usage) 생성기를 반환합니다. 요청 본문의 model은 백엔드의 model로 바뀝니다.
+    complete_with_model/stream_with_model은 결과와 함께 실제로 답한 백엔드의 모델을 반환합니다. (요약 캐시 키용)
+    """
+
+    name = 'llm'
+    model = None
+    rate_limiter = None
+
+    @property
+    def requires_api_key(self):
+        """호출할 때 OpenAI API 키를 받아야 하는지"""
+        return False
+
+    def complete(self, request, api_key=None):
+        raise NotImplementedError
+
+    def stream(self, request, api_key=None):
+        raise NotImplementedError
+
+    def complete_with_model(self, request, api_key=None):
+        """(응답, 답한 백엔드의 모델)"""
+        return self.complete(request, api_key), self.model
+
+    def stream_with_model(self, request, api_key=None):
+        """(청크 생성기, 답한 백엔드의 모델)"""
+        return self.stream(request, api_key), self.model
+
+    def backends(self):
+        """실제로 요청을 보내는 백엔드 목록 (지표/통계용)"""
+        return [self]
+
+    def stats(self):
+        return {'backend': self.name, 'model': self.model}
+
+
+class OpenAIBackend(LLMBackend):
+    """OpenAI 또는 OpenAI 호환 서버(llama.cpp server, vLLM, Ollama 등)의 chat completions 백엔드
+
+    API 키별 클라이언트를 한 번만 만들어 재사용하고, 백엔드마다 따로 둔 OpenAIRateLimiter로
+    RPM/TPM 한도와 동시 요청 수를 지킵니다. (재시도는 SDK 대신 제한기가 맡음)
+    api_key를 지정하면 그 키를, 아니면 호출할 때 받은 키를 씁니다.
+    """
+
+    def __init__(self, name='openai', model=DEFAULT_OPENAI_MODEL, base_url=None, api_key=None,
+                 requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE,
+                 max_concurrency=8):
+        self.name = name
+        self.model = model
+        # None이면 OpenAI 기본 엔드포인트
+        self.base_url = base_url
+        self.api_key = api_key
+        self.rate_limiter = OpenAIRateLimiter(requests_per_minute, tokens_per_minute, max_concurrency=max_concurrency)
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    @property
+    def requires_api_key(self):
+        return self.api_key is None
+
+    def client(self, api_key=None):
+        """API 키별 OpenAI 클라이언트를 재사용 (매 호출마다 새 커넥션을 만들지 않도록)"""
+        api_key = self.api_key or api_key
+        if not api_key:
+            raise ValueError("OpenAI API 키가 없습니다.")
+        with self._lock:
+            client = self._clients.get(api_key)
+            if client is None:
+                from openai import OpenAI
+                client = OpenAI(api_key=api_key, base_url=self.base_url, max_retries=0)
+                self._clients[api_key] = client
+            return client
+
+    def _call(self, request, api_key, stream=False):
+        request = dict(request, model=self.model)
+        tokens = sum(count_tokens(message['content'], self.model) for message in request['messages'])
+        tokens += request.get('max_tokens', 0)
+        client = self.client(api_key)
+        create = lambda: client.chat.completions.with_raw_response.create(**request)
+        return self.rate_limiter.call(create, tokens, stream=stream)
+
+    def complete(self, request, api_key=None):
+        return self._call(request, api_key)
+
+    def stream(self, request, api_key=None):
+        return self._call(dict(request, stream=True, stream_options={"include_usage": True}), api_key, stream=True)
+
+    def stats(self):
+        return dict(self.rate_limiter.stats(), backend=self.name, model=self.model)
+
+
+def fake_completion_text(request):
+    """요청 내용만으로 정해지는 가짜 응답 (구조화 출력 요청이면 SUMMARY_SCHEMA를 따르는 JSON)"""
+    prompt = request['messages'][-1]['content']
+    digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8]
+    if (request.get('response_format') or {}).get('type') != 'json_schema':
+        return f"- 가짜 메모 {digest}"
+
+    data = {}
+    for key, _, label, kind in SUMMARY_SECTIONS:
+        if kind == 'text':
+            data[key] = f"{label} ({digest})"
+        elif kind == 'list':
+            data[key] = [f"{label} {i} ({digest})" for i in range(1, 4)]
+        else:
+            first, second = PAIR_KEYS[key]
+            data[key] = [{first: f"{label} ({digest})", second: digest}]
+    return json.dumps(data, ensure_ascii=False)
+
+
+class FakeBackend(LLMBackend):
+    """네트워크 없이 요청 내용으로 정해지는 응답을 돌려주는 백엔드 (오프라인 실행/벤치마크용)
+
+    latency초 뒤에 응답하며, 스트리밍은 응답을 몇 글자씩 나눠 보냅니다.
+    """
+
+    def __init__(self, name='fake', model='fake', latency=0.0, max_concurrency=8):
+        self.name = name
+        self.model = model
+        self.latency = latency
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._requests = 0
+        self._lock = threading.Lock()
+
+    def _respond(self, request):
+        with self._lock:
+            self._requests += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+        text = fake_completion_text(request)
+        usage = SimpleNamespace(prompt_tokens=len(request['messages'][-1]['content']) // 2,
+                                completion_tokens=len(text) // 2)
+        return text, usage
+
+    def complete(self, request, api_key=None):
+        with self._slots:
+            text, usage = self._respond(request)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text), finish_reason='stop')],
+            usage=usage
+        )
+
+    def stream(self, request, api_key=None):
+        with self._slots:
+            text, usage = self._respond(request)
+            for i in range(0, len(text), 8):
+                delta = SimpleNamespace(content=text[i:i + 8])
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=None)], usage=None)
+            yield SimpleNamespace(choices=[], usage=usage)
+
+    def stats(self):
+        with self._lock:
+            return {'backend': self.name, 'model': self.model, 'requests': self._requests}
+
+
+def _first_chunk(backend, request, api_key):
+    """스트림을 첫 내용 청크까지 읽고 (읽은 청크 목록, 나머지 스트림, 답한 모델) 반환"""
+    chunks = []
+    stream, model = backend.stream_with_model(request, api_key)
+    iterator = iter(stream)
+    for chunk in iterator:
+        chunks.append(chunk)
+        if chunk.choices and chunk.choices[0].delta.content:
+            break
+    return chunks, iterator, model
+
+
+def _relay(chunks, iterator):
+    """먼저 읽은 청크와 나머지 스트림을 이어서 생성 (끝나거나 닫히면 스트림도 닫음)"""
+    try:
+        yield from chunks
+        yield from iterator
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close:
+            close()
+
+
+def _close_stream(future):
+    """경주에서 진 스트림을 닫아 동시 요청 자리와 연결을 돌려줌"""
+    if not future.cancelled() and future.exception() is None:
+        close = getattr(future.result()[1], 'close', None)
+        if close:
+            close()
+
+
+class HedgedBackend(LLMBackend):
+    """주 백엔드가 기한 안에 답하지 않으면 보조 백엔드에도 같은 요청을 보내고 먼저 온 응답을 쓰는 백엔드
+
+    기한은 최근 주 백엔드 지연(스트리밍은 첫 토큰까지 시간)의 quantile 분위수이며, 요청 종류와
+    max_tokens별로 따로 셉니다. 표본이 모이기 전에는 initial_delay초를 씁니다. 주 백엔드가 실패하면
+    기한을 기다리지 않고 보조 백엔드로 넘깁니다. 늦게 끝난 쪽의 비스트리밍 요청은 취소할 수 없어
+    끝날 때까지 두고 결과만 버리므로, 보조 요청 비율(hedged)을 지표로 확인하세요.
+    """
+
+    def __init__(self, primary, secondary, quantile=DEFAULT_HEDGE_QUANTILE, initial_delay=DEFAULT_HEDGE_DELAY,
+                 max_workers=64):
+        self.primary = primary
+        self.secondary = secondary
+        self.name = f"{primary.name}+{secondary.name}"
+        # 요약 캐시를 조회할 모델 (저장할 때는 complete_with_model/stream_with_model이 알려 주는 답한 모델 사용)
+        self.model = primary.model
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self._latencies = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='llm-hedge')
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'hedged': 0, 'fallbacks': 0,
+                       'wins': {primary.name: 0, secondary.name: 0}}
+
+    @property
+    def requires_api_key(self):
+        return self.primary.requires_api_key or self.secondary.requires_api_key
+
+    def backends(self):
+        return self.primary.backends() + self.secondary.backends()
+
+    def delay(self, key):
+        """key(요청 종류, max_tokens)의 현재 기한(초)"""
+        with self._lock:
+            samples = sorted(self._latencies.get(key, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return self.initial_delay
+        return samples[min(len(samples) - 1, int(self.quantile * len(samples)))]
+
+    def _observe(self, key, started):
+        def record(future):
+            if not future.cancelled() and future.exception() is None:
+                with self._lock:
+                    self._latencies.setdefault(key, deque(maxlen=HEDGE_WINDOW)).append(time.monotonic() - started)
+        return record
+
+    def _race(self, key, call, request, api_key):
+        """주 백엔드에 보내고 기한이 지나거나 실패하면 보조 백엔드에도 보내 (먼저 성공한 future, 진 future 목록) 반환"""
+        started = time.monotonic()
+        primary = self._pool.submit(call, self.primary, request, api_key)
+        primary.add_done_callback(self._observe(key, started))
+        with self._lock:
+            self._stats['requests'] += 1
+
+        done, _ = wait([primary], timeout=self.delay(key))
+        if done and primary.exception() is None:
+            self._win(self.primary)
+            return primary, []
+
+        with self._lock:
+            self._stats['fallbacks' if done else 'hedged'] += 1
+        if done:
+            logger.warning(f"{self.primary.name} 요청 실패, {self.secondary.name}로 재요청: {primary.exception()}")
+        else:
+            logger.debug(f"{self.primary.name} 응답이 {time.monotonic() - started:.2f}초 넘게 없어 "
+                         f"{self.secondary.name}에도 요청")
+        secondary = self._pool.submit(call, self.secondary, request, api_key)
+
+        pending = {primary, secondary}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self._win(self.primary if future is primary else self.secondary)
+                    return future, list(pending)
+        # 둘 다 실패하면 주 백엔드 오류를 올림
+        raise primary.exception()
+
+    def _win(self, backend):
+        with self._lock:
+            self._stats['wins'][backend.name] += 1
+
+    def complete(self, request, api_key=None):
+        return self.complete_with_model(request, api_key)[0]
+
+    def complete_with_model(self, request, api_key=None):
+        future, _ = self._race(('complete', request.get('max_tokens')),
+                               lambda backend, *args: backend.complete_with_model(*args), request, api_key)
+        return future.result()
+
+    def stream(self, request, api_key=None):
+        return self.stream_with_model(request, api_key)[0]
+
+    def stream_with_model(self, request, api_key=None):
+        """첫 내용 청크가 먼저 온 백엔드의 스트림과 그 모델 (진 쪽 스트림은 닫음)"""
+        future, losers = self._race(('stream', request.get('max_tokens')), _first_chunk, request, api_key)
+        for loser in losers:
+            loser.add_done_callback(_close_stream)
+        chunks, iterator, model = future.result()
+        return _relay(chunks, iterator), model
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, wins=dict(self._stats['wins']))
+        stats.update(backend=self.name, model=self.model,
+                     backends=[self.primary.stats(), self.secondary.stats()])
+        return stats
+
+
+def openai_backend(llm):
+    """llm에서 실제 OpenAI로 보내는 백엔드(이름이 openai인 OpenAIBackend)를 찾음 (없으면 None)"""
+    for backend in llm.backends():
+        if isinstance(backend, OpenAIBackend) and backend.name == 'openai':
+            return backend
+    return None
+
+
+def create_backend(kind='openai', hedge=None, hedge_quantile=DEFAULT_HEDGE_QUANTILE,
+                   hedge_delay=DEFAULT_HEDGE_DELAY, **options):
+    """kind 백엔드 생성 (hedge를 주면 kind를 주 백엔드, hedge를 보조 백엔드로 쓰는 HedgedBackend)
+
+    options: openai_base_url, openai_model, requests_per_minute, tokens_per_minute, llm_concurrency(OpenAI 동시 요청 상한),
+    local_base_url, local_model, local_concurrency(로컬 서버 슬롯 수), fake_latency
+    """
+    primary = _create_single(kind, **options)
+    if not hedge:
+        return primary
+    if hedge == kind:
+        raise ValueError(f"주 백엔드와 보조 백엔드가 같습니다: {kind}")
+    return HedgedBackend(primary, _create_single(hedge, **options), quantile=hedge_quantile, initial_delay=hedge_delay)
+
+
+def _create_single(kind, openai_base_url=None, openai_model=DEFAULT_OPENAI_MODEL,
+                   requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE,
+                   llm_concurrency=8, local_base_url=DEFAULT_LOCAL_BASE_URL, local_model=DEFAULT_LOCAL_MODEL,
+                   local_concurrency=2, fake_latency=0.0):
+    if kind == 'openai':
+        return OpenAIBackend('openai', openai_model, openai_base_url,
+                             requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute,
+                             max_concurrency=llm_concurrency)
+    if kind == 'local':
+        # 로컬 서버는 키를 확인하지 않지만 SDK가 빈 키를 받지 않으므로 고정 값 사용
+        return OpenAIBackend('local', local_model, local_base_url, api_key='local',
+                             requests_per_minute=LOCAL_PER_MINUTE, tokens_per_minute=LOCAL_PER_MINUTE,
+                             max_concurrency=local_concurrency)
+    if kind == 'fake':
+        return FakeBackend(latency=fake_latency)
+    raise ValueError(f"알 수 없는 LLM 백엔드: {kind}")
+
+
+def backend_from_env(environ=None, **options):
+    """환경변수로 백엔드 생성 (Streamlit 앱처럼 명령행 인자가 없을 때)
+
+    LLM_BACKEND(openai/local/fake, 기본 openai), LLM_HEDGE_BACKEND(보조 백엔드), LLM_HEDGE_QUANTILE,
+    OPENAI_BASE_URL, LOCAL_LLM_BASE_URL, LOCAL_LLM_MODEL, LOCAL_LLM_CONCURRENCY
+    """
+    environ = os.environ if environ is None else environ
+    options.setdefault('openai_base_url', environ.get('OPENAI_BASE_URL'))
+    options.setdefault('local_base_url', environ.get('LOCAL_LLM_BASE_URL', DEFAULT_LOCAL_BASE_URL))
+    options.setdefault('local_model', environ.get('LOCAL_LLM_MODEL', DEFAULT_LOCAL_MODEL))
+    options.setdefault('local_concurrency', int(environ.get('LOCAL_LLM_CONCURRENCY', 2)))
+    return create_backend(environ.get('LLM_BACKEND', 'openai'), hedge=environ.get('LLM_HEDGE_BACKEND'),
+                          hedge_quantile=float(environ.get('LLM_HEDGE_QUANTILE', DEFAULT_HEDGE_QUANTILE)),
+                          **options)
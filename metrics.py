@@ -0,0 +1,227 @@
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = 'aitimes'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+# 이름 -> (종류, 설명, 히스토그램 구간)
+METRICS = {
+    'stage_seconds': ('histogram', "단계별 실행 시간(초)", LATENCY_BUCKETS),
+    'fetch_seconds': ('histogram', "페이지 요청 지연(초), status는 HTTP 상태 또는 error", LATENCY_BUCKETS),
+    'fetch_bytes': ('histogram', "내려받은 페이지 크기(바이트, 304 제외)", SIZE_BUCKETS),
+    'parse_seconds': ('histogram', "HTML 파싱/본문 추출 시간(초)", LATENCY_BUCKETS),
+    'llm_seconds': ('histogram', "OpenAI 요약 요청 지연(초, 재시도/한도 대기 포함)", LATENCY_BUCKETS),
+    'llm_ttft_seconds': ('histogram', "스트리밍 요약의 첫 토큰까지 시간(초)", LATENCY_BUCKETS),
+    'llm_tokens': ('histogram', "요청당 토큰 수 (type=prompt|completion)", TOKEN_BUCKETS),
+    'failures_total': ('counter', "단계별 실패 횟수", None),
+    'content_checks_total': ('counter', "증분 크롤링에서 본문 지문을 비교한 기사 수 (result=unchanged|changed|unavailable)",
+                             None),
+}
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        f'{key}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for key, value in labels
+    )
+    return '{' + pairs + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """스레드 안전한 카운터/히스토그램 모음 (대시보드 요약과 Prometheus 텍스트 형식 내보내기)
+
+    METRICS에 정의된 이름만 기록하며, 라벨 조합마다 따로 집계합니다. add_collector로 등록한 함수는
+    내보낼 때마다 호출되어 (이름, 종류, 설명, 라벨 딕셔너리, 값) 목록을 돌려주는 게이지/카운터를 더합니다.
+    """
+
+    def __init__(self, namespace=NAMESPACE):
+        self.namespace = namespace
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+                    break
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """with 블록 실행 시간을 히스토그램에 기록 (예외가 나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def _collected(self):
+        samples = []
+        for collector in self._collectors:
+            try:
+                samples.extend(collector())
+            except Exception as e:
+                logger.warning(f"지표 수집 중 오류: {str(e)}")
+        return samples
+
+    @staticmethod
+    def quantile(buckets, counts, total, q):
+        """구간별 개수로 분위수 추정 (구간 안에서는 선형 보간, 마지막 구간을 넘으면 상한값)"""
+        if not total:
+            return None
+        rank = q * total
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip(buckets, counts):
+            if count and cumulative + count >= rank:
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = bound
+        return buckets[-1]
+
+    def snapshot(self):
+        """대시보드용 요약 (히스토그램 행 목록, 카운터/게이지 행 목록)"""
+        with self._lock:
+            histograms = [(name, labels, dict(h, buckets=list(h['buckets']))) for (name, labels), h in self._histograms.items()]
+            counters = list(self._counters.items())
+
+        histogram_rows = []
+        for name, labels, h in sorted(histograms):
+            buckets = METRICS[name][2]
+            histogram_rows.append({
+                'metric': name,
+                'labels': ', '.join(f"{key}={value}" for key, value in labels),
+                'count': h['count'],
+                'sum': h['sum'],
+                'mean': h['sum'] / h['count'] if h['count'] else None,
+                'p50': self.quantile(buckets, h['buckets'], h['count'], 0.5),
+                'p95': self.quantile(buckets, h['buckets'], h['count'], 0.95),
+            })
+        value_rows = [
+            {'metric': name, 'labels': ', '.join(f"{key}={value}" for key, value in labels), 'value': value}
+            for (name, labels), value in sorted(counters)
+        ]
+        value_rows.extend(
+            {'metric': name, 'labels': ', '.join(f"{key}={value}" for key, value in sorted(labels.items())), 'value': value}
+            for name, _, _, labels, value in self._collected()
+        )
+        return histogram_rows, value_rows
+
+    def render(self):
+        """Prometheus 텍스트 노출 형식 (version 0.0.4)"""
+        with self._lock:
+            histograms = sorted((key, dict(h, buckets=list(h['buckets']))) for key, h in self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        lines = []
+        described = set()
+
+        def describe(name, kind, help_text):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), h in histograms:
+            kind, help_text, buckets = METRICS[name]
+            full_name = f"{self.namespace}_{name}"
+            describe(full_name, kind, help_text)
+            cumulative = 0
+            for bound, count in zip(buckets, h['buckets']):
+                cumulative += count
+                lines.append(f"{full_name}_bucket{_format_labels(labels + (('le', _format_value(float(bound))),))} {cumulative}")
+            lines.append(f"{full_name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {h['count']}")
+            lines.append(f"{full_name}_sum{_format_labels(labels)} {_format_value(h['sum'])}")
+            lines.append(f"{full_name}_count{_format_labels(labels)} {h['count']}")
+
+        for (name, labels), value in counters:
+            kind, help_text, _ = METRICS[name]
+            full_name = f"{self.namespace}_{name}"
+            describe(full_name, kind, help_text)
+            lines.append(f"{full_name}{_format_labels(labels)} {_format_value(value)}")
+
+        for name, kind, help_text, labels, value in sorted(self._collected(), key=lambda sample: sample[0]):
+            full_name = f"{self.namespace}_{name}"
+            describe(full_name, kind, help_text)
+            lines.append(f"{full_name}{_format_labels(sorted(labels.items()))} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """텍스트 형식 지표를 파일로 저장 (node_exporter textfile 수집기가 반쯤 쓴 파일을 읽지 않도록 교체 방식)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+    def serve(self, port, host='0.0.0.0'):
+        """/metrics 경로로 지표를 제공하는 HTTP 서버를 백그라운드 스레드에서 시작"""
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def timed_stage(stage):
+    """메서드 실행 시간을 self.metrics의 stage_seconds{stage=...}에 기록하는 데코레이터"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.timer('stage_seconds', stage=stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,528 @@
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from xml.sax.saxutils import escape
+
+from exports import read_csv_rows
+from summary_schema import SUMMARY_SECTIONS, PAIR_KEYS, is_summary_ok
+
+logger = logging.getLogger(__name__)
+
+# 리포트 레이아웃/스타일을 바꾸면 올려서 캐시된 리포트와 기사 조각을 무효화
+REPORT_VERSION = 3
+
+KOREAN_FONTS = ['HYSMyeongJoStd-Medium', 'HYGothic-Medium', 'AppleGothic']
+
+SECTION_EMOJIS = ['🚀', '💡', '✨', '📚', '🤔', '📊', '👟', '🧩', '📖']
+
+# 렌더링할 기사가 이보다 적으면 프로세스 풀을 띄우는 비용이 더 크므로 현재 프로세스에서 렌더링
+PARALLEL_MIN_ARTICLES = 20
+
+# 프로세스당 한 번만 폰트 등록을 시도
+_fonts = None
+_fonts_lock = threading.Lock()
+
+
+def register_fonts():
+    """한글 CID 폰트를 프로세스당 한 번만 등록하고 (본문 폰트, 굵은 폰트) 반환"""
+    global _fonts
+    with _fonts_lock:
+        if _fonts is not None:
+            return _fonts
+
+        from reportlab.pdfbase import pdfmetrics
+
+        korean_font = None
+        try:
+            from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+
+            for font_name in KOREAN_FONTS:
+                try:
+                    pdfmetrics.registerFont(UnicodeCIDFont(font_name))
+                    korean_font = font_name
+                    logger.info(f"✅ 한글 CID 폰트 로드 성공: {font_name}")
+                    break
+                except Exception:
+                    continue
+
+            if korean_font is None:
+                logger.info("ℹ️ CID 폰트를 사용할 수 없습니다. 기본 폰트를 사용합니다.")
+
+        except Exception as font_error:
+            logger.info(f"ℹ️ CID 폰트 등록 중 오류: {str(font_error)}. 기본 폰트를 사용합니다.")
+
+        _fonts = (korean_font or 'Helvetica', korean_font or 'Helvetica-Bold')
+        return _fonts
+
+
+def build_styles():
+    """리포트 문단 스타일 (제목, 헤딩, 본문, 소제목)"""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    regular_font, bold_font = register_fonts()
+    styles = getSampleStyleSheet()
+    return {
+        # 제목 스타일
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            alignment=1,  # 중앙 정렬
+            textColor='#2E86AB',
+            fontName=bold_font
+        ),
+        # 헤딩 스타일
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            spaceAfter=12,
+            spaceBefore=20,
+            textColor='#A23B72',
+            fontName=bold_font
+        ),
+        # 본문 스타일
+        'body': ParagraphStyle(
+            'CustomBody',
+            parent=styles['Normal'],
+            fontSize=11,
+            spaceAfter=12,
+            leading=14,
+            fontName=regular_font
+        ),
+        # 소제목 스타일
+        'subtitle': ParagraphStyle(
+            'CustomSubtitle',
+            parent=styles['Normal'],
+            fontSize=13,
+            spaceAfter=8,
+            spaceBefore=12,
+            textColor='#F18F01',
+            fontName=bold_font
+        )
+    }
+
+
+def summary_markup(summary_text):
+    """마크다운 요약을 reportlab 문단 마크업으로 단순화 (구조화 요약이 없는 이전 실행용)"""
+    # 마크다운 특수 문자들을 단순화
+    summary_text = summary_text.replace('### ', '')
+    summary_text = summary_text.replace('## ', '')
+    summary_text = summary_text.replace('# ', '')
+    summary_text = summary_text.replace('**', '')
+    summary_text = summary_text.replace('*', '•')
+    summary_text = summary_text.replace('- ', '• ')
+
+    # 이모지가 포함된 섹션 제목들은 굵게
+    processed_lines = []
+    for line in summary_text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if any(emoji in line for emoji in SECTION_EMOJIS):
+            processed_lines.append(f"<b>{line}</b>")
+        else:
+            processed_lines.append(line)
+    return '<br/>'.join(processed_lines)
+
+
+def summary_data_flowables(summary_data, styles):
+    """구조화 요약을 섹션별 소제목 + 문단으로 (필드를 그대로 그리므로 마크다운을 다시 해석하지 않음)"""
+    from reportlab.platypus import Paragraph
+
+    story = []
+    for key, emoji, label, kind in SUMMARY_SECTIONS:
+        value = summary_data.get(key)
+        if not value:
+            continue
+        if kind == 'text':
+            lines = [escape(value)]
+        elif kind == 'list':
+            lines = [f"• {escape(item)}" for item in value]
+        else:
+            name, detail = PAIR_KEYS[key]
+            lines = [f"• <b>{escape(item[name])}</b>: {escape(item[detail])}" for item in value]
+        story.append(Paragraph(f"{emoji} {label}", styles['subtitle']))
+        story.append(Paragraph('<br/>'.join(lines), styles['body']))
+    return story
+
+
+def collapse_duplicates(articles):
+    """duplicate_of가 있는 기사를 대표 기사 아래 'related' 제목 목록으로 합치고 대표 기사만 반환"""
+    by_url = {article['url']: dict(article, related=[]) for article in articles if not article.get('duplicate_of')}
+    collapsed = []
+    added = set()
+    for article in articles:
+        representative = by_url.get(article.get('duplicate_of'))
+        if representative is not None:
+            representative['related'].append(article['title'])
+        elif article['url'] in by_url:
+            if article['url'] not in added:
+                added.add(article['url'])
+                collapsed.append(by_url[article['url']])
+        else:
+            # 대표 기사가 목록에 없으면 그대로 둠
+            collapsed.append(dict(article, related=[]))
+    return collapsed
+
+
+def _related_count(articles):
+    return sum(len(article.get('related') or []) for article in articles)
+
+
+def header_flowables(articles, crawl_time, styles):
+    """리포트 제목과 요약 통계"""
+    from reportlab.platypus import Paragraph, Spacer
+
+    successful_summaries = len([a for a in articles if is_summary_ok(a.get('summary'), a.get('summary_data'))])
+    return [
+        Paragraph("AI타임스 뉴스 리포트", styles['title']),
+        Paragraph(f"크롤링 시간: {crawl_time}", styles['body']),
+        Spacer(1, 20),
+        Paragraph("📊 크롤링 요약", styles['heading']),
+        Paragraph(f"• 총 뉴스 개수: {len(articles) + _related_count(articles)}개", styles['body']),
+        Paragraph(f"• AI 요약 성공: {successful_summaries}개", styles['body']),
+        Paragraph(f"• 유사 기사로 묶인 뉴스: {_related_count(articles)}개", styles['body']),
+        Spacer(1, 20)
+    ]
+
+
+def article_flowables(article, styles):
+    """기사 하나의 제목, URL, 요약 문단"""
+    from reportlab.platypus import Paragraph, Spacer
+
+    story = [
+        Paragraph(f"📰 뉴스 #{article['rank']}: {article['title']}", styles['heading']),
+        Paragraph(f"URL: {article['url']}", styles['body'])
+    ]
+    if article.get('related'):
+        story.append(Paragraph("같은 내용의 기사: " + " / ".join(article['related']), styles['body']))
+    story.append(Spacer(1, 12))
+
+    if article.get('summary_data'):
+        story.extend(summary_data_flowables(article['summary_data'], styles))
+    elif is_summary_ok(article.get('summary')):
+        summary_text = str(article['summary'])
+        try:
+            story.append(Paragraph(summary_markup(summary_text), styles['body']))
+        except Exception:
+            # 마크업 해석 실패 시 원본 텍스트 사용
+            clean_text = summary_text.replace('<', '&lt;').replace('>', '&gt;')
+            story.append(Paragraph(clean_text, styles['body']))
+    else:
+        story.append(Paragraph("AI 요약을 생성할 수 없었습니다.", styles['body']))
+
+    story.append(Spacer(1, 20))
+    return story
+
+
+def digest_header_flowables(articles, period, styles):
+    """다이제스트 제목과 기간/요약 통계"""
+    from reportlab.platypus import Paragraph, Spacer
+
+    successful_summaries = len([a for a in articles if is_summary_ok(a.get('summary'), a.get('summary_data'))])
+    return [
+        Paragraph("AI타임스 뉴스 다이제스트", styles['title']),
+        Paragraph(f"기간: {period}", styles['body']),
+        Spacer(1, 20),
+        Paragraph("📊 크롤링 요약", styles['heading']),
+        Paragraph(f"• 총 뉴스 개수: {len(articles) + _related_count(articles)}개", styles['body']),
+        Paragraph(f"• AI 요약 성공: {successful_summaries}개", styles['body']),
+        Paragraph(f"• 유사 기사로 묶인 뉴스: {_related_count(articles)}개", styles['body']),
+        Spacer(1, 20)
+    ]
+
+
+def toc_flowables(entries, styles):
+    """목차 (기사 제목, 시작 페이지) 표"""
+    from reportlab.platypus import Paragraph, Table, TableStyle
+
+    rows = [[Paragraph(f"#{article['rank']} {article['title']}", styles['body']), str(page)]
+            for article, page in entries]
+    table = Table(rows, colWidths=['88%', '12%'], repeatRows=0)
+    table.setStyle(TableStyle([
+        ('FONTNAME', (1, 0), (1, -1), styles['body'].fontName),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP')
+    ]))
+    return [Paragraph("📑 목차", styles['heading']), table]
+
+
+def render_fragments(articles):
+    """기사마다 PDF 조각을 렌더링 (프로세스 풀 작업 단위)"""
+    styles = build_styles()
+    return [render_pdf(article_flowables(article, styles)) for article in articles]
+
+
+def render_pdf(flowables):
+    """flowable 목록을 A4 PDF 바이트로 렌더링"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4,
+                            rightMargin=inch, leftMargin=inch,
+                            topMargin=inch, bottomMargin=inch)
+    doc.build(flowables)
+    return buffer.getvalue()
+
+
+def load_csv_articles(csv_file_path):
+    """리포트용 기사 목록과 크롤링 시간을 CSV에서 읽음 (리포트에 쓰지 않는 본문 열은 행마다 버림)"""
+    articles = []
+    crawl_time = None
+    for idx, row in enumerate(read_csv_rows(csv_file_path, skip_columns=('content',))):
+        if crawl_time is None:
+            crawl_time = row.get('crawl_time')
+        articles.append({
+            'rank': int(row['rank']) if row.get('rank') else idx + 1,
+            'title': row['title'],
+            'url': row['url'],
+            'summary': row.get('summary'),
+            # 구조화 요약 열은 이 버전 이후에 내보낸 CSV에만 있음
+            'summary_data': json.loads(row['summary_data']) if row.get('summary_data') else None,
+            'duplicate_of': row.get('duplicate_of')
+        })
+    return articles, crawl_time or "Unknown"
+
+
+def _hash_parts(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class PdfReportBuilder:
+    """CSV 스냅샷으로 PDF 리포트를 만들되 결과를 최대한 재사용
+
+    - 리포트: (리포트 버전, 폰트, CSV 파일 내용)의 해시가 지난번과 같고 PDF가 남아 있으면 다시 그리지 않음
+    - 기사 조각: 두 번째 기사부터는 기사마다 새 페이지에서 시작하므로, 기사별로 렌더링한 PDF 조각을
+      SQLite에 캐시해 두고 pypdf로 이어 붙입니다. 여러 날짜의 리포트가 같은 기사를 공유하면 새 기사만 렌더링합니다.
+    - 렌더링할 기사가 많으면 프로세스 풀에서 청크 단위로 나눠 렌더링합니다.
+    - pypdf가 없으면 조각 캐시 없이 한 번에 렌더링합니다. (다이제스트는 pypdf 필요)
+    """
+
+    def __init__(self, db_path=os.path.join("crawled_data", "pdf_cache.db"), max_fragments=5000):
+        self.db_path = db_path
+        self.max_fragments = max_fragments
+        self.fragment_hits = 0
+        self.fragment_misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS reports (
+                pdf_path TEXT PRIMARY KEY,
+                report_key TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS fragments (
+                key TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_fragments_accessed ON fragments (accessed_at);
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def pdf_path_for(csv_file_path):
+        """CSV 파일 옆의 *_report.pdf 경로"""
+        pdf_filename = os.path.basename(csv_file_path).replace('.csv', '_report.pdf')
+        return os.path.join(os.path.dirname(csv_file_path), pdf_filename)
+
+    def report_key(self, csv_file_path):
+        # 큰 CSV도 메모리에 다 올리지 않도록 1MB씩 나눠 해시
+        csv_digest = hashlib.sha256()
+        with open(csv_file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                csv_digest.update(block)
+        return _hash_parts(REPORT_VERSION, register_fonts(), csv_digest.hexdigest())
+
+    def cached_report(self, pdf_path, report_key):
+        """입력이 바뀌지 않았고 파일이 남아 있으면 기존 PDF 경로 반환"""
+        with self._lock:
+            row = self._conn.execute("SELECT report_key FROM reports WHERE pdf_path = ?", (pdf_path,)).fetchone()
+        if row and row[0] == report_key and os.path.exists(pdf_path):
+            return pdf_path
+        return None
+
+    def build(self, csv_file_path, workers=1, progress_callback=None):
+        """CSV 파일로 PDF 리포트를 만들고 경로 반환 (입력이 같으면 기존 파일 반환)"""
+        pdf_path = self.pdf_path_for(csv_file_path)
+        report_key = self.report_key(csv_file_path)
+        if self.cached_report(pdf_path, report_key):
+            return pdf_path
+
+        articles, crawl_time = load_csv_articles(csv_file_path)
+        articles = collapse_duplicates(articles)
+        self._write_report(pdf_path, report_key,
+                           lambda output: self.render(articles, crawl_time, output, workers, progress_callback))
+        return pdf_path
+
+    def build_digest(self, articles, period, pdf_path, workers=None, progress_callback=None):
+        """여러 실행의 기사를 표지 + 목차 + 기사별 페이지로 묶은 다이제스트 PDF를 만들고 경로 반환
+
+        기사 조각은 workers개 프로세스에서 나눠 렌더링하고(캐시된 조각은 재사용), 조각별 페이지 수로
+        목차의 시작 페이지와 PDF 책갈피를 계산합니다. progress_callback(완료 수, 전체 수)으로 진행 상황을 알립니다.
+        """
+        articles = collapse_duplicates(articles)
+        report_key = _hash_parts(REPORT_VERSION, register_fonts(), 'digest', period,
+                                 *[self.fragment_key(article) for article in articles])
+        if self.cached_report(pdf_path, report_key):
+            return pdf_path
+
+        from pypdf import PdfReader, PdfWriter
+
+        styles = build_styles()
+        fragments = self.fragments(articles, workers or os.cpu_count() or 1, progress_callback)
+        # 파싱한 조각을 모두 들고 있지 않도록 페이지 수만 먼저 세고, 붙일 때 하나씩 다시 읽음
+        page_counts = [len(PdfReader(io.BytesIO(data)).pages) for data in fragments]
+
+        # 목차 길이에 따라 기사 시작 페이지가 밀리므로 목차 페이지 수가 바뀌지 않을 때까지 다시 그림
+        front_pages = 1
+        while True:
+            entries = []
+            page = front_pages + 1
+            for article, count in zip(articles, page_counts):
+                entries.append((article, page))
+                page += count
+            front = PdfReader(io.BytesIO(render_pdf(
+                digest_header_flowables(articles, period, styles) + toc_flowables(entries, styles)
+            )))
+            if len(front.pages) == front_pages:
+                break
+            front_pages = len(front.pages)
+
+        writer = PdfWriter()
+        writer.append(front)
+        for (article, page), data in zip(entries, fragments):
+            writer.append(PdfReader(io.BytesIO(data)))
+            writer.add_outline_item(f"#{article['rank']} {article['title']}", page - 1)
+        self._prune()
+
+        self._write_report(pdf_path, report_key, writer.write)
+        return pdf_path
+
+    def _write_report(self, pdf_path, report_key, write):
+        # write(파일)로 임시 파일에 바로 쓰고 교체 (쓰는 도중 다운로드되지 않도록, 전체 바이트를 메모리에 모으지 않음)
+        tmp_path = pdf_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, pdf_path)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reports (pdf_path, report_key, created_at) VALUES (?, ?, ?)",
+                (pdf_path, report_key, time.time())
+            )
+            self._conn.commit()
+
+    def render(self, articles, crawl_time, output, workers=1, progress_callback=None):
+        """리포트 PDF를 output(바이너리 파일)에 씀 (첫 페이지는 제목/통계 + 첫 기사, 이후 기사는 캐시된 조각 재사용)"""
+        styles = build_styles()
+        try:
+            from pypdf import PdfReader, PdfWriter
+        except ImportError:
+            from reportlab.platypus import PageBreak
+
+            story = header_flowables(articles, crawl_time, styles)
+            for idx, article in enumerate(articles):
+                if idx > 0:
+                    story.append(PageBreak())
+                story.extend(article_flowables(article, styles))
+            output.write(render_pdf(story))
+            return
+
+        first_page = header_flowables(articles, crawl_time, styles)
+        if articles:
+            first_page.extend(article_flowables(articles[0], styles))
+
+        writer = PdfWriter()
+        writer.append(PdfReader(io.BytesIO(render_pdf(first_page))))
+        for data in self.fragments(articles[1:], workers, progress_callback):
+            writer.append(PdfReader(io.BytesIO(data)))
+        self._prune()
+        writer.write(output)
+
+    def fragment_key(self, article):
+        summary_data = json.dumps(article.get('summary_data'), ensure_ascii=False, sort_keys=True)
+        return _hash_parts(REPORT_VERSION, register_fonts(), article['rank'], article['title'],
+                           article['url'], article.get('summary'), summary_data, *(article.get('related') or []))
+
+    def fragments(self, articles, workers=1, progress_callback=None):
+        """기사별 PDF 조각 목록 (캐시 우선, 없는 조각은 workers개 프로세스에서 나눠 렌더링)"""
+        keys = [self.fragment_key(article) for article in articles]
+        results = [self._get_fragment(key) for key in keys]
+        missing = [i for i, data in enumerate(results) if data is None]
+        total = len(articles)
+        completed = total - len(missing)
+        if progress_callback:
+            progress_callback(completed, total)
+
+        def store(indices, datas):
+            nonlocal completed
+            for i, data in zip(indices, datas):
+                results[i] = data
+                self._put_fragment(keys[i], data)
+            completed += len(indices)
+            if progress_callback:
+                progress_callback(completed, total)
+
+        if workers > 1 and len(missing) >= PARALLEL_MIN_ARTICLES:
+            # 작업자마다 몇 개의 청크를 받도록 나눠 느린 청크 하나가 전체를 붙잡지 않게 함
+            chunk_size = max(1, -(-len(missing) // (workers * 4)))
+            chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+            # Streamlit처럼 스레드가 도는 프로세스에서 fork하지 않도록 spawn 사용
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = {pool.submit(render_fragments, [articles[i] for i in chunk]): chunk for chunk in chunks}
+                for future in as_completed(futures):
+                    store(futures[future], future.result())
+        else:
+            styles = build_styles()
+            for i in missing:
+                store([i], [render_pdf(article_flowables(articles[i], styles))])
+
+        return results
+
+    def _get_fragment(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM fragments WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.fragment_misses += 1
+                return None
+            self._conn.execute("UPDATE fragments SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.fragment_hits += 1
+            return row[0]
+
+    def _put_fragment(self, key, data):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fragments (key, data, accessed_at) VALUES (?, ?, ?)", (key, data, time.time())
+            )
+            self._conn.commit()
+
+    def _prune(self):
+        """가장 오래 사용되지 않은 조각부터 max_fragments개만 남김"""
+        if not self.max_fragments:
+            return
+        with self._lock:
+            self._conn.execute("""
+                DELETE FROM fragments WHERE key IN (
+                    SELECT key FROM fragments ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_fragments,))
+            self._conn.commit()
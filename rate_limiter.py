@@ -0,0 +1,233 @@
+import logging
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# gpt-4o-mini Tier 1 한도 (응답의 x-ratelimit-limit-* 헤더를 받으면 실제 계정 한도로 바뀜)
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 200000
+
+# 남은 요청/토큰이 한도의 이 비율보다 적으면 동시 요청 수를 줄임
+LOW_HEADROOM = 0.1
+
+_DURATION = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_UNITS = {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}
+
+
+def parse_duration(value):
+    """x-ratelimit-reset-* 헤더 값("1s", "6m0s", "20ms")을 초로 변환 (형식이 다르면 None)"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def _header_int(headers, name):
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """분당 한도를 초 단위로 고르게 채우는 토큰 버킷
+
+    reserve는 양을 바로 빼고(잔량이 음수가 될 수 있음) 잔량이 0으로 돌아올 때까지 기다릴 시간을 반환하므로,
+    여러 스레드가 동시에 요청해도 먼저 예약한 순서대로 한도 안에서 시작됩니다.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.level = per_minute
+        self._updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.capacity / 60)
+        self._updated = now
+
+    def reserve(self, amount, now):
+        self._refill(now)
+        # 한 번에 한도보다 많이 요청해도 한도만큼만 기다리게 함
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level * 60 / self.capacity)
+
+    def sync(self, limit, remaining, now):
+        """응답 헤더의 한도/잔량에 맞춤 (서버 잔량이 더 적으면 그만큼 줄임)"""
+        self._refill(now)
+        if limit:
+            self.capacity = limit
+            self.level = min(self.level, limit)
+        if remaining is not None:
+            self.level = min(self.level, remaining)
+
+
+class OpenAIRateLimiter:
+    """OpenAI 요청 수(RPM)/토큰 수(TPM) 한도를 지키며 동시 요청 수를 조절하는 제한기
+
+    요청마다 두 토큰 버킷에서 1회와 예상 토큰 수(프롬프트 + max_tokens)를 예약하고, 응답의 x-ratelimit-* 헤더로
+    한도와 잔량을 맞춥니다. 동시 요청 수는 AIMD로 조절합니다: 429나 잔량 부족이면 줄이고, 여유 있게 성공하면
+    한 단계씩 늘립니다. 429/5xx/연결 오류는 retry-after 헤더(없으면 지수 백오프)만큼 모든 요청을 멈춘 뒤 재시도합니다.
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE,
+                 max_concurrency=8, min_concurrency=1, max_retries=5, backoff=1.0, max_backoff=60.0):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.concurrency = max(self.min_concurrency, self.max_concurrency // 2)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._active = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self._stats = {'requests': 0, 'retries': 0, 'rate_limited': 0, 'server_errors': 0, 'wait_s': 0.0}
+
+    def acquire(self, tokens):
+        """동시 요청 자리를 잡고 RPM/TPM 한도 안에 들어올 때까지 대기"""
+        with self._cond:
+            while self._active >= self.concurrency:
+                self._cond.wait()
+            self._active += 1
+            now = time.monotonic()
+            delay = max(self._paused_until - now,
+                        self.requests.reserve(1, now),
+                        self.tokens.reserve(tokens, now))
+            self._stats['requests'] += 1
+            self._stats['wait_s'] += max(0.0, delay)
+        if delay > 0:
+            time.sleep(delay)
+
+    def release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def _set_concurrency(self, value):
+        value = max(self.min_concurrency, min(self.max_concurrency, value))
+        if value != self.concurrency:
+            logger.debug(f"OpenAI 동시 요청 수 조정: {self.concurrency} → {value}")
+            self.concurrency = value
+            self._cond.notify_all()
+
+    def update(self, headers):
+        """성공 응답의 x-ratelimit-* 헤더로 한도/잔량을 맞추고 동시 요청 수 조절"""
+        headers = headers or {}
+        limit_requests = _header_int(headers, 'x-ratelimit-limit-requests')
+        limit_tokens = _header_int(headers, 'x-ratelimit-limit-tokens')
+        remaining_requests = _header_int(headers, 'x-ratelimit-remaining-requests')
+        remaining_tokens = _header_int(headers, 'x-ratelimit-remaining-tokens')
+
+        with self._cond:
+            now = time.monotonic()
+            self.requests.sync(limit_requests, remaining_requests, now)
+            self.tokens.sync(limit_tokens, remaining_tokens, now)
+
+            low = any(
+                remaining is not None and remaining < limit * LOW_HEADROOM
+                for limit, remaining in ((self.requests.capacity, remaining_requests),
+                                         (self.tokens.capacity, remaining_tokens))
+            )
+            if low:
+                self._successes = 0
+                self._set_concurrency(self.concurrency - 1)
+                return
+            # 현재 동시 요청 수만큼 연속으로 성공하면 하나 늘림
+            self._successes += 1
+            if self._successes >= self.concurrency:
+                self._successes = 0
+                self._set_concurrency(self.concurrency + 1)
+
+    def _retry_delay(self, headers, attempt):
+        """retry-after(-ms) 헤더, 없으면 리셋 시각, 그것도 없으면 지수 백오프 + 지터"""
+        headers = headers or {}
+        try:
+            if headers.get('retry-after-ms'):
+                return float(headers['retry-after-ms']) / 1000
+            if headers.get('retry-after'):
+                return float(headers['retry-after'])
+        except ValueError:
+            pass
+        resets = [parse_duration(headers.get(name)) for name in ('x-ratelimit-reset-requests', 'x-ratelimit-reset-tokens')]
+        resets = [reset for reset in resets if reset]
+        if resets:
+            return min(max(resets), self.max_backoff)
+        return min(self.backoff * 2 ** attempt, self.max_backoff) * random.uniform(0.5, 1.0)
+
+    def _pause(self, delay, throttled):
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self._stats['retries'] += 1
+            if throttled:
+                self._stats['rate_limited'] += 1
+                self._successes = 0
+                self._set_concurrency(self.concurrency // 2)
+            else:
+                self._stats['server_errors'] += 1
+
+    def call(self, create, tokens, stream=False):
+        """create()로 원시 응답(with_raw_response)을 받아 헤더를 반영하고 파싱한 결과 반환
+
+        429(사용량 한도 초과 제외)/5xx/연결 오류는 max_retries번까지 재시도하고, 그래도 실패하면 마지막 오류를 그대로 올립니다.
+        stream=True이면 스트림을 끝까지 읽을 때까지 동시 요청 자리를 잡아 두는 생성기를 반환합니다.
+        (스트리밍 도중 끊긴 요청은 재시도하지 않음)
+        """
+        import openai
+
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            try:
+                raw = create()
+                self.update(raw.headers)
+                response = raw.parse()
+            except (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError) as e:
+                self.release()
+                throttled = isinstance(e, openai.RateLimitError)
+                # 결제 한도 소진은 기다려도 풀리지 않으므로 재시도하지 않음
+                if attempt >= self.max_retries or getattr(e, 'code', None) == 'insufficient_quota':
+                    raise
+                response = getattr(e, 'response', None)
+                delay = self._retry_delay(response.headers if response is not None else None, attempt)
+                logger.warning(f"OpenAI 요청 실패, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries}): {str(e)}")
+                self._pause(delay, throttled)
+                attempt += 1
+                continue
+            except Exception:
+                self.release()
+                raise
+            if stream:
+                return self._release_after(response)
+            self.release()
+            return response
+
+    def _release_after(self, response):
+        try:
+            yield from response
+        finally:
+            # 끝까지 읽지 않고 닫은 스트림(hedge에서 진 쪽 등)도 연결을 돌려주도록
+            close = getattr(response, 'close', None)
+            if close:
+                close()
+            self.release()
+
+    def stats(self):
+        """누적 요청/재시도/대기 통계와 현재 동시 요청 수, 추정 한도"""
+        with self._cond:
+            return dict(
+                self._stats,
+                concurrency=self.concurrency,
+                requests_per_minute=self.requests.capacity,
+                tokens_per_minute=self.tokens.capacity
+            )
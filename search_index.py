@@ -0,0 +1,386 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+from summary_schema import is_summary_ok, summary_plain_text
+
+logger = logging.getLogger(__name__)
+
+# 한국어를 지원하는 로컬 임베딩 모델 (sentence-transformers가 설치된 경우에만 의미 검색 사용)
+EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+
+# 검색 순위에서 제목/요약/본문 일치의 가중치 (bm25)
+COLUMN_WEIGHTS = (10.0, 4.0, 1.0)
+
+# 색인 텍스트 형식 버전 (2: 열 앞뒤에 공백을 붙여 색인)
+TEXT_FORMAT = 2
+
+_WHITESPACE = re.compile(r'\s+')
+
+_encoders = {}
+
+
+def _get_encoder(model):
+    """sentence-transformers 임베딩 모델 (설치되지 않았거나 모델을 받을 수 없으면 None)"""
+    if model not in _encoders:
+        try:
+            from sentence_transformers import SentenceTransformer
+            _encoders[model] = SentenceTransformer(model)
+        except Exception as e:
+            logger.debug(f"임베딩 모델을 사용할 수 없어 의미 검색을 끕니다: {str(e)}")
+            _encoders[model] = None
+    return _encoders[model]
+
+
+def normalize_text(text):
+    """줄바꿈/연속 공백을 공백 하나로 (두 글자 검색어를 ' 단어'/'단어 ' 트라이그램으로 찾을 수 있도록)"""
+    return _WHITESPACE.sub(' ', text or '').strip()
+
+
+def index_text(text):
+    """색인할 열 텍스트 (앞뒤에 공백을 붙여 열의 처음/끝에 있는 두 글자 단어도 ' 단어'/'단어 '로 찾음)"""
+    return f" {normalize_text(text)} "
+
+
+def build_match_query(query):
+    """검색어를 FTS5 trigram MATCH 식으로 변환 (모든 단어를 포함하는 기사, 쓸 단어가 없으면 None)
+
+    세 글자 이상 단어는 그대로 부분 문자열로 찾습니다. trigram은 두 글자 단어를 색인하지 못하므로
+    두 글자 단어는 앞이나 뒤에 공백이 붙은 형태(" 로봇", "로봇 ")로 찾고, 한 글자 단어는 무시합니다.
+    열은 index_text로 앞뒤에 공백을 붙여 색인하므로 열의 첫 단어/마지막 단어도 찾을 수 있습니다.
+    """
+    terms = []
+    for word in normalize_text(query).split(' '):
+        word = word.replace('"', '""')
+        if len(word) >= 3:
+            terms.append(f'"{word}"')
+        elif len(word) == 2:
+            terms.append(f'(" {word}" OR "{word} ")')
+    return ' AND '.join(terms) or None
+
+
+def make_snippet(texts, query, width=80):
+    """검색어 단어가 처음 나오는 곳 주변 width글자를 잘라 단어를 **로 강조 (일치하는 글이 없으면 첫 글 앞부분)
+
+    FTS5 snippet()은 두 글자 단어처럼 겹치는 구문이 함께 일치하면 같은 문장을 두 번 출력하므로 직접 만듭니다.
+    """
+    words = sorted({word for word in normalize_text(query).split(' ') if len(word) >= 2}, key=len, reverse=True)
+    texts = [text for text in texts if text]
+    if not texts:
+        return ''
+    pattern = re.compile('|'.join(map(re.escape, words))) if words else None
+    for text in texts:
+        found = pattern.search(text) if pattern else None
+        if found is None:
+            continue
+        start = max(0, found.start() - width // 4)
+        end = min(len(text), start + width)
+        snippet = pattern.sub(lambda m: f"**{m.group(0)}**", text[start:end])
+        return ('…' if start > 0 else '') + snippet + ('…' if end < len(text) else '')
+    text = texts[0]
+    return text[:width] + ('…' if len(text) > width else '')
+
+
+class VectorIndex:
+    """랜덤 초평면 LSH 기반 근사 최근접 이웃 인덱스 (정규화된 벡터의 코사인 유사도)
+
+    벡터마다 tables개 해시 테이블에 bits비트 부호 해시로 버킷을 나누고, 질의와 같은 버킷에 걸린 후보만
+    정확한 내적으로 다시 정렬합니다. 후보가 k개보다 적으면 전체를 비교합니다.
+    """
+
+    def __init__(self, dim, tables=24, bits=10, seed=1):
+        import numpy as np
+
+        self.dim = dim
+        rng = np.random.RandomState(seed)
+        self._planes = rng.standard_normal((tables, bits, dim)).astype(np.float32)
+        self._weights = (1 << np.arange(bits)).astype(np.int64)
+        self._keys = []
+        self._rows = {}
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._buckets = [{} for _ in range(tables)]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _codes(self, vectors):
+        # (tables, n) 정수 버킷 번호
+        return ((self._planes @ vectors.T) > 0).transpose(0, 2, 1).astype(self._weights.dtype) @ self._weights
+
+    def add_many(self, keys, vectors):
+        import numpy as np
+
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        new_rows = []
+        for key, vector in zip(keys, vectors):
+            row = self._rows.get(key)
+            if row is not None:
+                # 같은 기사가 다시 들어오면 벡터만 바꿈 (예전 버킷에 남은 항목은 검색 때 새 벡터로 채점됨)
+                self._vectors[row] = vector
+            else:
+                self._rows[key] = len(self._keys)
+                self._keys.append(key)
+                new_rows.append(vector)
+        if new_rows:
+            self._vectors = np.vstack([self._vectors, np.asarray(new_rows, dtype=np.float32)])
+
+        rows = [self._rows[key] for key in keys]
+        if not rows:
+            return
+        for table, table_codes in zip(self._buckets, self._codes(self._vectors[rows])):
+            for row, code in zip(rows, table_codes):
+                table.setdefault(int(code), []).append(row)
+
+    def search(self, vector, k=10):
+        """(키, 코사인 유사도) 목록을 유사도 높은 순으로 반환"""
+        import numpy as np
+
+        if not self._keys:
+            return []
+        vector = np.asarray(vector, dtype=np.float32).reshape(1, self.dim)
+        candidates = set()
+        for table, code in zip(self._buckets, self._codes(vector)[:, 0]):
+            candidates.update(table.get(int(code), ()))
+        rows = np.fromiter(candidates, dtype=np.int64) if len(candidates) >= k else np.arange(len(self._keys))
+        scores = self._vectors[rows] @ vector[0]
+        top = np.argsort(-scores)[:k]
+        return [(self._keys[rows[i]], float(scores[i])) for i in top]
+
+
+class SearchIndex:
+    """크롤링한 기사의 제목/요약/본문 검색 인덱스 (SQLite FTS5 trigram + 선택적 임베딩 근사 최근접 이웃)
+
+    기사 저장소의 실행을 run_id 순서로 따라가며 새 실행의 기사만 색인하고(sync), 같은 기사는 가장 최근
+    크롤링 결과 한 건만 남깁니다. trigram 토크나이저는 띄어쓰기 단위가 아닌 부분 문자열로 찾으므로
+    조사가 붙은 한국어 단어도 찾을 수 있습니다.
+    """
+
+    def __init__(self, db_path=os.path.join("crawled_data", "search.db"), semantic=True,
+                 embedding_model=EMBEDDING_MODEL):
+        self.db_path = db_path
+        self.semantic = semantic
+        self.embedding_model = embedding_model
+        self._vectors = None
+        self._lock = threading.RLock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, summary, content, tokenize = 'trigram'
+            );
+            CREATE TABLE IF NOT EXISTS docs (
+                doc_id INTEGER PRIMARY KEY,
+                article_id TEXT NOT NULL UNIQUE,
+                run_id INTEGER,
+                url TEXT NOT NULL,
+                crawl_time TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS embeddings (
+                doc_id INTEGER PRIMARY KEY,
+                model TEXT NOT NULL,
+                vector BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_docs_crawl_time ON docs (crawl_time);
+        """)
+        if int(self._meta('text_format', 1)) < TEXT_FORMAT:
+            # 공백을 붙이지 않고 색인한 이전 버전 행은 그 자리에서 앞뒤 공백을 붙임 (임베딩은 그대로 유지)
+            self._conn.execute("""
+                UPDATE articles_fts SET title = ' ' || title || ' ', summary = ' ' || summary || ' ',
+                    content = ' ' || content || ' '
+            """)
+            self._set_meta('text_format', TEXT_FORMAT)
+        self._conn.commit()
+
+    def _encoder(self):
+        return _get_encoder(self.embedding_model) if self.semantic else None
+
+    @property
+    def semantic_available(self):
+        return self._encoder() is not None
+
+    def _meta(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def sync(self, article_store):
+        """기사 저장소에서 아직 색인하지 않은 실행의 기사를 색인하고 새로 색인한 기사 수 반환"""
+        # 여러 스레드가 동시에 sync해도 같은 실행을 두 번 색인하지 않도록 전체를 잠금
+        with self._lock:
+            last_run_id = int(self._meta('last_run_id', 0))
+            indexed = 0
+            for run_id in article_store.run_ids_after(last_run_id):
+                indexed += self.add_articles(article_store.load_run(run_id))
+                self._set_meta('last_run_id', run_id)
+                self._conn.commit()
+            return indexed
+
+    def add_articles(self, articles):
+        """기사 목록(run_id/article_id/title/url/crawl_time/content/summary)을 색인
+
+        같은 기사가 이미 있으면 크롤링 시각이 같거나 더 최근일 때만 바꿉니다. 바뀐 기사 수를 반환합니다.
+        """
+        changed = []
+        with self._lock:
+            for article in articles:
+                row = self._conn.execute(
+                    "SELECT doc_id, crawl_time FROM docs WHERE article_id = ?", (article['article_id'],)
+                ).fetchone()
+                if row is not None and row['crawl_time'] > article['crawl_time']:
+                    continue
+                if row is not None:
+                    doc_id = row['doc_id']
+                    self._conn.execute("DELETE FROM articles_fts WHERE rowid = ?", (doc_id,))
+                    self._conn.execute(
+                        "UPDATE docs SET run_id = ?, url = ?, crawl_time = ? WHERE doc_id = ?",
+                        (article.get('run_id'), article['url'], article['crawl_time'], doc_id)
+                    )
+                else:
+                    doc_id = self._conn.execute(
+                        "INSERT INTO docs (article_id, run_id, url, crawl_time) VALUES (?, ?, ?, ?)",
+                        (article['article_id'], article.get('run_id'), article['url'], article['crawl_time'])
+                    ).lastrowid
+                self._conn.execute(
+                    "INSERT INTO articles_fts (rowid, title, summary, content) VALUES (?, ?, ?, ?)",
+                    (doc_id, index_text(article['title']), index_text(self._summary_text(article)),
+                     index_text(article.get('content')))
+                )
+                changed.append((doc_id, article))
+            self._conn.commit()
+
+        if changed and self._encoder() is not None:
+            self._embed(changed)
+        return len(changed)
+
+    @staticmethod
+    def _summary_text(article):
+        # 구조화 요약이 있으면 섹션 제목 없이 필드 내용만 색인 (모든 요약에 있는 제목이 검색에 걸리지 않도록)
+        if article.get('summary_data'):
+            return summary_plain_text(article['summary_data'])
+        return article.get('summary')
+
+    def _embedding_text(self, article):
+        # 요약이 있으면 제목 + 요약, 없으면 제목 + 본문 앞부분
+        body = ''
+        if is_summary_ok(article.get('summary'), article.get('summary_data')):
+            body = self._summary_text(article) or ''
+        if not body:
+            body = (article.get('content') or '')[:2000]
+        return f"{article['title']}\n{body}"
+
+    def _embed(self, changed):
+        import numpy as np
+
+        vectors = self._encoder().encode(
+            [self._embedding_text(article) for _, article in changed], normalize_embeddings=True
+        ).astype(np.float32)
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (doc_id, model, vector) VALUES (?, ?, ?)",
+                [(doc_id, self.embedding_model, vector.tobytes()) for (doc_id, _), vector in zip(changed, vectors)]
+            )
+            self._conn.commit()
+            if self._vectors is not None:
+                self._vectors.add_many([doc_id for doc_id, _ in changed], vectors)
+
+    def _vector_index(self):
+        """저장된 임베딩으로 메모리 근사 최근접 이웃 인덱스를 처음 한 번 만듦"""
+        import numpy as np
+
+        with self._lock:
+            if self._vectors is None:
+                rows = self._conn.execute(
+                    "SELECT doc_id, vector FROM embeddings WHERE model = ?", (self.embedding_model,)
+                ).fetchall()
+                dim = self._encoder().get_sentence_embedding_dimension()
+                self._vectors = VectorIndex(dim)
+                if rows:
+                    self._vectors.add_many(
+                        [row['doc_id'] for row in rows],
+                        np.vstack([np.frombuffer(row['vector'], dtype=np.float32) for row in rows])
+                    )
+            return self._vectors
+
+    def _date_conditions(self, start, end):
+        conditions = []
+        params = []
+        if start:
+            conditions.append("d.crawl_time >= ?")
+            params.append(start)
+        if end:
+            conditions.append("d.crawl_time <= ?")
+            params.append(end if len(end) > 10 else end + " 23:59:59")
+        return conditions, params
+
+    def search(self, query, limit=20, offset=0, start=None, end=None):
+        """키워드 검색 (모든 단어 포함, 제목 > 요약 > 본문 가중 bm25 순)
+
+        결과는 article_id, run_id, title, url, crawl_time, snippet(요약/본문의 일치 부분을 **로 강조), score입니다.
+        """
+        match = build_match_query(query)
+        if match is None:
+            return []
+        conditions, params = self._date_conditions(start, end)
+        sql = f"""
+            SELECT d.article_id, d.run_id, d.url, d.crawl_time, trim(f.title) AS title, trim(f.summary) AS summary,
+                   trim(f.content) AS content,
+                   bm25(articles_fts, {', '.join(map(str, COLUMN_WEIGHTS))}) AS score
+            FROM articles_fts f JOIN docs d ON d.doc_id = f.rowid
+            WHERE articles_fts MATCH ?
+        """
+        for condition in conditions:
+            sql += f" AND {condition}"
+        sql += " ORDER BY score LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self._conn.execute(sql, [match] + params + [limit, offset]).fetchall()
+        results = []
+        for row in rows:
+            result = dict(row)
+            result['snippet'] = make_snippet([result.pop('summary'), result.pop('content')], query)
+            results.append(result)
+        return results
+
+    def semantic_search(self, query, limit=20, start=None, end=None):
+        """의미 검색 (임베딩 코사인 유사도 순, 의미 검색을 쓸 수 없으면 빈 목록)"""
+        encoder = self._encoder()
+        if encoder is None or not normalize_text(query):
+            return []
+        vector = encoder.encode([query], normalize_embeddings=True)[0]
+        # 날짜 조건으로 걸러질 것을 감안해 넉넉히 가져옴
+        hits = self._vector_index().search(vector, k=limit * 5 if start or end else limit)
+        if not hits:
+            return []
+
+        scores = dict(hits)
+        conditions, params = self._date_conditions(start, end)
+        sql = f"""
+            SELECT d.doc_id, d.article_id, d.run_id, d.url, d.crawl_time, trim(f.title) AS title,
+                   substr(trim(f.summary), 1, 200) AS snippet
+            FROM docs d JOIN articles_fts f ON f.rowid = d.doc_id
+            WHERE d.doc_id IN ({','.join('?' * len(scores))})
+        """
+        for condition in conditions:
+            sql += f" AND {condition}"
+        with self._lock:
+            rows = self._conn.execute(sql, list(scores) + params).fetchall()
+        results = [dict(row, score=scores[row['doc_id']]) for row in rows]
+        results.sort(key=lambda result: -result['score'])
+        for result in results:
+            del result['doc_id']
+        return results[:limit]
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+class SummaryCache:
+    """SQLite 기반 AI 요약 캐시
+
+    (모델, 프롬프트 템플릿, 제목, 본문)의 해시를 키로 사용하므로 같은 기사를 다시 요약할 때
+    OpenAI를 호출하지 않습니다. TTL이 지난 항목과 max_entries를 넘는 오래된 항목은 저장 시 정리됩니다.
+    """
+
+    def __init__(self, db_path=os.path.join("crawled_data", "summary_cache.db"),
+                 ttl_seconds=7 * 24 * 3600, max_entries=5000):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_accessed ON summaries (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model, template, title, content):
+        """캐시 키 생성 (각 필드를 구분자로 이어 SHA-256 해시)"""
+        digest = hashlib.sha256()
+        for part in (model, template, title, content):
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
+
+    def get(self, key):
+        """캐시된 요약 반환 (없거나 만료되면 None)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, created_at FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+                if row is not None:
+                    self._conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE summaries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, summary):
+        """요약 저장 후 만료/초과 항목 정리"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, summary, now, now)
+            )
+            if self.ttl_seconds:
+                self._conn.execute("DELETE FROM summaries WHERE created_at < ?", (now - self.ttl_seconds,))
+            if self.max_entries:
+                # 가장 오래 사용되지 않은 항목부터 제거
+                self._conn.execute("""
+                    DELETE FROM summaries WHERE key IN (
+                        SELECT key FROM summaries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+            self._conn.commit()
+
+    def stats(self):
+        """히트/미스 횟수와 저장된 항목 수 반환"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
@@ -0,0 +1,193 @@
+import json
+
+# (필드, 이모지, 제목, 종류) 순서대로 요약을 그림. 종류: text(문자열), list(문자열 목록), pairs(두 값 객체 목록)
+SUMMARY_SECTIONS = [
+    ('analogy', '💡', '핵심 비유 (Analogy)', 'text'),
+    ('key_points', '✨', '핵심 요약 (Key Points)', 'list'),
+    ('details', '📚', '상세 내용 (Details)', 'text'),
+    ('critical_points', '🤔', '비판적 관점 (Critical Points)', 'list'),
+    ('numbers', '📊', '숫자 (Numbers)', 'pairs'),
+    ('next_step', '👟', '쉬운 첫걸음 (Easy Next Step)', 'text'),
+    ('terms', '🧩', '핵심 개념 & 용어', 'pairs'),
+    ('prerequisites', '📖', '참고: 선행 지식 (Prerequisites)', 'text'),
+]
+
+SUMMARY_FIELDS = [key for key, _, _, _ in SUMMARY_SECTIONS]
+
+# 요약을 만들지 못한 기사의 summary 자리에 남기는 문구
+SUMMARY_FAILED = "요약 실패"
+SUMMARY_UNAVAILABLE = "요약을 생성할 수 없습니다."
+
+# pairs 필드의 (이름, 설명) 키
+PAIR_KEYS = {
+    'numbers': ('label', 'value'),
+    'terms': ('term', 'explanation'),
+}
+
+_DESCRIPTIONS = {
+    'analogy': "내용을 한눈에 파악할 수 있는 강력하고 기억하기 쉬운 비유 또는 캐치프레이즈 한 문장",
+    'key_points': "가장 중요한 내용 3가지",
+    'details': "핵심 요약에 대한 구체적인 설명, 배경 또는 주요 특징",
+    'critical_points': "주의 깊게 생각하거나 경계해야 할 지점, 또는 더 생각해 볼 질문 2가지",
+    'numbers': "기사의 핵심 통계/수치 (없으면 빈 목록)",
+    'next_step': "핵심 교훈을 바탕으로 가장 마찰이 적고 즉시 실행 가능한 구체적인 행동 1가지",
+    'terms': "기술적으로 중요하거나 어려운 핵심 용어 3개와 비유를 활용한 한 줄 설명",
+    'prerequisites': "이 정보를 완전히 이해하기 위해 필요한 사전 지식이나 조건",
+}
+
+
+def _field_schema(key, kind):
+    if kind == 'text':
+        schema = {'type': 'string'}
+    elif kind == 'list':
+        schema = {'type': 'array', 'items': {'type': 'string'}}
+    else:
+        name, value = PAIR_KEYS[key]
+        schema = {'type': 'array', 'items': {
+            'type': 'object',
+            'properties': {name: {'type': 'string'}, value: {'type': 'string'}},
+            'required': [name, value],
+            'additionalProperties': False
+        }}
+    return dict(schema, description=_DESCRIPTIONS[key])
+
+
+# OpenAI structured outputs용 JSON 스키마 (strict 모드는 모든 필드 필수, 추가 필드 금지)
+SUMMARY_SCHEMA = {
+    'type': 'object',
+    'properties': {key: _field_schema(key, kind) for key, _, _, kind in SUMMARY_SECTIONS},
+    'required': SUMMARY_FIELDS,
+    'additionalProperties': False
+}
+
+SUMMARY_RESPONSE_FORMAT = {
+    'type': 'json_schema',
+    'json_schema': {'name': 'article_summary', 'strict': True, 'schema': SUMMARY_SCHEMA}
+}
+
+
+def normalize_summary(data):
+    """JSON 객체를 필드별 타입에 맞춘 요약 딕셔너리로 정리 (없거나 타입이 다른 필드는 빈 값)"""
+    summary = {}
+    for key, _, _, kind in SUMMARY_SECTIONS:
+        value = data.get(key)
+        if kind == 'text':
+            summary[key] = value.strip() if isinstance(value, str) else ''
+        elif kind == 'list':
+            items = value if isinstance(value, list) else []
+            summary[key] = [item.strip() for item in items if isinstance(item, str) and item.strip()]
+        else:
+            name, detail = PAIR_KEYS[key]
+            items = value if isinstance(value, list) else []
+            summary[key] = [
+                {name: str(item.get(name) or '').strip(), detail: str(item.get(detail) or '').strip()}
+                for item in items if isinstance(item, dict) and (item.get(name) or item.get(detail))
+            ]
+    return summary
+
+
+def parse_summary(text):
+    """모델 응답(JSON 문자열)을 요약 딕셔너리로 변환 (JSON 객체가 아니거나 내용이 비어 있으면 ValueError)"""
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        raise ValueError("요약 응답이 JSON 형식이 아닙니다.")
+    if not isinstance(data, dict):
+        raise ValueError("요약 응답이 JSON 객체가 아닙니다.")
+    summary = normalize_summary(data)
+    if not any(summary.values()):
+        raise ValueError("요약 응답에 내용이 없습니다.")
+    return summary
+
+
+def parse_partial_summary(text):
+    """스트리밍 중인 JSON 앞부분에서 지금까지 받은 필드만 꺼냄 (실시간 표시용, 읽을 수 없으면 빈 필드)
+
+    열린 문자열/괄호를 닫아 보고, 안 되면 마지막 쉼표나 괄호 위치까지 잘라서 닫아 봅니다.
+    """
+    stack = []
+    cut_points = []
+    in_string = False
+    escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append('}' if char == '{' else ']')
+            cut_points.append((i + 1, ''.join(reversed(stack))))
+        elif char in '}]':
+            if stack:
+                stack.pop()
+            cut_points.append((i + 1, ''.join(reversed(stack))))
+        elif char == ',':
+            cut_points.append((i, ''.join(reversed(stack))))
+
+    closing = ''.join(reversed(stack))
+    if in_string:
+        candidates = [(text[:-1] if escaped else text) + '"' + closing]
+    else:
+        candidates = [text + closing]
+    candidates.extend(text[:position] + rest for position, rest in reversed(cut_points))
+    for candidate in candidates:
+        try:
+            data = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            return normalize_summary(data)
+    return normalize_summary({})
+
+
+def is_summary_ok(summary, summary_data=None):
+    """요약이 정상적으로 생성되었는지 확인
+
+    구조화 요약(summary_data)이 있으면 성공입니다. 구조화 요약 없이 마크다운만 저장된 이전 실행의 요약은
+    실패 문구가 아닌지로 판단합니다.
+    """
+    if summary_data:
+        return True
+    return (isinstance(summary, str) and bool(summary) and not summary.startswith(SUMMARY_FAILED)
+            and summary != SUMMARY_UNAVAILABLE)
+
+
+def summary_to_markdown(title, summary):
+    """요약 딕셔너리를 예전 프롬프트와 같은 섹션 구성의 마크다운으로 (CSV/검색/이전 버전 호환용)"""
+    lines = [f"## 🚀 {title}", ""]
+    for key, emoji, label, kind in SUMMARY_SECTIONS:
+        value = summary.get(key)
+        if not value:
+            continue
+        lines.append(f"### {emoji} {label}")
+        if kind == 'text':
+            lines.append(value)
+        elif kind == 'list':
+            lines.extend(f"- {item}" for item in value)
+        else:
+            name, detail = PAIR_KEYS[key]
+            lines.extend(f"- **{item[name]}**: {item[detail]}" for item in value)
+        lines.append("")
+    return '\n'.join(lines).strip()
+
+
+def summary_plain_text(summary):
+    """섹션 제목 없이 필드 내용만 이어 붙인 텍스트 (검색 색인/임베딩용)"""
+    parts = []
+    for key, _, _, kind in SUMMARY_SECTIONS:
+        value = summary.get(key)
+        if not value:
+            continue
+        if kind == 'text':
+            parts.append(value)
+        elif kind == 'list':
+            parts.extend(value)
+        else:
+            name, detail = PAIR_KEYS[key]
+            parts.extend(f"{item[name]}: {item[detail]}" for item in value)
+    return '\n'.join(parts)